@@ -0,0 +1,36 @@
+'''
+	Cell Locator
+	Desc : Location table of a parsed Data Contract. The Excel column letter of every header and the offset between
+		   the Data Frame index and the Excel row are computed once per Data Contract, so a location is only resolved
+		   when an issue is reported, instead of calling findLoc for every cell that is checked.
+'''
+from lib.utils import column_string
+
+#Data Contract is read with header=2, the header is on the third row of the sheet and the first attribute on the fourth
+HEADER_ROW = 2
+#dfs.attrs key set by the Contract Reader with the position of every column in the sheet
+SHEET_COLUMNS = 'sheetColumns'
+
+
+'''
+	Use : Location of the Issues
+	Desc : Resolve the location of a cell as '<Column Letter><Excel Row>', the same reference findLoc gives.
+	@Params : dfs - Data Frame - output of excel read from Pandas.
+			  header - Header row passed to pd.read_excel
+		  The position of a column is taken from dfs.attrs when the reader kept only some of the columns of the sheet.
+'''
+class CellLocator(object):
+	__slots__ = ('columns', 'rowOffset')
+
+	def __init__(self, dfs, header=HEADER_ROW):
+		positions = dfs.attrs.get(SHEET_COLUMNS) or dict((column, position) for position, column in enumerate(dfs.columns))
+		self.columns = dict((column, column_string(position + 1)) for column, position in positions.items())
+		#Index 0 of the Data Frame is the row after the header, Excel rows start from 1
+		self.rowOffset = header + 2
+
+	#Excel row number of the Data Frame index
+	def row(self, index):
+		return int(index) + self.rowOffset
+
+	def __call__(self, column, index):
+		return self.columns[column] + str(self.row(index))
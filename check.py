@@ -11,17 +11,15 @@ import argparse
 import json
 #Pandas Library for parsing the Data Contract
 import pandas as pd
-#Regular Expression Library
-import re
+#NumPy for the column checks of a Dataset
+import numpy as np
 #Python Sys Libraries
 import sys
 import os
-import csv
-'''Predict a file's encoding using chardet'''
-import chardet
+#Process Pool for validating the Datasets in parallel
+from concurrent.futures import ProcessPoolExecutor
 #Connecting Python to SQL Server using pyodbc
 import pyodbc
-import psycopg2
 import configparser
 
 #Templating
@@ -29,17 +27,32 @@ from jinja2 import Environment, FileSystemLoader
 
 #default Confifurations
 from configuration import log, DATA_CONTRACT_DEFAULT_PATH, PARSED_DATA_CONTRACT_DEFAULT_PATH, TEMPLATE, CODES_DIR
-from lib.utils import strippedText, camelCase, diff, snakeCase, column_string, findLoc, listToComma
-FILES = []
-
+from lib.utils import strippedText, camelCase, diff, snakeCase, column_string
+#Compiled Template
+from template_index import compileTemplate, NAME_PATTERN, DATE_TIME_PATTERN, SIZE_PATTERN, SPRINT_PATTERN
+#Location of the issues
+from cell_locator import CellLocator
+#Read only reader of the Data Contract and cache of the parsed Data Contracts
+from contract_reader import fillContract, MERGED_CELLS
+from contract_cache import loadContract
+#Cache of the issues and reports
+from result_cache import resultKey, restoreResult, storeResult, sourceVersion
+#Issues of the Datasets of the previous sprint of the Data Contract
+from dataset_cache import DatasetCache, contractKey, sampleFilesOf
+from sample_index import sampleIndex
+from delimiter_detector import delimiterOf
+from sample_inspector import inspectSample, SampleOptions, SAMPLE_DEFAULTS, DELIMITED_EXTENSIONS
+from encoding_detector import ENCODING_BYTES
+from key_verifier import KEY_MEMORY
+from sample_profiler import sampleSchema
+#Entity lookups in ENTITY_MAPPING
+from entity_resolver import entityResolver, entityOf, closeResolvers
+from entity_snapshot import SNAPSHOT_DEFAULT_TTL
 #Global Variables
 Issues = []
 otherIssues = []
-allIssues = []
-#Import Template File
-mappingJsonFile = json.load(TEMPLATE)
-#Move Cursor to start of the File
-TEMPLATE.seek(0)
+#Import Template File once, validators look up the compiled Template
+TEMPLATE_INDEX = compileTemplate(TEMPLATE)
 
 # Capture current directory
 THIS_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -54,16 +67,30 @@ THIS_DIR = os.path.dirname(os.path.abspath(__file__))
 def readInputArgs():
 	try:
 		log.info('Data Contract File Path Function: Started')
-		parser = argparse.ArgumentParser(description='The Arguments --file, --dir and postgres creds are required')
+		parser = argparse.ArgumentParser(description='The Arguments --file, --dir and postgres creds are required, postgres creds are not required with --offline')
 		parser.add_argument('--file', '-f', help="Data Contract File Name ", type=str, required=True)
 		parser.add_argument('--dir', '-d', help="Data Contract Directory Path", type=str, default=DATA_CONTRACT_DEFAULT_PATH)
-		parser.add_argument('--psql_db', '-psql_db', help="Postgres Database ", type=str, required=True)
-		parser.add_argument('--psql_user', '-psql_user', help="Postgres Username", type=str, required=True)
-		parser.add_argument('--psql_password', '-psql_pwd', help="Postgres Password", type=str, required=True)
-		parser.add_argument('--psql_host', '-psql_host', help="Postgres Hostname", type=str, required=True)
-		parser.add_argument('--psql_port', '-psql_port', help="Postgres Port", type=str, required=True)
+		parser.add_argument('--psql_db', '-psql_db', help="Postgres Database ", type=str)
+		parser.add_argument('--psql_user', '-psql_user', help="Postgres Username", type=str)
+		parser.add_argument('--psql_password', '-psql_pwd', help="Postgres Password", type=str)
+		parser.add_argument('--psql_host', '-psql_host', help="Postgres Hostname", type=str)
+		parser.add_argument('--psql_port', '-psql_port', help="Postgres Port", type=str)
+		parser.add_argument('--jobs', '-j', help="Worker processes used to validate the Datasets, 0 uses every CPU", type=int, default=1)
+		parser.add_argument('--contract-jobs', '-cj', help="Data Contracts of a --file batch validated at the same time, 0 uses every CPU", type=int, default=1)
+		parser.add_argument('--offline', help="Resolve the Entities from the local Entity snapshot only", action='store_true')
+		parser.add_argument('--entity-ttl', help="Seconds the local Entity snapshot is used before it is refreshed", type=int, default=SNAPSHOT_DEFAULT_TTL)
+		parser.add_argument('--sample-rows', help="Scan the whole Sample Files for the row count, the fields of every row, the quotes and the line endings, only the header is read otherwise", action='store_true')
+		parser.add_argument('--sample-utf8', help="Validate the whole Sample Files as UTF-8, only the first --encoding-bytes are checked otherwise", action='store_true')
+		parser.add_argument('--encoding-bytes', help="Bytes of the Sample Files used to find their encoding", type=int, default=ENCODING_BYTES)
+		parser.add_argument('--sample-profile', help="Check the values of the Sample Files against the Attribute DataType, the Attribute Size and the Date/Time Format", action='store_true')
+		parser.add_argument('--sample-keys', help="Check the Primary Key and the Unique Attributes of the Sample Files for duplicate values", action='store_true')
+		parser.add_argument('--key-memory', help="Memory in MB used for the keys of a Sample File before they are spilled to disk", type=int, default=KEY_MEMORY >> 20)
+		parser.add_argument('--sample-nulls', help="Count the empty and null values of the Sample Files and check them against the Attribute Nullability", action='store_true')
 		args = parser.parse_args()
-		return args.file, args.dir, args.psql_db, args.psql_user, args.psql_password, args.psql_host, args.psql_port
+		credentials = (args.psql_db, args.psql_user, args.psql_password, args.psql_host, args.psql_port)
+		if not args.offline and None in credentials:
+			parser.error('the postgres creds are required unless --offline is given')
+		return args.file, args.dir, args.psql_db, args.psql_user, args.psql_password, args.psql_host, args.psql_port, args.jobs, args.contract_jobs, args.offline, args.entity_ttl, SampleOptions(args.sample_rows, args.sample_utf8, args.encoding_bytes, args.sample_profile, args.sample_keys, args.key_memory << 20, args.sample_nulls)
 	except Exception as e: 
 		# sys.exit(1)
 		log.error("Error in reading the input arguments", exc_info=True)
@@ -78,16 +105,11 @@ def readInputArgs():
 def entityName(file, psql_db, psql_user, psql_password, psql_host, psql_port):
 	try:
 		if '_' in file:
-			entityName = file.split('_')[0].upper()
+			entityName = entityOf(file)
 			log.info("Entity Name from Data Contract: %s", entityName)
 
 			global ENTITY
-			global cursor
-			connection, cursor = connect_to_postgres(psql_db, psql_user, psql_password, psql_host, psql_port)
-			query = "Select ENTITY_NAME FROM abc_db.ENTITY_MAPPING WHERE ENTITY_NAME = '"+entityName+"';"
-			cursor.execute(query)
-			result = cursor.fetchone()
-			print(cursor, result)
+			result = entityResolver(psql_db, psql_user, psql_password, psql_host, psql_port).lookup(entityName)
 			if result == None:
 				log.error("The Entity is not present in ENTITY_MAPPING or is not a valid Entity")
 				issue = {
@@ -103,7 +125,7 @@ def entityName(file, psql_db, psql_user, psql_password, psql_host, psql_port):
 				generateReport(file)
 				sys.exit(1)
 			else:
-				ENTITY = result[0]
+				ENTITY = result
 				log.info(" ENTITY from DB  is Matching : %s", ENTITY)
 				return ENTITY
 		else: 
@@ -129,30 +151,86 @@ def entityName(file, psql_db, psql_user, psql_password, psql_host, psql_port):
 	Use : Execute the Program Functions, Write Issues and Create Report
 	@Params: file - Type:String
 			data_contract_path - Type:String
+			jobs - Worker processes used to validate the Datasets
+			isolated - Write the issues to <contract>_issues.json and <contract>_checkIssue.txt, used by the parallel batch
+			entity - Entity Name and version of the Entity lookups, part of the fingerprint of the result
+			sampleOptions - Sample File Options, part of the fingerprint of the result
+	returns : Issues of the Data Contract or None if the Data Contract could not be checked
 '''
-def execute(file,data_contract_path):
+def execute(file,data_contract_path,jobs=1,isolated=False,entity=(),sampleOptions=SAMPLE_DEFAULTS):
 	try:
 		global Issues # Creating Global Variable to store all the issues for all the Data Contracts
 		global otherIssues #Other issues is used for issues which are not part of Data Contract like sample Files
 		Issues = [] #
 		otherIssues = []
-		data_contract = data_contract_path + file
-		_, _, psql_db, psql_user, psql_password, psql_host, psql_port = readInputArgs()
-		entityName(file, psql_db, psql_user, psql_password, psql_host, psql_port) # Find the entity Name in Entity table
+		data_contract = data_contract_path + file # The Entity is already resolved by checkContract
+		prefix = file.split('.')[0] + '_' if isolated else ''
+		outputs = {
+			'issues.json' : CODES_DIR+'/issues/'+prefix+'issues.json',
+			'checkIssue.txt' : CODES_DIR+'/issues/'+prefix+'checkIssue.txt',
+			'report.html' : reportPath(file)
+		}
+		sampleIndex(data_contract_path + 'sampleFiles', refresh=True) # Sample Files rewritten since the last Data Contract of the run
+		key = resultKey(file, data_contract_path, TEMPLATE_INDEX, entity, THIS_DIR, sampleOptions.key())
+		if restoreResult(key, outputs): # Nothing changed since the result was stored
+			with open(outputs['issues.json'], 'r') as f:
+				Issues = f.read().rstrip('\n')
+			return json.loads(Issues)
 		sheetName(file) # Check Whether Sheet name format is correct or not 
 		dfs = parseContract(data_contract) # Parse the Data contract for Issues and return Data Frame
 		header(dfs,file) # Check The Headers for Issues
-		parseDatasets(dfs) # Parse the Dataset from the Data Frames
+		cache = DatasetCache(contractKey(file), TEMPLATE_INDEX.version + sourceVersion(THIS_DIR) + sampleOptions.key())
+		parseDatasets(dfs, jobs, cache, sampleOptions) # Parse the Dataset from the Data Frames, only the Datasets which changed are validated
 		print(Issues)
-		with open(CODES_DIR+'/issues/issues.json', 'w') as f:  
+		_Issues = Issues
+		with open(outputs['issues.json'], 'w') as f:  
 			Issues = json.dumps(Issues, indent=4, sort_keys=True)
 			if len(Issues)>2:
-				with open(CODES_DIR+'/issues/checkIssue.txt', 'w') as i_f:
+				with open(outputs['checkIssue.txt'], 'w') as i_f:
 					i_f.write(Issues)
+			else:
+				del outputs['checkIssue.txt']
 			f.write("%s\n" % Issues) # Write issues to File
 		generateReport(file) # Generate Report if issues
+		storeResult(key, outputs)
+		return _Issues
 	except Exception as e:
 		log.error("Error in execute Function - checkDataContract.py", exc_info=True)
+	return None
+
+'''
+	Use : Check a Data Contract of the --file batch
+	Desc : Find the Entity, then validate the Data Contract and write its issues and report. Runs in the main process or
+		   on a worker of --contract-jobs, every worker checks one Data Contract at a time so the module state is not shared.
+	@Params : job - (file, data_contract_path, Postgres credentials, offline, ttl, jobs, isolated, sampleOptions)
+	returns : Result of the Data Contract - {"file", "issues", "failed"}
+'''
+def checkContract(job):
+	global _entityName
+	global data_contract
+	global Issues
+	global otherIssues
+	file, data_contract_path, credentials, offline, ttl, jobs, isolated, sampleOptions = job
+	#Issues of the previous Data Contract of the process, the Entity check can report before execute starts
+	Issues = []
+	otherIssues = []
+	try:
+		#Created with the snapshot options of the run when the process has no Resolver yet
+		resolver = entityResolver(*credentials, offline=offline, ttl=ttl)
+		_entityName = entityName(file, *credentials)
+		path = data_contract_path + _entityName + '/'
+		data_contract = path
+		log.info('Data Contract Path inside loop: %s .Entity Name %s', data_contract,_entityName)
+		issues = execute(file,path,jobs,isolated,(_entityName, resolver.version()),sampleOptions)
+	except SystemExit:
+		#entityName stops on an unknown Entity, the rest of the batch is still checked
+		log.error('Data Contract %s could not be checked', file)
+		return {"file" : file, "issues" : None, "failed" : True}
+	return {"file" : file, "issues" : issues, "failed" : issues is None or len(issues) > 0}
+
+#Worker of --contract-jobs, a spawned worker doesn't inherit the Resolver of the main process
+def initContractWorker(credentials, offline, ttl):
+	entityResolver(*credentials, offline=offline, ttl=ttl)
 
 '''
 	Use : Header Issues
@@ -165,7 +243,7 @@ def sheetName(file):
 		log.info("Entity is passed in the entity name function")
 		log.info("Sheet Name Check Started")
 		sprint = file.split('.')[-2].split('_')[-1]
-		match = re.match(r"([a-z]+)([0-9]+)", sprint, re.I)
+		match = SPRINT_PATTERN.match(sprint)
 		if match:
 			items = match.groups()
 			if list(items)[0].lower() == 'sprint' and list(items)[1].isdigit():
@@ -193,7 +271,7 @@ def sheetName(file):
 def parseContract(data_contract):
 	log.info('Check Sheet Function: Started')
 	log.info('Data Contract Location: %s',data_contract)
-	dfs = pd.read_excel(data_contract, sheet_name="Metadata Template", header=2) #header 2 due to data Contract has top two rows which are not considered as header for parsing.
+	dfs = loadContract(data_contract, TEMPLATE_INDEX) #header 2 due to data Contract has top two rows which are not considered as header for parsing.
 	return dfs
 
 
@@ -218,8 +296,7 @@ def header(dfs,file):  #-- check if the columns in the data contracts matches th
 	try: 
 		idx = pd.Index(dfs.columns) #find indexes
 		idx = list(idx)
-		TEMPLATE.seek(0) #Visit the top of the File (Template File)
-		cols = json.load(TEMPLATE)['header']
+		cols = list(TEMPLATE_INDEX.header)
 		'''
 			MatchedCols is the comparision of the attributes available and matching with standard set
 		'''
@@ -248,293 +325,278 @@ def header(dfs,file):  #-- check if the columns in the data contracts matches th
 		sys.exit(1)
 
 '''
-	Use : Empty the list of Global Variables
-	Desc : Clean and Generate the Global Values to store the data of the list.
+	Use : Dataset State
+	Desc : Issue Blocks and values of the Dataset being validated. Validators receive the state of their Dataset, so
+		   a Dataset is validated on its own without module level variables. The state is reused from one Dataset to
+		   the next: empty lists are kept, only the lists which hold issues of the previous Dataset are replaced.
 	@Params : None
-	returns : None
 '''
-def cleanIndexes():
-	global AttributeIndex
-	global LanguageIndex
-	global allIssues
-	global DatasetNameIndex
-	global ClassificationIndex
-	global AttributeNullabilityIndex
-	global AttributePrimaryIndex
-	global AttributePrimaryLogicIndex
-	global AttributeUniquenessIndex
-	global AttributeDescriptionIndex
-	global DataTypeIndex
-	global DataTypeSizeIndex
-	global PrimaryIdentifierIndex
-	global UniqueIdentifierIndex
-	global ConnectivityIndex
-	global EncodingIndex
-	global DelimiterIndex
-	global ConnectivityDescIndex
-	global IngestionTypeIndex
-	global SampleFileIndex
-	global DatasetClassificationIndex
-	global INGESTION_TYPE
-	global PRIMARY_KEY
-	global Connectivity_TYPE
-	global DATASET_CLASSIFICATION
-	global ENCODING
-	global CATEGORY
-	global SERVICE
-	global ENTITYDC
-	global DELIMITER
-	global DELIMITER_VALUE
-	global ServiceIndex
-	global CategoryIndex
-	global EntityIndex
-	global DateTimeFormatIndex
-	global FormatIndex
-	global SplitLogicIndex
-	global FrquencyIndex
-	global DataContractTypeIndex
-	FrquencyIndex = []
-	DataContractTypeIndex = []
-	SplitLogicIndex = []
-	FormatIndex = []
-	AttributeIndex = []
-	LanguageIndex = []
-	allIssues = []
-	DatasetNameIndex = []
-	ClassificationIndex = []
-	AttributeNullabilityIndex = []
-	AttributePrimaryIndex = []
-	AttributePrimaryLogicIndex = []
-	AttributeUniquenessIndex = []
-	AttributeDescriptionIndex = []
-	DataTypeIndex = []
-	DataTypeSizeIndex = []
-	PrimaryIdentifierIndex = []
-	UniqueIdentifierIndex = []
-	ConnectivityIndex = []
-	EncodingIndex = []
-	DelimiterIndex = []
-	ConnectivityDescIndex = []
-	IngestionTypeIndex = []
-	SampleFileIndex = []
-	DatasetClassificationIndex = []
-	INGESTION_TYPE = []
-	PRIMARY_KEY = []
-	Connectivity_TYPE = []
-	DATASET_CLASSIFICATION = []
-	ENCODING = []
-	CATEGORY = []
-	SERVICE = []
-	ENTITYDC = []
-	DELIMITER = []
-	DELIMITER_VALUE = []
-	ServiceIndex = []
-	CategoryIndex = []
-	EntityIndex = []
-	DateTimeFormatIndex = []
+class DatasetState(object):
+	__slots__ = (
+		'dataset', 'locate', 'allIssues',
+		'FrquencyIndex', 'DataContractTypeIndex', 'SplitLogicIndex', 'FormatIndex', 'AttributeIndex',
+		'LanguageIndex', 'DatasetNameIndex', 'ClassificationIndex', 'AttributeNullabilityIndex',
+		'AttributePrimaryIndex', 'AttributePrimaryLogicIndex', 'AttributeUniquenessIndex', 'AttributeDescriptionIndex',
+		'DataTypeIndex', 'DataTypeSizeIndex', 'ConnectivityIndex', 'EncodingIndex', 'DelimiterIndex',
+		'ConnectivityDescIndex', 'IngestionTypeIndex', 'SampleFileIndex', 'DatasetClassificationIndex',
+		'ServiceIndex', 'CategoryIndex', 'EntityIndex', 'DateTimeFormatIndex', 'DELIMITER_VALUE'
+	)
+	LISTS = __slots__[2:]
+
+	def __init__(self):
+		self.dataset = None
+		self.locate = None
+		for name in self.LISTS:
+			setattr(self, name, [])
+
+	'''
+		Use : Start the next Dataset
+		@Params : dataset - Dataset Name
+				  locate - Cell Locator of the Data Contract
+	'''
+	def reset(self, dataset, locate):
+		self.dataset = dataset
+		self.locate = locate
+		for name in self.LISTS:
+			if getattr(self, name):
+				setattr(self, name, [])
+
+	'''
+		Use : Issues of the Dataset for issues.json
+		returns : Dataset Issue or None if the Dataset has no issue
+	'''
+	def result(self):
+		if len(self.allIssues) > 0:
+			return {
+				"DatasetName" : self.dataset,
+				"allIssue" : self.allIssues
+			}
+		return None
+
+
+'''
+	Use : Column Helpers
+	Desc : The validators below work on the whole column of a Dataset at once. __text and __lowered give the same value
+		   as str(x) and str(x).lower() for every cell and __failing returns the row and the value of the cells that failed
+		   a check, so the issue and its location are only built for the failing cells.
+	@Params : _column - Column of the current Dataset
+			  _mask - Boolean Series or Array, True for the cells with an issue
+'''
+def __text(_column):
+	# Newer pandas keeps NaN as NaN in astype(str), str(x) gives 'nan'
+	return _column.astype(str).fillna('nan')
+
+def __lowered(_column):
+	return __text(_column).str.lower()
+
+'''
+	Use : Merged Cells
+	Desc : Dataset level values (Encoding, Delimiter, Service ...) are merged cells, filled on one row of the Dataset.
+		   The column is aggregated once per Dataset: position of the first filled cell and number of filled cells.
+		   Rows before the first filled cell are the rows which don't have a value yet. With the merged ranges of the
+		   sheet, the value of the Dataset is the first filled cell of a merged range, a cell filled on its own is only
+		   taken when the column is not merged on the rows of the Dataset.
+	@Params : _column - Column of the current Dataset
+			  _ranges - Merged ranges of the column, [(first row, last row)] in index labels, None if not known
+	returns : first - Position of the Dataset value, length of the column if no cell is filled
+			  count - Number of filled cells
+'''
+def __mergedCell(_column, _ranges=None):
+	_filled = (__text(_column) != 'nan').to_numpy()
+	_count = int(_filled.sum())
+	_first = int(_filled.argmax()) if _count > 0 else len(_filled)
+	if _ranges and _count > 0:
+		# Ranges of a column don't overlap, the range of a row is the last one starting on or before it
+		_tops, _bottoms = np.array(sorted(_ranges), dtype='int64').T
+		_rows = _column.index.to_numpy()
+		_range = np.searchsorted(_tops, _rows, side='right') - 1
+		_merged = _filled & (_range >= 0) & (_rows <= _bottoms[np.maximum(_range, 0)])
+		if _merged.any():
+			_first = int(_merged.argmax())
+	return _first, _count
+
+def __failing(_column, _mask):
+	_mask = np.asarray(_mask)
+	return zip(_column.index[_mask], _column.to_numpy(dtype=object)[_mask])
+
+'''
+	Use : Row Validators
+	Desc : Run a validator which still works on a single cell over every row of the Dataset.
+	@Params : validator - Validator Function
+			  _dfs - Data Frame of the current Dataset
+			  state - Dataset State - Issue Blocks of the Dataset and location of the issue.
+			  columns - Columns passed to the validator, in the order of its parameters.
+			  extra - Extra parameters passed after the row Number.
+	return : None
+'''
+def __rowWise(validator, _dfs, state, columns, *extra):
+	_count_ = {
+		"count" : len(_dfs),
+		"index": 0
+	}
+	for _, *values in zip(_dfs.index, *[_dfs[column].to_numpy(dtype=object) for column in columns]):
+		_count_["index"] = _count_["index"] + 1
+		validator(*values, _count_, state, _, *extra)
 
 
 '''
 	Check the Frequency for the issues. Frequency should match with the values in template.json
-	@Params : _frequency - Value of Frequency
-			  count - As it is the value of column for the xth row so need to find the end, thats why count is required.
-			  dfs - Data Frame - Required to find the location of the issue.
-			  _ - _ is the row Number for the current cursor.
+	@Params : _dfs - Data Frame of the current dataset
+			  state - Dataset State - Issue Blocks of the Dataset and location of the issue.
+			  columns - Frequency columns, both of them share the same Issue Block.
 	return : Append to Issue Block
 '''	
-def __frequency(_frequency, count, dfs, column_name, _):
-	location = findLoc(dfs,column_name,_)
-	global _FrequencyIssue_
-	if str(_frequency).lower() not in map(lambda x: x.lower(), mappingJsonFile['frequency']) :
-		if str(_frequency).lower() == 'nan':
-			_frequency = '*This field is mandatory'
-			issue = {
-					"type":"ERROR",
-					"issueValue":'The issue in the ' + column_name,
-					"expectedValue":column_name +" should be "+ str(mappingJsonFile['frequency']),
-					"actualValue":_frequency,
-					"location":location,
-					"issueDesc":column_name + " is mandatory and should be "+ str(mappingJsonFile['frequency'])
-				}
-			FrquencyIndex.append(issue)
-			log.error(issue['issueValue'],extra=issue)
-	else:
-		pass
-	_FrequencyIssue_ = {}
-	if count['index'] == count['count']:
+def __frequency(_dfs, state, columns):
+	_frequencies = TEMPLATE_INDEX.lowered('frequency')
+	_failing = []
+	for _order, column_name in enumerate(columns):
+		_values = __lowered(_dfs[column_name])
+		_invalid = ~_values.isin(_frequencies) & (_values == 'nan')
+		_failing.extend((_, _order, column_name) for _, _frequency in __failing(_dfs[column_name], _invalid))
+	# Issues are reported row by row, as the rows of the Data Contract are read
+	for _, _order, column_name in sorted(_failing):
+		_frequency = '*This field is mandatory'
+		issue = {
+				"type":"ERROR",
+				"issueValue":'The issue in the ' + column_name,
+				"expectedValue":column_name +" should be "+ TEMPLATE_INDEX.text('frequency'),
+				"actualValue":_frequency,
+				"location":state.locate(column_name,_),
+				"issueDesc":column_name + " is mandatory and should be "+ TEMPLATE_INDEX.text('frequency')
+			}
+		state.FrquencyIndex.append(issue)
+		log.error(issue['issueValue'],extra=issue)
+	for column_name in columns:
 		_FrequencyIssue_ = {
 			"Location" : "Split Logic Key",
-			"issues" : FrquencyIndex
+			"issues" : state.FrquencyIndex
 		}
 		if bool(_FrequencyIssue_['issues']):
-			allIssues.append(_FrequencyIssue_)
+			state.allIssues.append(_FrequencyIssue_)
 
 
 '''
 	Check the Data Contract Type for the issues. Data Contract Type should match with the values in template.json
-	@Params : _dataContractType - Value of Data Contract Type
-			  count - As it is the value of column for the xth row so need to find the end, thats why count is required.
-			  dfs - Data Frame - Required to find the location of the issue.
-			  _ - _ is the row Number for the current cursor.
+	@Params : _column - Data Contract Type column of the current dataset
+			  state - Dataset State - Issue Blocks of the Dataset and location of the issue.
 	return : Append to Issue Block
 '''	
-def __dataContractType(_dataContractType, count, dfs, _):
-	location = findLoc(dfs,'DataContract Type',_)
-	global _DataContractTypeIssue_
-	if str(_dataContractType).lower() not in ['new', 'revised'] :
-		if str(_dataContractType).lower() == 'nan':
-			_dataContractType = '*This field is mandatory'
-			issue = {
-					"type":"ERROR",
-					"issueValue":'The issue in the Split Logic',
-					"expectedValue":"Data Contract Type should be New or Revised",
-					"actualValue":_dataContractType,
-					"location":location,
-					"issueDesc":"Data Contract Type is mandatory and should be New or Revised"
-				}
-			DataContractTypeIndex.append(issue)
-			log.error(issue['issueValue'],extra=issue)
-	else:
-		pass
-	_DataContractTypeIssue_ = {}
-	if count['index'] == count['count']:
-		_DataContractTypeIssue_ = {
-			"Location" : "Split Logic Key",
-			"issues" : DataContractTypeIndex
-		}
-		if bool(_DataContractTypeIssue_['issues']):
-			allIssues.append(_DataContractTypeIssue_)
+def __dataContractType(_column, state):
+	_values = __lowered(_column)
+	_invalid = ~_values.isin(['new', 'revised']) & (_values == 'nan')
+	for _, _dataContractType in __failing(_column, _invalid):
+		_dataContractType = '*This field is mandatory'
+		issue = {
+				"type":"ERROR",
+				"issueValue":'The issue in the Split Logic',
+				"expectedValue":"Data Contract Type should be New or Revised",
+				"actualValue":_dataContractType,
+				"location":state.locate('DataContract Type',_),
+				"issueDesc":"Data Contract Type is mandatory and should be New or Revised"
+			}
+		state.DataContractTypeIndex.append(issue)
+		log.error(issue['issueValue'],extra=issue)
+	_DataContractTypeIssue_ = {
+		"Location" : "Split Logic Key",
+		"issues" : state.DataContractTypeIndex
+	}
+	if bool(_DataContractTypeIssue_['issues']):
+		state.allIssues.append(_DataContractTypeIssue_)
 
 '''
 	Check the Split Logic Key for the issues. Split Logic Key should match with the values in template.json
-	@Params : _splitLogic - Value of Split Logic
-			  count - As it is the value of column for the xth row so need to find the end, thats why count is required.
-			  dfs - Data Frame - Required to find the location of the issue.
-			  _ - _ is the row Number for the current cursor.
+	@Params : _column - Split Logic column of the current dataset
+			  state - Dataset State - Issue Blocks of the Dataset and location of the issue.
 	return : Append to Issue Block
 '''	
-def __splitLogic(_splitLogic, count, dfs, _):
-	location = findLoc(dfs,'Split Logic',_)
-	global _SplitLogicIssue_
-	if str(_splitLogic).lower() not in map(lambda x: x.lower(), mappingJsonFile['splitLogic']) :
-		if str(_splitLogic).lower() == 'nan':
-			_splitLogic = '*This field is mandatory'
-			issue = {
-					"type":"ERROR",
-					"issueValue":'The issue in the Split Logic',
-					"expectedValue":"Split Logic should be "+ str(mappingJsonFile['splitLogic']),
-					"actualValue":_splitLogic,
-					"location":location,
-					"issueDesc":"Split Logic is mandatory and should be "+ str(mappingJsonFile['splitLogic'])
-				}
-			SplitLogicIndex.append(issue)
-			log.error(issue['issueValue'],extra=issue)
-	else:
-		pass
-	_SplitLogicIssue_ = {}
-	if count['index'] == count['count']:
-		_SplitLogicIssue_ = {
-			"Location" : "Split Logic Key",
-			"issues" : SplitLogicIndex
-		}
-		if bool(_SplitLogicIssue_['issues']):
-			allIssues.append(_SplitLogicIssue_)
+def __splitLogic(_column, state):
+	_values = __lowered(_column)
+	_invalid = ~_values.isin(TEMPLATE_INDEX.lowered('splitLogic')) & (_values == 'nan')
+	for _, _splitLogic in __failing(_column, _invalid):
+		_splitLogic = '*This field is mandatory'
+		issue = {
+				"type":"ERROR",
+				"issueValue":'The issue in the Split Logic',
+				"expectedValue":"Split Logic should be "+ TEMPLATE_INDEX.text('splitLogic'),
+				"actualValue":_splitLogic,
+				"location":state.locate('Split Logic',_),
+				"issueDesc":"Split Logic is mandatory and should be "+ TEMPLATE_INDEX.text('splitLogic')
+			}
+		state.SplitLogicIndex.append(issue)
+		log.error(issue['issueValue'],extra=issue)
+	_SplitLogicIssue_ = {
+		"Location" : "Split Logic Key",
+		"issues" : state.SplitLogicIndex
+	}
+	if bool(_SplitLogicIssue_['issues']):
+		state.allIssues.append(_SplitLogicIssue_)
 
 '''
 	Check the Format for the issues. Format should match with the values in template.json
-	@Params : _formatValue - Format
-			  count - As it is the value of column for the xth row so need to find the end, thats why count is required.
-			  dfs - Data Frame - Required to find the location of the issue.
-			  _ - _ is the row Number for the current cursor.
+	@Params : _column - Format column of the current dataset
+			  state - Dataset State - Issue Blocks of the Dataset and location of the issue.
 	return : Append to Issue Block
 '''	
-def __format(_formatValue, count, dfs, _):
-	location = findLoc(dfs,'Format (MIME)',_)
-	global _FormatIssue_
-	if str(_formatValue).lower() not in map(lambda x: x.lower(), mappingJsonFile['format']):
+def __format(_column, state):
+	_values = __lowered(_column)
+	for _, _formatValue in __failing(_column, ~_values.isin(TEMPLATE_INDEX.lowered('format'))):
 		if str(_formatValue).lower() == 'nan':
 			_formatValue = '*This field is mandatory'
 		issue = {
 				"type":"ERROR",
 				"issueValue":'The issue in the Format',
-				"expectedValue":"Format should have one of values:" + listToComma(mappingJsonFile['format'] ),
+				"expectedValue":"Format should have one of values:" + TEMPLATE_INDEX.comma('format'),
 				"actualValue":_formatValue,
-				"location":location,
+				"location":state.locate('Format (MIME)',_),
 				"issueDesc":"NA will be consider as No value for Mandatory Field and it is mandatory to fill the Format. "
 			}
-		FormatIndex.append(issue)
+		state.FormatIndex.append(issue)
 		log.error(issue['issueValue'],extra=issue)
-	else:
-		pass
-	_FormatIssue_ = {}
-	if count['index'] == count['count']:
-		_FormatIssue_ = {
-			"Location" : "Format",
-			"issues" : FormatIndex
-		}
-		if bool(_FormatIssue_['issues']):
-			allIssues.append(_FormatIssue_)
+	_FormatIssue_ = {
+		"Location" : "Format",
+		"issues" : state.FormatIndex
+	}
+	if bool(_FormatIssue_['issues']):
+		state.allIssues.append(_FormatIssue_)
 
 '''
 	Check the Ingestion Logic for the issues.
-	@Params : __ingestionType - Type of Ingestion - INSUPD/FULL/INCREMENTAL
-			  count - As it is the value of column for the xth row so need to find the end, thats why count is required.
-			  dfs - Data Frame - Required to find the location of the issue.
-			  _ - _ is the row Number for the current cursor.
+	@Params : _column - Ingestion Logic column of the current dataset - INSUPD/FULL/INCREMENTAL
+			  state - Dataset State - Issue Blocks of the Dataset and location of the issue.
 	return : Append to Issue Block
 '''
-def __ingestionType(_ingestionType, count, dfs, _):
-	INGESTION_TYPE.append(_ingestionType)
-	location = findLoc(dfs,'Ingestion Logic',_)
-	global _IngestionTypeIssue_
-	if str(_ingestionType).lower() not in map(lambda x: x.lower(), mappingJsonFile['ingestionType']) :
-		if str(_ingestionType).lower() == 'nan':
-			if True in list(map(lambda x:str(x) != 'nan',INGESTION_TYPE)):
-				pass
-			else:
-				issue = {
-						"type":"ERROR",
-						"issueValue":'The issue in the Ingestion Type',
-						"expectedValue":"Ingestion Type should be match with " + listToComma(mappingJsonFile['ingestionType'] ),
-						"actualValue":_ingestionType,
-						"location":location,
-						"issueDesc":"Ingestion Type should be matched with expected value."
-					}
-				IngestionTypeIndex.append(issue)
-				log.error(issue['issueValue'],extra=issue)
-		else:
-			issue = {
-					"type":"ERROR",
-					"issueValue":'The issue in the Ingestion Type',
-					"expectedValue":"Ingestion Type should be match with " + listToComma(mappingJsonFile['ingestionType'] ),
-					"actualValue":_ingestionType,
-					"location":location,
-					"issueDesc":"Ingestion Type should be matched with expected value."
-				}
-			IngestionTypeIndex.append(issue)
-			log.error(issue['issueValue'],extra=issue)
-	else:
-		pass
-	_IngestionTypeIssue_ = {}
-	if count['index'] == count['count']:
-		_IngestionTypeIssue_ = {
-			"Location" : "Ingestion Issue",
-			"issues" : IngestionTypeIndex
-		}
-		if bool(_IngestionTypeIssue_['issues']):
-			allIssues.append(_IngestionTypeIssue_)
+def __ingestionType(_column, state):
+	_values = __lowered(_column)
+	_first, _count = __mergedCell(_column)
+	# Empty cell is fine once the Ingestion Type is filled in an earlier row of the Dataset (merged cell)
+	_invalid = ~_values.isin(TEMPLATE_INDEX.lowered('ingestionType')).to_numpy() & ~((_values == 'nan').to_numpy() & (np.arange(len(_column)) >= _first))
+	for _, _ingestionType in __failing(_column, _invalid):
+		issue = {
+				"type":"ERROR",
+				"issueValue":'The issue in the Ingestion Type',
+				"expectedValue":"Ingestion Type should be match with " + TEMPLATE_INDEX.comma('ingestionType'),
+				"actualValue":_ingestionType,
+				"location":state.locate('Ingestion Logic',_),
+				"issueDesc":"Ingestion Type should be matched with expected value."
+			}
+		state.IngestionTypeIndex.append(issue)
+		log.error(issue['issueValue'],extra=issue)
+	_IngestionTypeIssue_ = {
+		"Location" : "Ingestion Issue",
+		"issues" : state.IngestionTypeIndex
+	}
+	if bool(_IngestionTypeIssue_['issues']):
+		state.allIssues.append(_IngestionTypeIssue_)
 
 '''
 	Check the dataset Length, it should not exceed 50.
 	@Params : _dataset - Dataset
 			  count - As it is the value of column for the xth row so need to find the end, thats why count is required.
-			  dfs - Data Frame - Required to find the location of the issue.
+			  state - Dataset State - Issue Blocks of the Dataset and location of the issue.
 			  _ - _ is the row Number for the current cursor.
 	return : Append to Issue Block
 '''	
-def __dataset(_dataset, count, dfs, _):
-	location = findLoc(dfs,'Dataset Name',_)
-	global _DatasetNameIssue_
+def __dataset(_dataset, count, state, _):
 	length = 50
 	if len(_dataset) > length:
 		issue = {
@@ -542,24 +604,24 @@ def __dataset(_dataset, count, dfs, _):
 				"issueValue":'The issue in the Dataset Length',
 				"expectedValue":"Dataset Length should not be greater than 50.",
 				"actualValue":_dataset + " has length: "+ str(len(_dataset)),
-				"location":location,
+				"location":state.locate('Dataset Name',_),
 				"issueDesc":"Dataset length should be less than 50."
 		}
-		if len(DatasetNameIndex) > 0:
+		if len(state.DatasetNameIndex) > 0:
 			pass;
 		else:
-			DatasetNameIndex.append(issue)
+			state.DatasetNameIndex.append(issue)
 		log.error(issue['issueValue'],extra=issue)
 		_DatasetNameIssue_ = {}
 		if count['index'] == count['count']:
 			_DatasetNameIssue_ = {
 				"Location" : "DatasetName",
-				"issues" : DatasetNameIndex
+				"issues" : state.DatasetNameIndex
 			}
 			if bool(_DatasetNameIssue_['issues']):
-				allIssues.append(_DatasetNameIssue_)
+				state.allIssues.append(_DatasetNameIssue_)
 	else:
-		if re.match("^[a-zA-Z0-9_ ]*$", str(_dataset)):
+		if NAME_PATTERN.match(str(_dataset)):
 			_DatasetNameIssue_ = {}
 			pass;
 		else:
@@ -568,37 +630,35 @@ def __dataset(_dataset, count, dfs, _):
 					"issueValue":'The issue in the Dataset Name',
 					"expectedValue":"Dataset Name should be english only.",
 					"actualValue":str(_dataset),
-					"location":location,
+					"location":state.locate('Dataset Name',_),
 					"issueDesc":"Dataset Name should english only."
 			}
-			if len(DatasetNameIndex) > 0:
+			if len(state.DatasetNameIndex) > 0:
 				pass;
 			else:
-				DatasetNameIndex.append(issue)
+				state.DatasetNameIndex.append(issue)
 			log.error(issue['issueValue'],extra=issue)
 			_DatasetNameIssue_ = {}
 			if count['index'] == count['count']:
 				_DatasetNameIssue_ = {
 					"Location" : "DatasetName",
-					"issues" : DatasetNameIndex
+					"issues" : state.DatasetNameIndex
 				}
 				if bool(_DatasetNameIssue_['issues']):
-					allIssues.append(_DatasetNameIssue_)
+					state.allIssues.append(_DatasetNameIssue_)
 
 '''
 	Check the attribute for the issues.
 	@Params : _attribute - Attribute Name
 			  count - As it is the value of column for the xth row so need to find the end, thats why count is required.
-			  dfs - Data Frame - Required to find the location of the issue.
+			  state - Dataset State - Issue Blocks of the Dataset and location of the issue.
 			  _ - _ is the row Number for the current cursor.
 	return : Append to Issue Block
 '''
 
-def __attribute(_attribute, count, dfs, _):
-	location = findLoc(dfs,'Attribute',_)
-	global _AttributeIssue_ 
+def __attribute(_attribute, count, state, _):
 	
-	if re.match("^[a-zA-Z0-9_ ]*$", str(_attribute)):
+	if NAME_PATTERN.match(str(_attribute)):
 		_AttributeIssue_ = {}
 		pass;
 	else:
@@ -607,32 +667,29 @@ def __attribute(_attribute, count, dfs, _):
 				"issueValue":'The issue exists in the Attribute Name',
 				"expectedValue":"Special Characters are not allowed like ( ) % $ ^, allowed Characters are 0-9,a-z,A-z and Underscore",
 				"actualValue":_attribute,
-				"location":location,
+				"location":state.locate('Attribute',_),
 				"issueDesc":"The issue will be with Attribute name. Special Characters are not allowed like ( ) % $ ^, allowed Characters are 0-9,a-z,A-z and Underscore. Check for any special character. "
 			}
-		AttributeIndex.append(issue)
+		state.AttributeIndex.append(issue)
 		log.error(issue['issueValue'],extra=issue)
 	_AttributeIssue_ = {}
 	if count['index'] == count['count']:
 		_AttributeIssue_ = {
 			"Location" : "Attribute",
-			"issues" : AttributeIndex
+			"issues" : state.AttributeIndex
 		}
 		if bool(_AttributeIssue_['issues']):
-			allIssues.append(_AttributeIssue_)
+			state.allIssues.append(_AttributeIssue_)
 
 '''
 	Check the Attribute Nullability for the issues. Attribute Nullability should match with the values in template.json
-	@Params : _attributeValue - Attribute Nullability
-			  count - As it is the value of column for the xth row so need to find the end, thats why count is required.
-			  dfs - Data Frame - Required to find the location of the issue.
-			  _ - _ is the row Number for the current cursor.
+	@Params : _column - Attribute Nullability column of the current dataset
+			  state - Dataset State - Issue Blocks of the Dataset and location of the issue.
 	return : Append to Issue Block
 '''	
-def __attributeNullability(_attributeValue, count, dfs, _):
-	location = findLoc(dfs,'Attribute Nullability',_)
-	global _AttributeNullabilityIssue_
-	if str(_attributeValue).lower() not in mappingJsonFile['attributeBool']:
+def __attributeNullability(_column, state):
+	_values = __lowered(_column)
+	for _, _attributeValue in __failing(_column, ~_values.isin(TEMPLATE_INDEX.exact('attributeBool'))):
 		if str(_attributeValue).lower() == 'nan':
 			_attributeValue = '*This field is mandatory'
 		issue = {
@@ -640,36 +697,28 @@ def __attributeNullability(_attributeValue, count, dfs, _):
 				"issueValue":'The issue in the Attribute Nullability',
 				"expectedValue":"Attribute Nullability should be either Yes or No",
 				"actualValue":_attributeValue,
-				"location":location,
+				"location":state.locate('Attribute Nullability',_),
 				"issueDesc":"NA will be consider as No value for Mandatory Field and it is mandatory to fill the Attribute Nullability. "
 			}
-		AttributeNullabilityIndex.append(issue)
+		state.AttributeNullabilityIndex.append(issue)
 		log.error(issue['issueValue'],extra=issue)
-	else:
-		pass
-	_AttributeNullabilityIssue_ = {}
-	if count['index'] == count['count']:
-		_AttributeNullabilityIssue_ = {
-			"Location" : "Attribute Nullability",
-			"issues" : AttributeNullabilityIndex
-		}
-		if bool(_AttributeNullabilityIssue_['issues']):
-			allIssues.append(_AttributeNullabilityIssue_)
+	_AttributeNullabilityIssue_ = {
+		"Location" : "Attribute Nullability",
+		"issues" : state.AttributeNullabilityIndex
+	}
+	if bool(_AttributeNullabilityIssue_['issues']):
+		state.allIssues.append(_AttributeNullabilityIssue_)
 
 '''
 	Check the Attribute Primary Key for the issues. Attribute Primary Key should match with the values in template.json
-	@Params : _attributeValue - Attribute Primary Key
-			  count - As it is the value of column for the xth row so need to find the end, thats why count is required.
-			  dfs - Data Frame - Required to find the location of the issue.
-			  _ - _ is the row Number for the current cursor.
+	@Params : _column - Attribute Primary Key column of the current dataset
+			  _ingestion - Ingestion Logic column of the current dataset, INSUPD requires a Primary Key.
+			  state - Dataset State - Issue Blocks of the Dataset and location of the issue.
 	return : Append to Issue Block
 '''	
-def __attributePrimaryKey(_attributeValue, count, dfs, _):
-	PRIMARY_KEY.append(_attributeValue)
-	location = findLoc(dfs,'Attribute Primary Key',_)
-	global _AttributePrimaryIssue_
-	global _AttributePrimaryLogicIssue_
-	if str(_attributeValue).lower() not in mappingJsonFile['attributeBool']:
+def __attributePrimaryKey(_column, _ingestion, state):
+	_values = __lowered(_column)
+	for _, _attributeValue in __failing(_column, ~_values.isin(TEMPLATE_INDEX.exact('attributeBool'))):
 		if str(_attributeValue).lower() == 'nan':
 			_attributeValue = '*This field is mandatory'
 		issue = {
@@ -677,50 +726,49 @@ def __attributePrimaryKey(_attributeValue, count, dfs, _):
 				"issueValue":'The issue in the Attribute Primary Key',
 				"expectedValue":"Attribute Primary Key should be either Yes or No",
 				"actualValue":_attributeValue,
-				"location":location,
+				"location":state.locate('Attribute Primary Key',_),
 				"issueDesc":"NA will be consider as No value for Mandatory Field and it is mandatory to fill the Attribute Primary Key. "
 			}
-		AttributePrimaryIndex.append(issue)
+		state.AttributePrimaryIndex.append(issue)
 		log.error(issue['issueValue'],extra=issue)
 
-	_AttributePrimaryIssue_ = {}
-	_AttributePrimaryLogicIssue_ = {}
-	if count['index'] == count['count']:
-		_AttributePrimaryIssue_ = {
+	_AttributePrimaryIssue_ = {
+		"Location" : "Attribute Primary Key",
+		"issues" : state.AttributePrimaryIndex
+	}
+	if bool(_AttributePrimaryIssue_['issues']):
+		state.allIssues.append(_AttributePrimaryIssue_)
+	if _ingestion.dropna().astype(str).str.upper().eq('INSUPD').any() and not _values.str.upper().eq('YES').any():
+		# The issue is reported against the last attribute of the Dataset
+		_ = _column.index[-1]
+		_attributeValue = _column.iat[-1]
+		if _values.iat[-1] == 'nan' and 'nan' not in TEMPLATE_INDEX.exact('attributeBool'):
+			_attributeValue = '*This field is mandatory'
+		issue = {
+			"type":"ERROR",
+			"issueValue":'Issue in Attribute Primary key',
+			"expectedValue":"Attribute Primary Key is mandatory for INSUPD",
+			"actualValue":_attributeValue,
+			"location":state.locate('Attribute Primary Key',_),
+			"issueDesc":"Attribute Primary Key is mandatory for INSUPD"
+		}
+		state.AttributePrimaryLogicIndex.append(issue)
+		log.error(issue['issueValue'],extra=issue)
+		_AttributePrimaryLogicIssue_ = {
 			"Location" : "Attribute Primary Key",
-			"issues" : AttributePrimaryIndex
+			"issues" : state.AttributePrimaryLogicIndex
 		}
-		if bool(_AttributePrimaryIssue_['issues']):
-			allIssues.append(_AttributePrimaryIssue_)
-		if "INSUPD" in map(str.upper, filter(lambda v: v==v, INGESTION_TYPE)) and "YES" not in map(str.upper, PRIMARY_KEY):
-			issue = {
-				"type":"ERROR",
-				"issueValue":'Issue in Attribute Primary key',
-				"expectedValue":"Attribute Primary Key is mandatory for INSUPD",
-				"actualValue":_attributeValue,
-				"location":location,
-				"issueDesc":"Attribute Primary Key is mandatory for INSUPD"
-			}
-			AttributePrimaryLogicIndex.append(issue)
-			log.error(issue['issueValue'],extra=issue)
-			_AttributePrimaryLogicIssue_ = {
-				"Location" : "Attribute Primary Key",
-				"issues" : AttributePrimaryLogicIndex
-			}
-			allIssues.append(_AttributePrimaryLogicIssue_)
+		state.allIssues.append(_AttributePrimaryLogicIssue_)
 
 '''
 	Check the Attribute Uniqueness for the issues. Attribute Uniqueness should match with the values in template.json
-	@Params : _attributeValue - Attribute Uniqueness
-			  count - As it is the value of column for the xth row so need to find the end, thats why count is required.
-			  dfs - Data Frame - Required to find the location of the issue.
-			  _ - _ is the row Number for the current cursor.
+	@Params : _column - Attribute Uniqueness column of the current dataset
+			  state - Dataset State - Issue Blocks of the Dataset and location of the issue.
 	return : Append to Issue Block
 '''	
-def __attributeUniqueness(_attributeValue, count, dfs, _):
-	location = findLoc(dfs,'Attribute Uniqueness',_)
-	global _AttributeUniquenessIssue_
-	if str(_attributeValue).lower() not in mappingJsonFile['attributeBool']:
+def __attributeUniqueness(_column, state):
+	_values = __lowered(_column)
+	for _, _attributeValue in __failing(_column, ~_values.isin(TEMPLATE_INDEX.exact('attributeBool'))):
 		if str(_attributeValue).lower() == 'nan':
 			_attributeValue = '*This field is mandatory'
 		issue = {
@@ -728,34 +776,28 @@ def __attributeUniqueness(_attributeValue, count, dfs, _):
 				"issueValue":'The issue in the Attribute Uniqueness',
 				"expectedValue":"Attribute Uniqueness should be either Yes or No",
 				"actualValue":_attributeValue,
-				"location":location,
+				"location":state.locate('Attribute Uniqueness',_),
 				"issueDesc":"NA will be consider as No value for Mandatory Field and it is mandatory to fill the Attribute Uniqueness. "
 			}
-		AttributeUniquenessIndex.append(issue)
+		state.AttributeUniquenessIndex.append(issue)
 		log.error(issue['issueValue'],extra=issue)
-	else:
-		pass
-	_AttributeUniquenessIssue_ = {}
-	if count['index'] == count['count']:
-		_AttributeUniquenessIssue_ = {
-			"Location" : "Attribute Uniqueness",
-			"issues" : AttributeUniquenessIndex
-		}
-		if bool(_AttributeUniquenessIssue_['issues']):
-			allIssues.append(_AttributeUniquenessIssue_)
+	_AttributeUniquenessIssue_ = {
+		"Location" : "Attribute Uniqueness",
+		"issues" : state.AttributeUniquenessIndex
+	}
+	if bool(_AttributeUniquenessIssue_['issues']):
+		state.allIssues.append(_AttributeUniquenessIssue_)
 
 '''
 	Check the Attribute Description for the issues.
 	@Params : _attribute - Attribute Description
 			  count - As it is the value of column for the xth row so need to find the end, thats why count is required.
-			  dfs - Data Frame - Required to find the location of the issue.
+			  state - Dataset State - Issue Blocks of the Dataset and location of the issue.
 			  _ - _ is the row Number for the current cursor.
 	return : Append to Issue Block
 '''
 '''
-def __attributeDescription(_attribute, count, dfs, _):
-	location = findLoc(dfs,'Attribute Description',_)
-	global _AttributeDescriptionIssue_ 
+def __attributeDescription(_attribute, count, state, _):
 	if not re.findall("[^A-Za-z0-9_()?:;,.…'></\n -]", str(_attribute)):
 		_AttributeDescriptionIssue_ = {}
 		pass;
@@ -765,68 +807,59 @@ def __attributeDescription(_attribute, count, dfs, _):
 				"issueValue":'The issue in the Attribute Description',
 				"expectedValue":"Special Characters are not allowed like % $ ^ ' \" allowed Characters are 0-9,a-z,A-z,() and Underscore.",
 				"actualValue":_attribute,
-				"location":location,
+				"location":state.locate('Attribute Description',_),
 				"issueDesc":"The issue will be with Attribute Description. Special Characters are not allowed like % $ ^ ' \" allowed Characters are 0-9,a-z,A-z,() and Underscore."
 			}
-		AttributeDescriptionIndex.append(issue)
+		state.AttributeDescriptionIndex.append(issue)
 		log.error(issue['issueValue'],extra=issue)
 	_AttributeDescriptionIssue_ = {}
 	if count['index'] == count['count']:
 		_AttributeDescriptionIssue_ = {
 			"Location" : "Attribute Description",
-			"issues" : AttributeDescriptionIndex
+			"issues" : state.AttributeDescriptionIndex
 		}
 		if bool(_AttributeDescriptionIssue_['issues']):
-			allIssues.append(_AttributeDescriptionIssue_)
+			state.allIssues.append(_AttributeDescriptionIssue_)
 
 '''
 '''
 	Check the language for the issues. Language should match with the values in template.json
-	@Params : _language - Language
-			  count - As it is the value of column for the xth row so need to find the end, thats why count is required.
-			  dfs - Data Frame - Required to find the location of the issue.
-			  _ - _ is the row Number for the current cursor.
+	@Params : _column - Language column of the current dataset
+			  state - Dataset State - Issue Blocks of the Dataset and location of the issue.
 	return : Append to Issue Block
 '''	
 
-def __language(_language, count, dfs, _):
-	location = findLoc(dfs,'Language',_)
-	global _LanguageIssue_
-	if str(_language).lower() not in mappingJsonFile['language'] and str(_language).lower() != 'nan':
+def __language(_column, state):
+	_values = __lowered(_column)
+	_invalid = ~_values.isin(TEMPLATE_INDEX.exact('language')) & (_values != 'nan')
+	for _, _language in __failing(_column, _invalid):
 		issue = {
 				"type":"ERROR",
 				"issueValue":'The issue in the Language',
 				"expectedValue":"Language should be either English,Arabic,Mix or Other",
 				"actualValue":_language,
-				"location":location,
+				"location":state.locate('Language',_),
 				"issueDesc":"Language should be either English,Arabic,Mix or Other. Empty column or NA will be consider as No value."
 			}
-		LanguageIndex.append(issue)
+		state.LanguageIndex.append(issue)
 		log.error(issue['issueValue'],extra=issue)
-	else:
-		pass
-	_LanguageIssue_ = {}
-	if count['index'] == count['count']:
-		_LanguageIssue_ = {
-			"Location" : "Language",
-			"issues" : LanguageIndex
-		}
-		if bool(_LanguageIssue_['issues']):
-			allIssues.append(_LanguageIssue_)
+	_LanguageIssue_ = {
+		"Location" : "Language",
+		"issues" : state.LanguageIndex
+	}
+	if bool(_LanguageIssue_['issues']):
+		state.allIssues.append(_LanguageIssue_)
 	
 '''
 	Check the Attribute Classification for the issues. Attribute Classification should match with the values in template.json
-	@Params : _classification - Attribute Classification
-			  count - As it is the value of column for the xth row so need to find the end, thats why count is required.
-			  dfs - Data Frame - Required to find the location of the issue.
-			  _ - _ is the row Number for the current cursor.
+	@Params : _column - Attribute Classification column of the current dataset
+			  state - Dataset State - Issue Blocks of the Dataset and location of the issue.
 	return : Append to Issue Block
 '''	
 
-def __classification(_classification, count, dfs, _):
-	location = findLoc(dfs,'Attribute Classification',_)
-	global _ClassificationIssue_
-	if str(_classification).lower() not in mappingJsonFile['classification']:
+def __classification(_column, state):
+	_values = __lowered(_column)
+	for _, _classification in __failing(_column, ~_values.isin(TEMPLATE_INDEX.exact('classification'))):
 		if str(_classification).lower() == 'nan':
 			_classification = '*This field is mandatory'
 		issue = {
@@ -834,74 +867,61 @@ def __classification(_classification, count, dfs, _):
 				"issueValue":'The issue in the Attribute Classification',
 				"expectedValue":"Attribute Classification should be either Open, Confidential, Sensitive",
 				"actualValue":_classification,
-				"location":location,
+				"location":state.locate('Attribute Classification',_),
 				"issueDesc":"NA will be consider as No value for Mandatory Field and it is mandatory to fill the Attribute Classification. "
 			}
-		ClassificationIndex.append(issue)
+		state.ClassificationIndex.append(issue)
 		log.error(issue['issueValue'],extra=issue)
-	else:
-		pass
-	_ClassificationIssue_ = {}
-	if count['index'] == count['count']:
-		_ClassificationIssue_ = {
-			"Location" : "Attribute Classification",
-			"issues" : ClassificationIndex
-		}
-		if bool(_ClassificationIssue_['issues']):
-			allIssues.append(_ClassificationIssue_)
+	_ClassificationIssue_ = {
+		"Location" : "Attribute Classification",
+		"issues" : state.ClassificationIndex
+	}
+	if bool(_ClassificationIssue_['issues']):
+		state.allIssues.append(_ClassificationIssue_)
 
 '''
 	Check the Data Types for the issues.
-	@Params : _dataType - Data Type
-			  count - As it is the value of column for the xth row so need to find the end, thats why count is required.
-			  dfs - Data Frame - Required to find the location of the issue.
-			  _ - _ is the row Number for the current cursor.
+	@Params : _column - Data Type column of the current dataset
+			  state - Dataset State - Issue Blocks of the Dataset and location of the issue.
 	return : Append to Issue Block
 '''
 
-def __dataType(_dataType, count, dfs, _):
-	location = findLoc(dfs,'Attribute DataType',_)
-	global _DataTypeIssue_
-	if str(_dataType).lower() not in mappingJsonFile['dataTypes']:
+def __dataType(_column, state):
+	_values = __lowered(_column)
+	for _, _dataType in __failing(_column, ~_values.isin(TEMPLATE_INDEX.exact('dataTypes'))):
 		if str(_dataType).lower() == 'nan':
 			_dataType = '*This field is mandatory'
 		issue = {
 				"type":"ERROR",
 				"issueValue":'The issue in the Data Type',
-				"expectedValue":"Data Type should be match with " + listToComma(mappingJsonFile['dataTypes'] ),
+				"expectedValue":"Data Type should be match with " + TEMPLATE_INDEX.comma('dataTypes'),
 				"actualValue":_dataType,
-				"location":location,
+				"location":state.locate('Attribute DataType',_),
 				"issueDesc":"Data Type should be match with expected Value. Don't add (size) in Data Type. There is seperate column for Size."
 			}
-		DataTypeIndex.append(issue)
+		state.DataTypeIndex.append(issue)
 		log.error(issue['issueValue'],extra=issue)
-	else:
-		pass
-	_DataTypeIssue_ = {}
-	if count['index'] == count['count']:
-		_DataTypeIssue_ = {
-			"Location" : "Data Type",
-			"issues" : DataTypeIndex
-		}
-		if bool(_DataTypeIssue_['issues']):
-			allIssues.append(_DataTypeIssue_)
+	_DataTypeIssue_ = {
+		"Location" : "Data Type",
+		"issues" : state.DataTypeIndex
+	}
+	if bool(_DataTypeIssue_['issues']):
+		state.allIssues.append(_DataTypeIssue_)
 
 '''
 	Check the Size of Data Types for the issues.
 	@Params : _dataTypeSize - Data Type Size
 			  _dataType - Data Type at current Cursor.
 			  count - As it is the value of column for the xth row so need to find the end, thats why count is required.
-			  dfs - Data Frame - Required to find the location of the issue.
+			  state - Dataset State - Issue Blocks of the Dataset and location of the issue.
 			  _ - _ is the row Number for the current cursor.
 	return : Append to Issue Block
 '''
-def __dataTypeSize(_dataTypeSize,_dataType, count, dfs, _):
-	location = findLoc(dfs,'Attribute Size',_)
-	global _DataTypeSizeIssue_
+def __dataTypeSize(_dataTypeSize,_dataType, count, state, _):
 	if str(_dataTypeSize).lower() == 'nan':
-		if re.match("date|time", str(_dataType).lower()):
+		if DATE_TIME_PATTERN.match(str(_dataType).lower()):
 			pass;
-		elif str(_dataType).lower() in mappingJsonFile['numberDataTypeSize']:
+		elif str(_dataType).lower() in TEMPLATE_INDEX.exact('numberDataTypeSize'):
 			pass;
 		else:
 
@@ -911,14 +931,14 @@ def __dataTypeSize(_dataTypeSize,_dataType, count, dfs, _):
 					"issueValue":'The issue in the Data Type Size',
 					"expectedValue":"Size should be available for all Data Types except date,datetime. DataType is: "+str(_dataType)+" but the size is empty.",
 					"actualValue":_dataTypeSize,
-					"location":location,
+					"location":state.locate('Attribute Size',_),
 					"issueDesc":"Size should be available for all Data Types except date,datetime."
 				}
-			DataTypeSizeIndex.append(issue)
+			state.DataTypeSizeIndex.append(issue)
 			log.error(issue['issueValue'],extra=issue)
 	else:
 		_dataTypeSize = str(_dataTypeSize).split('.')[0]
-		if re.match("^[0-9,]*$", str(_dataTypeSize)):
+		if SIZE_PATTERN.match(str(_dataTypeSize)):
 			if ',' in str(_dataTypeSize):
 				if str(_dataTypeSize).split(',')[0] == '0':
 					issue = {
@@ -926,10 +946,10 @@ def __dataTypeSize(_dataTypeSize,_dataType, count, dfs, _):
 							"issueValue":'The issue in the Data Type Size',
 							"expectedValue":"Precision cannot be zero(0)",
 							"actualValue":str(_dataTypeSize),
-							"location":location,
+							"location":state.locate('Attribute Size',_),
 							"issueDesc":"The issue in the Data Type Size. Size should be numeric only or can have comma in case of float."
 						}
-					DataTypeSizeIndex.append(issue)
+					state.DataTypeSizeIndex.append(issue)
 					log.error(issue['issueValue'],extra=issue) 
 			if str(_dataTypeSize).strip() == '0':
 				issue = {
@@ -937,10 +957,10 @@ def __dataTypeSize(_dataTypeSize,_dataType, count, dfs, _):
 						"issueValue":'The issue in the Data Type Size',
 						"expectedValue":"Precision cannot be zero(0)",
 						"actualValue":str(_dataTypeSize),
-						"location":location,
+						"location":state.locate('Attribute Size',_),
 						"issueDesc":"The issue in the Data Type Size. Size should be numeric only or can have comma in case of float."
 					}
-				DataTypeSizeIndex.append(issue)
+				state.DataTypeSizeIndex.append(issue)
 				log.error(issue['issueValue'],extra=issue)
 		else:
 			_dataTypeSize = 'Only Number and comma is allowed'
@@ -949,43 +969,41 @@ def __dataTypeSize(_dataTypeSize,_dataType, count, dfs, _):
 					"issueValue":'The issue in the Data Type Size',
 					"expectedValue":"Only Number and comma is allowed. DataType is: "+str(_dataType)+" having alphabets or any other character",
 					"actualValue":_dataTypeSize,
-					"location":location,
+					"location":state.locate('Attribute Size',_),
 					"issueDesc":"The issue in the Data Type Size. Size should be numeric only or can have comma in case of float."
 				}
-			DataTypeSizeIndex.append(issue)
+			state.DataTypeSizeIndex.append(issue)
 			log.error(issue['issueValue'],extra=issue)
 	_DataTypeSizeIssue_ = {}
 	if count['index'] == count['count']:
 		_DataTypeSizeIssue_ = {
 			"Location" : "DataType Size",
-			"issues" : DataTypeSizeIndex
+			"issues" : state.DataTypeSizeIndex
 		}
 		if bool(_DataTypeSizeIssue_['issues']):
-			allIssues.append(_DataTypeSizeIssue_)
+			state.allIssues.append(_DataTypeSizeIssue_)
 
 '''
 	Check the Size of Date/Time Format for the issues.
 	@Params : _attributeRange - Attribute Range/Date Format
 			  _dataType - Data Type at current Cursor.
 			  count - As it is the value of column for the xth row so need to find the end, thats why count is required.
-			  dfs - Data Frame - Required to find the location of the issue.
+			  state - Dataset State - Issue Blocks of the Dataset and location of the issue.
 			  _ - _ is the row Number for the current cursor.
 	return : Append to Issue Block
 '''
-def __dateFormat(_attributeRange,_dataType, count, dfs, _):
-	location = findLoc(dfs,'Attribute Range of Values',_)
-	global _DateFormatIssue_
-	if re.match("date|time", str(_dataType).lower()):
-		if str(_attributeRange).lower() == 'nan' or str(_attributeRange).upper() not in mappingJsonFile['dateformat']:
+def __dateFormat(_attributeRange,_dataType, count, state, _):
+	if DATE_TIME_PATTERN.match(str(_dataType).lower()):
+		if str(_attributeRange).lower() == 'nan' or str(_attributeRange).upper() not in TEMPLATE_INDEX.exact('dateformat'):
 			issue = {
 					"type":"ERROR",
 					"issueValue":'The issue in the Date/Time Format',
 					"expectedValue":"Date/Time Format should be one of UDF_TO_DATETIME valid formats. ",
 					"actualValue":_attributeRange,
-					"location":location,
+					"location":state.locate('Attribute Range of Values',_),
 					"issueDesc":"Date/Time Format not matching one of the valid formats from UDF_TO_DATETIME"
 			}
-			DateTimeFormatIndex.append(issue)
+			state.DateTimeFormatIndex.append(issue)
 			log.error(issue['issueValue'],extra=issue)
 		else:
 			pass;
@@ -993,558 +1011,619 @@ def __dateFormat(_attributeRange,_dataType, count, dfs, _):
 	if count['index'] == count['count']:
 		_DateFormatIssue_ = {
 			"Location" : "DateTime Format",
-			"issues" : DateTimeFormatIndex
+			"issues" : state.DateTimeFormatIndex
 		}
 		if bool(_DateFormatIssue_['issues']):
-			allIssues.append(_DateFormatIssue_)
+			state.allIssues.append(_DateFormatIssue_)
 
 '''
 	Check the Connectivity for the issues.
-	@Params : _connectivity - Connectivity
-			  count - As it is the value of column for the xth row so need to find the end, thats why count is required.
-			  dfs - Data Frame - Required to find the location of the issue.
-			  _ - _ is the row Number for the current cursor.
+	@Params : _column - Connectivity column of the current dataset
+			  state - Dataset State - Issue Blocks of the Dataset and location of the issue.
 	return : Append to Issue Block
 '''
-def __connectivity(_connectivity, count, dfs, _):
-	location = findLoc(dfs,'Connectivity Option',_)
-	global _ConnectivityIssue_
-	if str(_connectivity).lower() not in map(lambda x: x.lower(), mappingJsonFile['connectivity']) :
-		if str(_connectivity).lower() == 'nan':
-			pass;
-		else:
-			issue = {
-					"type":"ERROR",
-					"issueValue":'The issue in the Connectivity Option.',
-					"expectedValue":"Connectivity should be match with " + listToComma(mappingJsonFile['connectivity'] ),
-					"actualValue":_connectivity,
-					"location":location,
-					"issueDesc":"Connectivity should be match with expected values."
-				}
-			ConnectivityIndex.append(issue)
-			log.error(issue['issueValue'],extra=issue)
-	else:
-		pass
-	_ConnectivityIssue_ = {}
-	if count['index'] == count['count']:
-		_ConnectivityIssue_ = {
-			"Location" : "Connectivity Issue",
-			"issues" : ConnectivityIndex
-		}
-		if bool(_ConnectivityIssue_['issues']):
-			allIssues.append(_ConnectivityIssue_)
+def __connectivity(_column, state):
+	_values = __lowered(_column)
+	_invalid = ~_values.isin(TEMPLATE_INDEX.lowered('connectivity')) & (_values != 'nan')
+	for _, _connectivity in __failing(_column, _invalid):
+		issue = {
+				"type":"ERROR",
+				"issueValue":'The issue in the Connectivity Option.',
+				"expectedValue":"Connectivity should be match with " + TEMPLATE_INDEX.comma('connectivity'),
+				"actualValue":_connectivity,
+				"location":state.locate('Connectivity Option',_),
+				"issueDesc":"Connectivity should be match with expected values."
+			}
+		state.ConnectivityIndex.append(issue)
+		log.error(issue['issueValue'],extra=issue)
+	_ConnectivityIssue_ = {
+		"Location" : "Connectivity Issue",
+		"issues" : state.ConnectivityIndex
+	}
+	if bool(_ConnectivityIssue_['issues']):
+		state.allIssues.append(_ConnectivityIssue_)
 
 '''
 	Check the Connectivity Description for the issues.
-	@Params : _connectivityDesc - Connectivity Description
-			  count - As it is the value of column for the xth row so need to find the end, thats why count is required.
-			  dfs - Data Frame - Required to find the location of the issue.
-			  _ - _ is the row Number for the current cursor.
+	@Params : _column - Connectivity Description column of the current dataset
+			  state - Dataset State - Issue Blocks of the Dataset and location of the issue.
 	return : Append to Issue Block
 '''
-def __connectivityDesc(_connectivityDesc, count, dfs, _):
-	Connectivity_TYPE.append(_connectivityDesc)
-	location = findLoc(dfs,'Description for Connectivity',_)
-	global _ConnectivityDescIssue_
-	if str(_connectivityDesc).lower() not in map(lambda x: x.lower(), mappingJsonFile['connectivityDesc']) :
-		if str(_connectivityDesc).lower() == 'nan':
-			if True in list(map(lambda x:str(x) != 'nan',Connectivity_TYPE)):
-				pass
-			else:
-				issue = {
-						"type":"ERROR",
-						"issueValue":'The issue in the Connectivity Description.',
-						"expectedValue":"Connectivity Description should be match with " + listToComma(mappingJsonFile['connectivityDesc'] ),
-						"actualValue":_connectivityDesc,
-						"location":location,
-						"issueDesc":"Connectivity Description should be match with expected values."
-					}
-				ConnectivityDescIndex.append(issue)
-				log.error(issue['issueValue'],extra=issue)
-		else:
+def __connectivityDesc(_column, state):
+	_values = __lowered(_column)
+	_first, _count = __mergedCell(_column)
+	# Empty cell is fine once the Connectivity Description is filled in an earlier row of the Dataset (merged cell)
+	_invalid = ~_values.isin(TEMPLATE_INDEX.lowered('connectivityDesc')).to_numpy() & ~((_values == 'nan').to_numpy() & (np.arange(len(_column)) >= _first))
+	for _, _connectivityDesc in __failing(_column, _invalid):
+		issue = {
+				"type":"ERROR",
+				"issueValue":'The issue in the Connectivity Description.',
+				"expectedValue":"Connectivity Description should be match with " + TEMPLATE_INDEX.comma('connectivityDesc'),
+				"actualValue":_connectivityDesc,
+				"location":state.locate('Description for Connectivity',_),
+				"issueDesc":"Connectivity Description should be match with expected values."
+			}
+		state.ConnectivityDescIndex.append(issue)
+		log.error(issue['issueValue'],extra=issue)
+	_ConnectivityDescIssue_ = {
+		"Location" : "Connectivity Description Issue",
+		"issues" : state.ConnectivityDescIndex
+	}
+	if bool(_ConnectivityDescIssue_['issues']):
+		state.allIssues.append(_ConnectivityDescIssue_)
+
+'''
+	Check the Encoding of Dataset. Encoding is a merged cell, it is enough to have it on one row of the Dataset.
+	@Params : _column - Encoding column of the current dataset
+			  state - Dataset State - Issue Blocks of the Dataset and location of the issue.
+			  _ranges - Merged ranges of the column, None if not known
+	return : Append to Issue Block
+'''
+def __checkEncoding(_column, state, _ranges=None):
+	_first, _count = __mergedCell(_column, _ranges)
+	if _count == 0:
+		for _, _encoding in zip(_column.index, _column.to_numpy(dtype=object)):
 			issue = {
 					"type":"ERROR",
-					"issueValue":'The issue in the Connectivity Description.',
-					"expectedValue":"Connectivity Description should be match with " + listToComma(mappingJsonFile['connectivityDesc'] ),
-					"actualValue":_connectivityDesc,
-					"location":location,
-					"issueDesc":"Connectivity Description should be match with expected values."
+					"issueValue":'The issue in the Encoding.',
+					"expectedValue":"Encoding is mandatory. If encoding exist in seperate column, merge the encoding columns",
+					"actualValue":_encoding,
+					"location":state.locate('Code Page',_),
+					"issueDesc":"Encoding Column should be merged for the Dataset, it should be a single value."
 				}
-			ConnectivityDescIndex.append(issue)
+			state.EncodingIndex.append(issue)
 			log.error(issue['issueValue'],extra=issue)
-	else:
-		pass
-	_ConnectivityDescIssue_ = {}
-	if count['index'] == count['count']:
-		_ConnectivityDescIssue_ = {
-			"Location" : "Connectivity Description Issue",
-			"issues" : ConnectivityDescIndex
+		_EncodingIssue_ = {
+			"Location" : "Encoding Issue",
+			"issues" : state.EncodingIndex
 		}
-		if bool(_ConnectivityDescIssue_['issues']):
-			allIssues.append(_ConnectivityDescIssue_)
+		if bool(_EncodingIssue_['issues']):
+			state.allIssues.append(_EncodingIssue_)
 
 '''
-	Check the Encoding of Dataset.
-	@Params : _encoding - Encoding
-			  count - As it is the value of column for the xth row so need to find the end, thats why count is required.
-			  dfs - Data Frame - Required to find the location of the issue.
-			  _ - _ is the row Number for the current cursor.
+	Check the Delimeter of Dataset from Data Contract. The first Delimiter of the Dataset is kept for the Sample File.
+	@Params : _column - Delimiter column of the current dataset
+			  _other - Delimiter Other column, used when the Delimiter is Other
+			  state - Dataset State - Issue Blocks of the Dataset and location of the issue.
+			  _ranges - Merged ranges of the Delimiter column, None if not known
 	return : Append to Issue Block
 '''
-def __checkEncoding(_encoding, count, dfs, _):
-	ENCODING.append(_encoding)
-	location = findLoc(dfs,'Code Page',_)
-	global _EncodingIssue_
-	if True in list(map(lambda x:str(x) != 'nan',ENCODING)):
-		pass
-	else:
-
-		if str(_encoding).lower() != 'utf-8':
-			if str(_encoding).lower() == 'nan':
-				issue = {
-						"type":"ERROR",
-						"issueValue":'The issue in the Encoding.',
-						"expectedValue":"Encoding is mandatory. If encoding exist in seperate column, merge the encoding columns",
-						"actualValue":_encoding,
-						"location":location,
-						"issueDesc":"Encoding Column should be merged for the Dataset, it should be a single value."
-					}
-				EncodingIndex.append(issue)
-				log.error(issue['issueValue'],extra=issue)
-			else:
-				issue = {
-						"type":"ERROR",
-						"issueValue":'The issue in the Encoding.',
-						"expectedValue":"Encoding should be UTF-8",
-						"actualValue":_encoding,
-						"location":location,
-						"issueDesc":"Code Page Column shoud be UTF-8 without Spaces."
-					}
-				EncodingIndex.append(issue)
-				log.error(issue['issueValue'],extra=issue)
+def __checkDelimiter(_column, _other, state, _ranges=None):
+	_first, _count = __mergedCell(_column, _ranges)
+	if _count > 0:
+		_delimiter = _column.iat[_first]
+		if str(_delimiter) != 'Other':
+			state.DELIMITER_VALUE.append(str(_delimiter))
 		else:
-			pass
-		_EncodingIssue_ = {}
-		if count['index'] == count['count']:
-			_EncodingIssue_ = {
-				"Location" : "Encoding Issue",
-				"issues" : EncodingIndex
-			}
-			if bool(_EncodingIssue_['issues']):
-				allIssues.append(_EncodingIssue_)
-
-'''
-	Check the Delimeter of Dataset from Data Contract.
-	@Params : _delimiter - Delimiter
-			  count - As it is the value of column for the xth row so need to find the end, thats why count is required.
-			  dfs - Data Frame - Required to find the location of the issue.
-			  _ - _ is the row Number for the current cursor.
-	return : Append to Issue Block
-'''
-def __checkDelimiter(_delimiter, _delimiterother, count, dfs, _):
-	DELIMITER.append(_delimiter)
-	location = findLoc(dfs,'Attribute Delimiter',_)
-	global _DelimiterIssue_
-	if True in list(map(lambda x:str(x) != 'nan',DELIMITER)):
-		if str(_delimiter) != 'nan':
-			if str(_delimiter) != 'Other':
-				DELIMITER_VALUE.append(str(_delimiter))
-			else:
-				DELIMITER_VALUE.append(str(_delimiterother))
-		pass
+			state.DELIMITER_VALUE.append(str(_other.iat[_first]))
 	else:
-		if str(_delimiter).lower() == 'nan':
+		for _, _delimiter in zip(_column.index, _column.to_numpy(dtype=object)):
 			issue = {
 					"type":"ERROR",
 					"issueValue":'The issue in the Delimiter.',
 					"expectedValue":"Delimiter is mandatory. If Delimiter exist in seperate column, merge the Delimiter columns",
 					"actualValue":_delimiter,
-					"location":location,
+					"location":state.locate('Attribute Delimiter',_),
 					"issueDesc":"Delimiter Column should be merged for the Dataset, it should be a single value."
 				}
-			DelimiterIndex.append(issue)
+			state.DelimiterIndex.append(issue)
 			log.error(issue['issueValue'],extra=issue)
-		else:
-			pass
-		_DelimiterIssue_ = {}
-		if count['index'] == count['count']:
-			_DelimiterIssue_ = {
-				"Location" : "Delimiter Issue",
-				"issues" : DelimiterIndex
-			}
-			if bool(_DelimiterIssue_['issues']):
-				allIssues.append(_DelimiterIssue_)
+		_DelimiterIssue_ = {
+			"Location" : "Delimiter Issue",
+			"issues" : state.DelimiterIndex
+		}
+		if bool(_DelimiterIssue_['issues']):
+			state.allIssues.append(_DelimiterIssue_)
 
 '''
-	Check the Service for the issues.
-	@Params : _service - Service
-			  count - As it is the value of column for the xth row so need to find the end, thats why count is required.
-			  dfs - Data Frame - Required to find the location of the issue.
-			  _ - _ is the row Number for the current cursor.
+	Check the Service for the issues. Service is a merged cell, it is enough to have it on one row of the Dataset.
+	@Params : _column - Service column of the current dataset
+			  state - Dataset State - Issue Blocks of the Dataset and location of the issue.
+			  _ranges - Merged ranges of the column, None if not known
 	return : Append to Issue Block
 '''
-def __checkService(_service, count, dfs, _):
-	SERVICE.append(_service)
-	location = findLoc(dfs,'Service',_)
-	global _ServiceIssue_
-	if True in list(map(lambda x:str(x) != 'nan',SERVICE)):
-		pass
-	else:
-		if str(_service).lower() == 'nan':
+def __checkService(_column, state, _ranges=None):
+	_first, _count = __mergedCell(_column, _ranges)
+	if _count == 0:
+		for _, _service in zip(_column.index, _column.to_numpy(dtype=object)):
 			issue = {
 					"type":"ERROR",
 					"issueValue":'The issue in the Service.',
 					"expectedValue":"Service is mandatory. If encoding exist in seperate column, merge the service columns",
 					"actualValue":_service,
-					"location":location,
+					"location":state.locate('Service',_),
 					"issueDesc":"Service Column should be merged for the Dataset, it should be a single value."
 				}
-			ServiceIndex.append(issue)
+			state.ServiceIndex.append(issue)
 			log.error(issue['issueValue'],extra=issue)
-		_ServiceIssue_ = {}
-		if count['index'] == count['count']:
-			_ServiceIssue_ = {
-				"Location" : "Service Issue",
-				"issues" : ServiceIndex
-			}
-			if bool(_ServiceIssue_['issues']):
-				allIssues.append(_ServiceIssue_)
+		_ServiceIssue_ = {
+			"Location" : "Service Issue",
+			"issues" : state.ServiceIndex
+		}
+		if bool(_ServiceIssue_['issues']):
+			state.allIssues.append(_ServiceIssue_)
 
 '''
-	Check the Category for the issues.
-	@Params : _category - Category
-			  count - As it is the value of column for the xth row so need to find the end, thats why count is required.
-			  dfs - Data Frame - Required to find the location of the issue.
-			  _ - _ is the row Number for the current cursor.
+	Check the Category for the issues. Category is a merged cell, it is enough to have it on one row of the Dataset.
+	@Params : _column - Category column of the current dataset
+			  state - Dataset State - Issue Blocks of the Dataset and location of the issue.
+			  _ranges - Merged ranges of the column, None if not known
 	return : Append to Issue Block
 '''
-def __checkCategory(_category, count, dfs, _):
-	CATEGORY.append(_category)
-	location = findLoc(dfs,'Category',_)
-	global _CategoryIssue_
-	if True in list(map(lambda x:str(x) != 'nan',CATEGORY)):
-		pass
-	else:
-
-		if str(_category).lower() == 'nan':
+def __checkCategory(_column, state, _ranges=None):
+	_first, _count = __mergedCell(_column, _ranges)
+	if _count == 0:
+		for _, _category in zip(_column.index, _column.to_numpy(dtype=object)):
 			issue = {
 					"type":"ERROR",
 					"issueValue":'The issue in the Category.',
 					"expectedValue":"Category is mandatory. If encoding exist in seperate column, merge the Category columns",
 					"actualValue":_category,
-					"location":location,
+					"location":state.locate('Category',_),
 					"issueDesc":"Category Column should be merged for the Dataset, it should be a single value."
 				}
-			CategoryIndex.append(issue)
+			state.CategoryIndex.append(issue)
 			log.error(issue['issueValue'],extra=issue)
-		_CategoryIssue_ = {}
-		if count['index'] == count['count']:
-			_CategoryIssue_ = {
-				"Location" : "Category Issue",
-				"issues" : CategoryIndex
-			}
-			if bool(_CategoryIssue_['issues']):
-				allIssues.append(_CategoryIssue_)
+		_CategoryIssue_ = {
+			"Location" : "Category Issue",
+			"issues" : state.CategoryIndex
+		}
+		if bool(_CategoryIssue_['issues']):
+			state.allIssues.append(_CategoryIssue_)
 
 '''
-	Check the Entity for the issues.
-	@Params : _entity - Entity
-			  count - As it is the value of column for the xth row so need to find the end, thats why count is required.
-			  dfs - Data Frame - Required to find the location of the issue.
-			  _ - _ is the row Number for the current cursor.
+	Check the Entity for the issues. Entity is a merged cell, it is enough to have it on one row of the Dataset.
+	@Params : _column - Entity column of the current dataset
+			  state - Dataset State - Issue Blocks of the Dataset and location of the issue.
+			  _ranges - Merged ranges of the column, None if not known
 	return : Append to Issue Block
 '''
-def __checkEntity(_entity, count, dfs, _):
-	ENTITYDC.append(_entity)
-	location = findLoc(dfs,'Entity',_)
-	global _EntityIssue_
-	if True in list(map(lambda x:str(x) != 'nan',ENTITYDC)):
-		pass
-	else:
-		if str(_entity).lower() == 'nan':
+def __checkEntity(_column, state, _ranges=None):
+	_first, _count = __mergedCell(_column, _ranges)
+	if _count == 0:
+		for _, _entity in zip(_column.index, _column.to_numpy(dtype=object)):
 			issue = {
 					"type":"ERROR",
 					"issueValue":'The issue in the Entity.',
 					"expectedValue":"Entity is mandatory. If encoding exist in seperate column, merge the entity columns",
 					"actualValue":_entity,
-					"location":location,
+					"location":state.locate('Entity',_),
 					"issueDesc":"Entity Column should be merged for the Dataset, it should be a single value."
 				}
-			EntityIndex.append(issue)
+			state.EntityIndex.append(issue)
 			log.error(issue['issueValue'],extra=issue)
-		_EntityIssue_ = {}
-		if count['index'] == count['count']:
-			_EntityIssue_ = {
-				"Location" : "Entity Issue",
-				"issues" : EntityIndex
-			}
-			if bool(_EntityIssue_['issues']):
-				allIssues.append(_EntityIssue_)
+		_EntityIssue_ = {
+			"Location" : "Entity Issue",
+			"issues" : state.EntityIndex
+		}
+		if bool(_EntityIssue_['issues']):
+			state.allIssues.append(_EntityIssue_)
 
 '''
 	Check the Classification
-	@Params : _classification - Classification
-			  count - As it is the value of column for the xth row so need to find the end, thats why count is required.
-			  dfs - Data Frame - Required to find the location of the issue.
-			  _ - _ is the row Number for the current cursor.
+	@Params : _column - Classification column of the current dataset
+			  state - Dataset State - Issue Blocks of the Dataset and location of the issue.
+			  attributeClassificationList - Attribute Classification of the Dataset, the Dataset Classification should
+											match the highest Attribute Classification.
 	return : Append to Issue Block
 '''
-def __checkClassification(_classification, count, dfs, _,attributeClassificationList):
-	_attributeClassificationList = []
-	DATASET_CLASSIFICATION.append(_classification)
-	location = findLoc(dfs,'Data Classification Type',_)
-	global _DatasetClassificationIssue_
-	if str(_classification).lower() not in map(lambda x: x.lower(), mappingJsonFile['classification']) :
-		if str(_classification).lower() == 'nan':
-			if True in list(map(lambda x:str(x) != 'nan',DATASET_CLASSIFICATION)):
-				pass
-			else:
-				issue = {
-						"type":"ERROR",
-						"issueValue":'The issue in the Classification.',
-						"expectedValue":"Classification should be match with " + listToComma(mappingJsonFile['classification'] ),
-						"actualValue":_classification,
-						"location":location,
-						"issueDesc":"Classification should be match with expected values."
-					}
-				DatasetClassificationIndex.append(issue)
-				log.error(issue['issueValue'],extra=issue)
-		else:
-			issue = {
-						"type":"ERROR",
-						"issueValue":'The issue in the Classification.',
-						"expectedValue":"Classification should be match with " + listToComma(mappingJsonFile['classification'] ),
-						"actualValue":_classification,
-						"location":location,
-						"issueDesc":"Classification should be match with expected values."
-					}
-			DatasetClassificationIndex.append(issue)
-			log.error(issue['issueValue'],extra=issue)
+def __checkClassification(_column, state, attributeClassificationList):
+	_values = __lowered(_column)
+	_first, _count = __mergedCell(_column)
+	_valid = _values.isin(TEMPLATE_INDEX.lowered('classification')).to_numpy()
+	# Empty cell is fine once the Classification is filled in an earlier row of the Dataset (merged cell)
+	_invalid = ~_valid & ~((_values == 'nan').to_numpy() & (np.arange(len(_column)) >= _first))
+	_attributeClassificationList = set(str(attr).lower().strip() for attr in attributeClassificationList)
+	if 'sensitive' in _attributeClassificationList:
+		_mismatch = _valid & (_values != 'sensitive').to_numpy()
+	elif 'confidential' in _attributeClassificationList:
+		_mismatch = _valid & (_values.str.strip() != 'confidential').to_numpy()
 	else:
-		for attr in attributeClassificationList:
-			_attributeClassificationList.append(attr.lower().strip())
-		if 'sensitive' in _attributeClassificationList:
-			if _classification.lower() != 'sensitive':
-				issue = {
-							"type":"ERROR",
-							"issueValue":'The issue in the Classification.',
-							"expectedValue":"Classification is not matching with the attribute level classification",
-							"actualValue":_classification,
-							"location":location,
-							"issueDesc":"Classification should be match with expected values."
-						}
-				DatasetClassificationIndex.append(issue)
-				log.error(issue['issueValue'],extra=issue)
-		elif 'confidential' in _attributeClassificationList and 'sensitive' not in _attributeClassificationList:
-			if _classification.lower().strip() != 'confidential':
-				issue = {
-							"type":"ERROR",
-							"issueValue":'The issue in the Classification.',
-							"expectedValue":"Classification is not matching with the attribute level classification",
-							"actualValue":_classification,
-							"location":location,
-							"issueDesc":"Classification should be match with expected values."
-						}
-				DatasetClassificationIndex.append(issue)
-				log.error(issue['issueValue'],extra=issue)
-	_DatasetClassificationIssue_ = {}
-	if count['index'] == count['count']:
-		_DatasetClassificationIssue_ = {
-			"Location" : "Dataset Classification Issue",
-			"issues" : DatasetClassificationIndex
-		}
-		if bool(_DatasetClassificationIssue_['issues']):
-			allIssues.append(_DatasetClassificationIssue_)
+		_mismatch = np.zeros(len(_column), dtype=bool)
+	_cells = _column.to_numpy(dtype=object)
+	for _position in np.flatnonzero(_invalid | _mismatch):
+		_ = _column.index[_position]
+		if _valid[_position]:
+			_expectedValue = "Classification is not matching with the attribute level classification"
+		else:
+			_expectedValue = "Classification should be match with " + TEMPLATE_INDEX.comma('classification')
+		issue = {
+					"type":"ERROR",
+					"issueValue":'The issue in the Classification.',
+					"expectedValue":_expectedValue,
+					"actualValue":_cells[_position],
+					"location":state.locate('Data Classification Type',_),
+					"issueDesc":"Classification should be match with expected values."
+				}
+		state.DatasetClassificationIndex.append(issue)
+		log.error(issue['issueValue'],extra=issue)
+	_DatasetClassificationIssue_ = {
+		"Location" : "Dataset Classification Issue",
+		"issues" : state.DatasetClassificationIndex
+	}
+	if bool(_DatasetClassificationIssue_['issues']):
+		state.allIssues.append(_DatasetClassificationIssue_)
+
+'''
+	Use : Dataset Partitions
+	Desc : Split the Data Contract into its Datasets in a single pass. Once the Dataset Name is forward filled the rows
+		   of a Dataset are consecutive, so the Dataset is a slice of the Data Frame and no copy is made. A Dataset
+		   Name repeated further down the sheet keeps the positions of all its rows.
+	@Params : dfs - Data Frame - Forward filled Data Contract
+	returns : List of (Dataset Name, rows) in the order of the Data Contract
+'''
+def partitionDatasets(dfs):
+	partitions = []
+	_groups = dfs.groupby('Dataset Name', sort=False).indices
+	for dataset, _positions in sorted(_groups.items(), key=lambda group: group[1][0]):
+		if _positions[-1] - _positions[0] + 1 == len(_positions):
+			partitions.append((dataset, slice(int(_positions[0]), int(_positions[-1]) + 1)))
+		else:
+			partitions.append((dataset, _positions))
+	return partitions
 
 '''
-	Use : Postgres Connectivity
-	Desc : COnnect to postgres to fetch Entities.
+	Use : Validate a Dataset
+	Desc : Run every check over the columns of the Dataset, in the order the Issue Blocks are reported. The merged
+		   ranges kept by the Contract Reader are given to the merged column checks.
+	@Params : _dfs - Data Frame of the current Dataset
+			  state - Dataset State - Issue Blocks of the Dataset and location of the issue.
+	return : Append to Issue Block
 '''
-def connect_to_postgres(psql_db, psql_user, psql_password, psql_host, psql_port):
-	# Connect to PostgreSQL database using credentials from config file.  
-	try:
-		db_params = {
-			'dbname': psql_db,
-			'user': psql_user,
-			'password': psql_password,
-			'host': psql_host,
-			'port': psql_port
-			}
-
-		connection = psycopg2.connect(**db_params)
-		cursor = connection.cursor()
-		log.info("Successfully connected to the database")
-		return connection, cursor
-	except Exception as error:
-		log.error(f"Error connecting to PostgreSQL: {error}")
-		return None, None
-
-
+def validateDataset(_dfs, state):
+	_attributeClassificationList = _dfs['Attribute Classification'].to_numpy(dtype=object)
+	_merged = _dfs.attrs.get(MERGED_CELLS)
+	_ranges = (lambda column: _merged.get(column, [])) if _merged is not None else (lambda column: None)
+	__ingestionType(_dfs['Ingestion Logic'], state)
+	__rowWise(__dataset, _dfs, state, ['Dataset Name'])   #------ do we want to check the length of the dataset name??
+	__rowWise(__attribute, _dfs, state, ['Attribute'])
+	# #143 suggested that special characters should be allowed as description is free text so no check is required for Description
+	# Commenting the Function Defination if required in later stage.
+	# __rowWise(__attributeDescription, _dfs, state, ['Attribute Description'])
+	__attributeNullability(_dfs['Attribute Nullability'], state)
+	__attributePrimaryKey(_dfs['Attribute Primary Key'], _dfs['Ingestion Logic'], state)
+	__attributeUniqueness(_dfs['Attribute Uniqueness'], state)
+	__format(_dfs['Format (MIME)'], state)
+	__splitLogic(_dfs['Split Logic'], state)
+	__dataContractType(_dfs['DataContract Type'], state)
+	__frequency(_dfs, state, ['Frequency of Update on Source', 'Frequency of Update to SDP'])
+	__language(_dfs['Language'], state)  #--------- not in & !=nan should be not in or !=nan
+	__classification(_dfs['Attribute Classification'], state)
+	__dataType(_dfs['Attribute DataType'], state)
+	__rowWise(__dataTypeSize, _dfs, state, ['Attribute Size', 'Attribute DataType'])
+	__rowWise(__dateFormat, _dfs, state, ['Attribute Range of Values', 'Attribute DataType'])
+	__connectivity(_dfs['Connectivity Option'], state)
+	__connectivityDesc(_dfs['Description for Connectivity'], state)
+	__checkEncoding(_dfs['Code Page'], state, _ranges('Code Page'))
+	__checkDelimiter(_dfs['Attribute Delimiter'], _dfs['Attribute Delimiter- Other'], state, _ranges('Attribute Delimiter'))
+	__checkService(_dfs['Service'], state, _ranges('Service'))
+	__checkCategory(_dfs['Category'], state, _ranges('Category'))
+	__checkEntity(_dfs['Entity'], state, _ranges('Entity'))
+	__checkClassification(_dfs['Data Classification Type'], state, _attributeClassificationList)
+
+'''
+	Use : Check a Dataset
+	Desc : Validate the Dataset and its Sample File with the given state. Used by the serial run and by the workers of --jobs.
+	@Params : state - Dataset State
+			  dataset - Dataset Name
+			  _dfs - Data Frame of the Dataset
+			  locate - Cell Locator of the Data Contract
+			  entity - Entity Name of the Data Contract
+			  path - Data Contract Directory
+			  sampleOptions - Sample File Options
+	return : Dataset Issue or None if the Dataset has no issue
+'''
+def checkDataset(state, dataset, _dfs, locate, entity, path, sampleOptions=SAMPLE_DEFAULTS):
+	state.reset(dataset, locate)
+	validateDataset(_dfs, state)
+	parseSampleFile(camelCase(strippedText(dataset)), _dfs['Attribute'].to_numpy(dtype=object), state, entity, path, sampleOptions, sampleSchema(_dfs, TEMPLATE_INDEX.upper('dateformat')) if sampleOptions.schema() else None)
+	return state.result()
+
+#State of a worker process of --jobs, created by initDatasetWorker
+WORKER = {}
+
+'''
+	Use : Start a Dataset Worker
+	Desc : Every worker process keeps one DatasetState and the details of the Data Contract for all the Datasets it receives.
+	@Params : locate - Cell Locator of the Data Contract
+			  entity - Entity Name of the Data Contract
+			  path - Data Contract Directory
+			  sampleOptions - Sample File Options
+'''
+def initDatasetWorker(locate, entity, path, sampleOptions):
+	WORKER['state'] = DatasetState()
+	WORKER['locate'] = locate
+	WORKER['entity'] = entity
+	WORKER['path'] = path
+	WORKER['sampleOptions'] = sampleOptions
+
+'''
+	Use : Dataset Worker
+	@Params : job - (Dataset Name, Data Frame of the Dataset)
+	return : Dataset Issue or None
+'''
+def checkDatasetJob(job):
+	dataset, _dfs = job
+	return checkDataset(WORKER['state'], dataset, _dfs, WORKER['locate'], WORKER['entity'], WORKER['path'], WORKER['sampleOptions'])
 
 '''
 	Parse the data contract and pass it to all the checking functions
 	@Params : dfs - Data Frame - Required to find the location of the issue.
-			  _ - _ is the row Number for the current cursor.
+			  jobs - Worker processes used to validate the Datasets, 0 uses every CPU
+			  cache - Dataset Cache of the Data Contract, only the Datasets which changed are validated
+			  sampleOptions - Sample File Options
 	return : Append to Issue Block
 '''	
-def parseDatasets(dfs):
-	dfs = dfs.dropna(how='all')
-	##dfs[['Dataset Name']] = dfs[['Dataset Name']].fillna(method='ffill')
-	##dfs = dfs.fillna(method='ffill')
-	dfs['Dataset Name'] = dfs['Dataset Name'].ffill()
-	dfs = dfs.ffill()
-	datasets = dfs['Dataset Name'].dropna().unique()
-	_dataset = []
-	_loc = dfs.columns.get_loc('Attribute')
-	_classificationLoc = dfs.columns.get_loc('Attribute Classification')
-	for index, dataset in enumerate(datasets):
-		_dfs = dfs.loc[dfs['Dataset Name'] == dataset]
-		_dataset_ = camelCase(strippedText(dataset))
-		cleanIndexes()
-		count = len(_dfs)
-		_index_ = 0
-		_count_ = {
-			"count" : count,
-			"index": _index_
-		}
-		INGESTION_TYPE = []
-		Connectivity_TYPE = []
-		DATASET_CLASSIFICATION = []
-		PRIMARY_KEY = []
-
-		_attributeExecuted  = False
-		
-		for idx, (_, row) in enumerate(_dfs.iterrows()):
-			
-			if _attributeExecuted == False:
-				_indexRange = list(dfs.loc[dfs['Dataset Name']==dataset].index)
-				_start  = _indexRange[0]
-				_end = _indexRange[-1] + 1
-				_attributeList = dfs.values[_start:_end,_loc]
-				_attributeClassificationList = dfs.values[_start:_end,_classificationLoc]
-				_attributeExecuted = True
-			
-			_index_ = _index_+ 1
-			_count_["index"] = _index_
-			__ingestionType(row['Ingestion Logic'], _count_, dfs, _)	
-			__dataset(row['Dataset Name'], _count_, dfs, _)   #------ do we want to check the length of the dataset name??
-			__attribute(row['Attribute'], _count_, dfs, _)
-			# #143 suggested that special characters should be allowed as description is free text so no check is required for Description
-			# Commenting the Function Defination if required in later stage.
-			# __attributeDescription(row['Attribute Description'], _count_, dfs, _)
-			__attributeNullability(row['Attribute Nullability'], _count_, dfs, _)
-			__attributePrimaryKey(row['Attribute Primary Key'], _count_, dfs, _)
-			__attributeUniqueness(row['Attribute Uniqueness'], _count_, dfs, _)
-			__format(row['Format (MIME)'], _count_, dfs, _)
-			__splitLogic(row['Split Logic'], _count_, dfs, _)
-			__dataContractType(row['DataContract Type'], _count_, dfs, _)
-			__frequency(row['Frequency of Update on Source'], _count_, dfs, 'Frequency of Update on Source' , _)
-			__frequency(row['Frequency of Update to SDP'], _count_, dfs, 'Frequency of Update to SDP' , _)
-			__language(row['Language'], _count_, dfs, _)  #--------- not in & !=nan should be not in or !=nan
-			__classification(row['Attribute Classification'], _count_, dfs, _)
-			__dataType(row['Attribute DataType'], _count_, dfs, _)
-			__dataTypeSize(row['Attribute Size'],row['Attribute DataType'], _count_, dfs, _)
-			__dateFormat(row['Attribute Range of Values'],row['Attribute DataType'], _count_, dfs, _)
-			__connectivity(row['Connectivity Option'], _count_, dfs, _)
-			__connectivityDesc(row['Description for Connectivity'], _count_, dfs, _)
-			__checkEncoding(row['Code Page'], _count_, dfs, _)
-			__checkDelimiter(row['Attribute Delimiter'], row['Attribute Delimiter- Other'], _count_, dfs, _)
-			__checkService(row['Service'], _count_, dfs, _)
-			__checkCategory(row['Category'], _count_, dfs, _)
-			__checkEntity(row['Entity'], _count_, dfs, _)
-			__checkClassification(row['Data Classification Type'], _count_, dfs, _,_attributeClassificationList)
-		parseSampleFile(_dataset_,_attributeList)	
-		if len(allIssues) > 0:
-			mainIssue = {
-				"DatasetName" : dataset,
-				"allIssue" : allIssues
-			}
+def parseDatasets(dfs, jobs=1, cache=None, sampleOptions=SAMPLE_DEFAULTS):
+	dfs = fillContract(dfs) # Merged cells are expanded by the reader, forward filled otherwise
+	locate = CellLocator(dfs) # Location of the issues, resolved only when an issue is reported
+	datasets = [(dataset, dfs.iloc[_rows]) for dataset, _rows in partitionDatasets(dfs)]
+	results = [None] * len(datasets)
+	changed = list(range(len(datasets)))
+	if cache is not None:
+		fingerprints = [cache.fingerprint(_dfs, locate, sampleFilesOf(data_contract + 'sampleFiles', _entityName + '_' + camelCase(strippedText(dataset)))) for dataset, _dfs in datasets]
+		changed = []
+		for position, (dataset, _) in enumerate(datasets):
+			cached, results[position] = cache.lookup(str(dataset), fingerprints[position])
+			if not cached:
+				changed.append(position)
+		log.info('%s of %s Datasets changed since the last run', len(changed), len(datasets))
+	pending = [datasets[position] for position in changed]
+	if jobs < 1:
+		jobs = os.cpu_count() or 1
+	jobs = min(jobs, len(pending))
+	if jobs > 1:
+		#Results come back in the order of the Datasets, the issues are the same as the serial run
+		log.info('Validating %s Datasets on %s processes', len(pending), jobs)
+		with ProcessPoolExecutor(max_workers=jobs, initializer=initDatasetWorker, initargs=(locate, _entityName, data_contract, sampleOptions)) as executor:
+			validated = list(executor.map(checkDatasetJob, pending, chunksize=max(1, len(pending) // (jobs * 4))))
+	else:
+		state = DatasetState() # Reused for every Dataset of the Data Contract
+		validated = [checkDataset(state, dataset, _dfs, locate, _entityName, data_contract, sampleOptions) for dataset, _dfs in pending]
+	for position, mainIssue in zip(changed, validated):
+		results[position] = mainIssue
+		if cache is not None:
+			cache.store(str(datasets[position][0]), fingerprints[position], mainIssue)
+	if cache is not None:
+		cache.save()
+	for mainIssue in results:
+		if mainIssue is not None:
 			Issues.append(mainIssue)
-		_dataset.append(_dataset_)
-	return dfs,_dataset
+	return dfs,[camelCase(strippedText(dataset)) for dataset, _ in datasets]
+
+'''
+	Use : Sample File Issue
+	Desc : Only the first issue of the Sample File is kept, every issue adds the Sample Files block.
+'''
+def __sampleFileIssue(issue, state):
+	if len(state.SampleFileIndex) > 0:
+		pass;
+	else:
+		state.SampleFileIndex.append(issue)
+	log.error(issue['issueValue'],extra=issue)
+	_SampleFileIssue_ = {
+		"Location" : "Sample Files",
+		"issues" : state.SampleFileIndex
+	}
+	if bool(_SampleFileIssue_['issues']):
+		state.allIssues.append(_SampleFileIssue_)
+
+'''
+	Use : Sample File Issues
+	Desc : Every issue is kept in the Sample Files block, the block is added once.
+'''
+def __sampleFileIssues(issues, state):
+	if issues:
+		state.SampleFileIndex.extend(issues)
+		if not any(block.get('issues') is state.SampleFileIndex for block in state.allIssues):
+			state.allIssues.append({
+				"Location" : "Sample Files",
+				"issues" : state.SampleFileIndex
+			})
+
+'''
+	Use : Sample File Profile Issues
+	Desc : Every value of the profile which doesn't fit the Data Contract is an issue of the Sample Files block.
+'''
+def __sampleFileProfile(inspection, datasetName, state):
+	issues = []
+	for profile in inspection.profile:
+		column = profile.column
+		for line, value, reason in profile.examples:
+			issue = {
+					"type":"ERROR",
+					"issueValue":'The Sample File value of ' + column.name + ' doesn\'t match the Data Type ' + column.declared(),
+					"expectedValue":"The values of " + column.name + " should be " + column.declared() + ". " + str(profile.failed) + " of " + str(profile.checked) + " values (" + profile.rate() + ") don't match.",
+					"actualValue":str(value) + " (" + reason + ")",
+					"location":"Sample File " + str(datasetName) + " line " + str(line),
+					"issueDesc":"The Sample File values should match the Attribute DataType and Attribute Size of the Data Contract"
+			}
+			log.error(issue['issueValue'],extra=issue)
+			issues.append(issue)
+	__sampleFileIssues(issues, state)
+
+'''
+	Use : Sample File Key Issues
+	Desc : Every example of a Primary Key or a Unique Attribute with the value of an earlier row is an issue of the
+		   Sample Files block.
+'''
+def __sampleFileKeys(inspection, datasetName, state):
+	issues = []
+	for check in inspection.keys:
+		columns = ', '.join(check.columns)
+		name = ('the Primary Key ' if check.primary else 'the Unique Attribute ') + columns
+		for line, first, value in check.examples:
+			issue = {
+					"type":"ERROR",
+					"issueValue":'The Sample File has duplicate values of ' + name,
+					"expectedValue":"The values of " + columns + " should be unique. " + str(check.duplicates) + " of " + str(check.checked) + " rows repeat " + str(check.keys) + " values.",
+					"actualValue":str(value) + " (first in line " + str(first) + ")",
+					"location":"Sample File " + str(datasetName) + " line " + str(line),
+					"issueDesc":"The Sample File values of " + name + " should be unique"
+			}
+			log.error(issue['issueValue'],extra=issue)
+			issues.append(issue)
+	__sampleFileIssues(issues, state)
+
+'''
+	Use : Sample File Null Issues
+	Desc : Every column of the Sample File with empty or null values which is not nullable in the Data Contract is an
+		   issue of the Sample Files block. A name in the header twice is checked once.
+'''
+def __sampleFileNulls(inspection, schema, datasetName, state):
+	nullable = dict((column.name, column.nullable) for column in schema)
+	issues = []
+	checked = set()
+	for stats in inspection.stats:
+		log.info('Sample File %s column %s has %s empty and %s null values of %s rows', datasetName, stats.name, stats.empty, stats.nulls, stats.rows)
+		if stats.name in checked:
+			continue
+		checked.add(stats.name)
+		if nullable.get(stats.name, True) or not stats.missing():
+			continue
+		issue = {
+				"type":"ERROR",
+				"issueValue":'The Sample File has empty values of ' + stats.name + ' which is not nullable',
+				"expectedValue":"The values of " + stats.name + " should not be empty as the Attribute Nullability is No. " + str(stats.missing()) + " of " + str(stats.rows) + " rows (" + stats.ratio() + ") are empty or null.",
+				"actualValue":str(stats.empty) + " empty and " + str(stats.nulls) + " null values",
+				"location":"Sample File " + str(datasetName) + " line " + str(stats.first),
+				"issueDesc":"The Sample File values of an Attribute which is not nullable should not be empty"
+		}
+		log.error(issue['issueValue'],extra=issue)
+		issues.append(issue)
+	__sampleFileIssues(issues, state)
+
+'''
+	Use : Sample File Scan Issues
+	Desc : Rows with another number of fields than the Data Contract Attributes, quotes out of place and mixed line
+		   endings are issues of the Sample Files block. The statistics of the scan are added in their own block.
+	@Params : inspection - SampleInspection with the scan of --sample-rows
+			  attributes - Number of Attributes of the Dataset
+'''
+def __sampleFileScan(inspection, attributes, datasetName, state):
+	scan = inspection.scan
+	issues = []
+	rows, lines = scan.offending(attributes)
+	for line, fields in lines:
+		issues.append({
+				"type":"ERROR",
+				"issueValue":'The Sample File row doesn\'t have a field for every Data Contract Attribute',
+				"expectedValue":"Every row of the Sample File should have " + str(attributes) + " fields. " + str(rows) + " of " + str(scan.rows) + " rows have another number of fields.",
+				"actualValue":str(fields) + " fields",
+				"location":"Sample File " + str(datasetName) + " line " + str(line),
+				"issueDesc":"A delimiter in a value which is not quoted or a missing value changes the number of fields of the row"
+		})
+	for line in scan.quoteLines:
+		issues.append({
+				"type":"ERROR",
+				"issueValue":'The Sample File has a quote which is not escaped',
+				"expectedValue":"A value with a quote should be quoted and its quotes doubled. " + str(scan.quotes) + " rows have a quote out of place.",
+				"actualValue":"Quote out of place",
+				"location":"Sample File " + str(datasetName) + " line " + str(line),
+				"issueDesc":"A quote inside a value which is not quoted, text after a closing quote or a quote which is never closed"
+		})
+	if scan.mixedEndings():
+		issues.append({
+				"type":"ERROR",
+				"issueValue":'The Sample File has mixed line endings',
+				"expectedValue":"Every line of the Sample File should end the same way",
+				"actualValue":scan.endings(),
+				"location":"Sample File " + str(datasetName),
+				"issueDesc":"The Sample File has mixed line endings"
+		})
+	for issue in issues:
+		log.error(issue['issueValue'],extra=issue)
+	__sampleFileIssues(issues, state)
+	state.allIssues.append({
+		"Location" : "Sample File Statistics",
+		"issues" : [{
+				"type":"INFO",
+				"issueValue":'Sample File Statistics',
+				"expectedValue":str(attributes) + " fields in every row",
+				"actualValue":str(scan.rows) + " rows, " + (scan.describe() or "no rows") + ", " + scan.endings(),
+				"location":"Sample File " + str(datasetName),
+				"issueDesc":"Statistics of the Sample File"
+		}]
+	})
+
+def __sampleFileEncoding(inspection, datasetName, state):
+	enc = inspection.encoding
+	if(str(enc).lower() != 'utf-8' and str(enc).lower() != 'ascii'):
+		issue = {
+				"type":"ERROR",
+				"issueValue":'The Sample File is not in UTF-8 Format' ,
+				"expectedValue":"The Sample File for dataset "+ str(datasetName) +" need to be in UTF-8 format. ",
+				"actualValue":"Format is Sample File is: " + str(enc).upper(),
+				"location":"Sample File " + str(datasetName),
+				"issueDesc":"The Sample File is not in UTF-8 Format"
+		}
+		__sampleFileIssue(issue, state)
 
 '''
 	Parse Sample Files
+	Desc : The Sample File is inspected once, the issues are built from the inspection.
 	@Params : datasetName - Dataset Name
 			  attributes - Attribute List to Match with Header of Sample Files
+			  state - Dataset State - Issue Blocks of the Dataset
+			  entity - Entity Name of the Data Contract
+			  data_contract - Data Contract Directory
+			  sampleOptions - Sample File Options, the whole Sample File is only read with --sample-rows, --sample-utf8, --sample-profile, --sample-keys and --sample-nulls
+			  schema - SampleColumn of every Attribute of the Dataset, for --sample-profile, --sample-keys and --sample-nulls
 	return : Append to Issue Block
 '''
-def parseSampleFile(datasetName,attributes):
-	datasetName = _entityName+'_'+datasetName
-	global _SampleFileIssue_
-	if os.path.isdir(data_contract+'/sampleFiles') == False:
+def parseSampleFile(datasetName,attributes,state,entity,data_contract,sampleOptions=SAMPLE_DEFAULTS,schema=None):
+	datasetName = entity+'_'+datasetName
+	files = sampleIndex(data_contract+'sampleFiles') # Scanned once for all the Datasets of the Data Contract
+	if files is None:
 		return
-	for files in os.listdir(data_contract+'/sampleFiles'):
-		file = tuple(item for item in files.split('.'))
-		FILES.append(file)
-	files = dict(FILES)
-	# print(datasetName, files)
 	if datasetName in files:
+		extension = files[datasetName].extension
+		if extension not in ('csv', 'txt', 'kml'):
+			return
+		file = files[datasetName].path
+		inspection = inspectSample(file, state.DELIMITER_VALUE[0] if state.DELIMITER_VALUE else None, extension in DELIMITED_EXTENSIONS, sampleOptions, schema)
 		try:
-			if files[datasetName] == 'csv':
-				enc = predict_encoding(data_contract+ "sampleFiles/"+datasetName+'.csv',5)
-			elif files[datasetName] == 'txt':
-				enc = predict_encoding(data_contract+ "sampleFiles/"+datasetName+'.txt',5)	
-			elif files[datasetName] == 'kml':
-				enc = predict_encoding(data_contract+ "sampleFiles/"+datasetName+'.kml',5)
-			if(str(enc).lower() != 'utf-8' and str(enc).lower() != 'ascii'):
-				issue = {
-						"type":"ERROR",
-						"issueValue":'The Sample File is not in UTF-8 Format' ,
-						"expectedValue":"The Sample File for dataset "+ str(datasetName) +" need to be in UTF-8 format. ",
-						"actualValue":"Format is Sample File is: " + str(enc).upper(),
-						"location":"Sample File " + str(datasetName),
-						"issueDesc":"The Sample File is not in UTF-8 Format"
-				}
-				if len(SampleFileIndex) > 0:
-					pass;
-				else:
-					SampleFileIndex.append(issue)
-				log.error(issue['issueValue'],extra=issue)
-				_SampleFileIssue_ = {}
-				
-				_SampleFileIssue_ = {
-					"Location" : "Sample Files",
-					"issues" : SampleFileIndex
-				}
-				if bool(_SampleFileIssue_['issues']):
-					allIssues.append(_SampleFileIssue_)
-			else:
-				pass
-			if files[datasetName] == 'csv':
-				file = data_contract+ "sampleFiles/"+datasetName+'.csv'
-				with open(file, 'r',  encoding="utf8") as f1:
-					dialect = csv.Sniffer().sniff(f1.read()) 
-					delimiter= str(dialect.delimiter)
-				_reader = pd.read_csv(data_contract+ "sampleFiles/"+datasetName+'.csv', sep=delimiter, header=[0,0], dtype='unicode')
-				sampleCount = len(_reader.index)
-				if DELIMITER_VALUE[0].strip().lower() == 'tab':
-					DELIMITER_VALUE[0] = '\t'
-				if delimiter != DELIMITER_VALUE[0]:
+			__sampleFileEncoding(inspection, datasetName, state)
+			if extension in DELIMITED_EXTENSIONS:
+				if inspection.error is not None:
+					raise inspection.error
+				delimiter = inspection.delimiter
+				log.info('Sample File %s delimiter %r, confidence %.2f', datasetName, delimiter, inspection.confidence)
+				if sampleOptions.rows:
+					log.info('Sample File %s has %s rows, %s with another number of fields than the header', datasetName, inspection.rows, inspection.ragged)
+				state.DELIMITER_VALUE[0] = delimiterOf(state.DELIMITER_VALUE[0])
+				if delimiter != state.DELIMITER_VALUE[0]:
 					issue = {
 							"type":"ERROR",
-							"issueValue":'The Sample File Delimiter is '+str(delimiter) +" and Data Contract delimeter is "+ DELIMITER_VALUE[0],
+							"issueValue":'The Sample File Delimiter is '+str(delimiter) +" and Data Contract delimeter is "+ state.DELIMITER_VALUE[0],
 							"expectedValue":"The Sample File delimiter should Match with the Data Contract.",
-							"actualValue":str(DELIMITER_VALUE[0]),
+							"actualValue":str(state.DELIMITER_VALUE[0]),
 							"location":"Sample File " + str(datasetName),
 							"issueDesc":"The Sample File delimiter should Match with the Data Contract."
 					}
-					if len(SampleFileIndex) > 0:
-						pass;
-					else:
-						SampleFileIndex.append(issue)
-					log.error(issue['issueValue'],extra=issue)
-					_SampleFileIssue_ = {}
-					
-					_SampleFileIssue_ = {
-						"Location" : "Sample Files",
-						"issues" : SampleFileIndex
-					}
-					if bool(_SampleFileIssue_['issues']):
-						allIssues.append(_SampleFileIssue_)
-				HEADER = _reader.columns.get_level_values(0).tolist()
+					__sampleFileIssue(issue, state)
 				attributes = [attr.strip().upper() for attr in attributes]
-				HEADER = [head.strip().upper() for head in HEADER]
+				HEADER = [head.strip().upper() for head in inspection.header]
 				sampleFileColumns = ','.join(HEADER)
 				dataContractColumn = ','.join(attributes)
 				if sampleFileColumns != dataContractColumn:
@@ -1556,109 +1635,18 @@ def parseSampleFile(datasetName,attributes):
 							"location":"Sample File " + str(datasetName),
 							"issueDesc":"The Sample File Sequence Doesn\'t Match with the Data Contract Attribute"
 					}
-					if len(SampleFileIndex) > 0:
-						pass;
-					else:
-						SampleFileIndex.append(issue)
-					log.error(issue['issueValue'],extra=issue)
-					_SampleFileIssue_ = {}
-					
-					_SampleFileIssue_ = {
-						"Location" : "Sample Files",
-						"issues" : SampleFileIndex
-					}
-					if bool(_SampleFileIssue_['issues']):
-						allIssues.append(_SampleFileIssue_)
-			elif files[datasetName] == 'txt':
-				try:
-					file = data_contract+ "sampleFiles/"+datasetName+'.txt'
-					with open(file, 'r',  encoding="utf8") as f1:
-						dialect = csv.Sniffer().sniff(f1.read()) 
-						delimiter= str(dialect.delimiter)
-					reader = pd.read_csv(data_contract+ "sampleFiles/"+datasetName+'.txt', sep=delimiter, header=[0,0])
-					sampleCount = len(reader.index)
-					if DELIMITER_VALUE[0].strip().lower() == 'tab':
-						DELIMITER_VALUE[0] = '\t'
-					if delimiter != DELIMITER_VALUE[0]:
-						issue = {
-								"type":"ERROR",
-								"issueValue":'The Sample File Delimiter is '+str(delimiter) +" and Data Contract delimeter is "+ DELIMITER_VALUE[0],
-								"expectedValue":"The Sample File delimiter should Match with the Data Contract.",
-								"actualValue":str(DELIMITER_VALUE[0]),
-								"location":"Sample File " + str(datasetName),
-								"issueDesc":"The Sample File delimiter should Match with the Data Contract."
-						}
-						if len(SampleFileIndex) > 0:
-							pass;
-						else:
-							SampleFileIndex.append(issue)
-						log.error(issue['issueValue'],extra=issue)
-						_SampleFileIssue_ = {}
-						
-						_SampleFileIssue_ = {
-							"Location" : "Sample Files",
-							"issues" : SampleFileIndex
-						}
-						if bool(_SampleFileIssue_['issues']):
-							allIssues.append(_SampleFileIssue_)
-					HEADER = reader.columns.get_level_values(0).tolist()
-					attributes = [attr.strip().upper() for attr in attributes]
-					HEADER = [head.strip().upper() for head in HEADER]
-					sampleFileColumns = ','.join(HEADER)
-					dataContractColumn = ','.join(attributes)
-					if sampleFileColumns != dataContractColumn:
-						issue = {
-							"type":"ERROR",
-							"issueValue":'The Sample File Sequence Doesn\'t Match with the Data Contract Attribute' ,
-							"expectedValue":"The Sample File Sequence should Match with the Data Contract Attribute. The sequence Should be " + dataContractColumn,
-							"actualValue":sampleFileColumns,
-							"location":"Sample File " + str(datasetName),
-							"issueDesc":"The Sample File Sequence Doesn\'t Match with the Data Contract Attribute"
-					}
-						if len(SampleFileIndex) > 0:
-							pass;
-						else:
-							SampleFileIndex.append(issue)
-						log.error(issue['issueValue'],extra=issue)
-						_SampleFileIssue_ = {}
-						
-						_SampleFileIssue_ = {
-							"Location" : "Sample Files",
-							"issues" : SampleFileIndex
-						}
-						if bool(_SampleFileIssue_['issues']):
-							allIssues.append(_SampleFileIssue_)
-				except:
-					log.error("Exception occurred while finding delimeter of txt file", exc_info=True)
-					raise
-			else:
-				pass
+					__sampleFileIssue(issue, state)
+				if inspection.profile:
+					__sampleFileProfile(inspection, datasetName, state)
+				if inspection.keys:
+					__sampleFileKeys(inspection, datasetName, state)
+				if inspection.stats and schema:
+					__sampleFileNulls(inspection, schema, datasetName, state)
+				if inspection.scan is not None:
+					__sampleFileScan(inspection, len(attributes), datasetName, state)
 		except Exception as e:
-			enc = predict_encoding(data_contract+ "sampleFiles/"+datasetName+'.csv',5)
-			if(str(enc).lower() != 'utf-8' and str(enc).lower() != 'ascii'):
-				issue = {
-						"type":"ERROR",
-						"issueValue":'The Sample File is not in UTF-8 Format' ,
-						"expectedValue":"The Sample File for dataset "+ str(datasetName) +" need to be in UTF-8 format. ",
-						"actualValue":"Format is Sample File is: " + str(enc).upper(),
-						"location":"Sample File " + str(datasetName),
-						"issueDesc":"The Sample File is not in UTF-8 Format"
-				}
-				if len(SampleFileIndex) > 0:
-					pass;
-				else:
-					SampleFileIndex.append(issue)
-				log.error(issue['issueValue'],extra=issue)
-				_SampleFileIssue_ = {}
-				
-				_SampleFileIssue_ = {
-					"Location" : "Sample Files",
-					"issues" : SampleFileIndex
-				}
-				if bool(_SampleFileIssue_['issues']):
-					allIssues.append(_SampleFileIssue_)
-			else:
-				pass
+			log.error("Exception occurred while reading the Sample File %s", file, exc_info=True)
+			__sampleFileEncoding(inspection, datasetName, state)
 	else:
 		issue = {
 				"type":"ERROR",
@@ -1668,51 +1656,28 @@ def parseSampleFile(datasetName,attributes):
 				"location":"Sample File " + str(datasetName),
 				"issueDesc":"The Sample File Sequence Doesn\'t Match with the Data Contract Attribute"
 		}
-		if len(SampleFileIndex) > 0:
-			pass;
-		else:
-			SampleFileIndex.append(issue)
-		log.error(issue['issueValue'],extra=issue)
-		_SampleFileIssue_ = {}
-		
-		_SampleFileIssue_ = {
-			"Location" : "Sample Files",
-			"issues" : SampleFileIndex
-		}
-		if bool(_SampleFileIssue_['issues']):
-			allIssues.append(_SampleFileIssue_)
-
-'''
-	Use : Find Encoding of File
-	Desc : Function will predict the encoding of the file by using top 10 lines
-	@Params : file_path - Type:String - Path of the File
-			  n_lines - Type:Number - No of Lines
-	returns : encoding
-'''
-def predict_encoding(file_path, n_lines=10):
-	# Open the file as binary data
-	with open(file_path, 'rb') as f:
-		# Join binary lines for specified number of lines
-		rawdata = b''.join([f.readline() for _ in range(n_lines)])
-	return chardet.detect(rawdata)['encoding']
+		__sampleFileIssue(issue, state)
 
 '''
 	Use : Check Exit Status
-	Desc : Exit the execution if the issue occured in Script
-	@Params : None
+	Desc : Exit the execution if the issue occured in any Data Contract of the batch
+	@Params : results - Results of checkContract for every Data Contract
 	returns : None
 '''
-def exitSys():
-	_Issues = json.loads(Issues)
-	with open(CODES_DIR+'/issues/checkIssue.txt', 'rb') as f:
-		data = f.readline()
-	if data:
-		log.error("All issues in the Data Contract", exc_info=True)
+def exitSys(results):
+	failed = [result['file'] for result in results if result['failed']]
+	if failed:
+		log.error("All issues in the Data Contract: %s", ', '.join(failed))
 		end = time.time()
 		print(end - start)
 		sys.exit(1)
 
 
+#Path of the HTML Report of the Data Contract
+def reportPath(file):
+	REPORT_DIR = CODES_DIR +'/reports/'
+	return os.path.join(REPORT_DIR, f"{file.split('.')[0]}_report.html")
+
 '''
 	Use : Write Report to HTML
 	Desc : Generate a HTML Report from the report.json file generated by generateReport Function
@@ -1733,9 +1698,7 @@ def generateReport(file):
 	output =  j2_env.get_template('template/report.html').render(
 		issues=final_list,_otherIssues=otherIssues
 	)
-	REPORT_DIR = CODES_DIR +'/reports/'
-	report_path = os.path.join(REPORT_DIR, f"{file.split('.')[0]}_report.html")
-	with open(report_path, 'w', encoding="utf-8") as f:  
+	with open(reportPath(file), 'w', encoding="utf-8") as f:  
 		f.write("%s\n" % output)
 
 
@@ -1746,19 +1709,30 @@ def generateReport(file):
 def main():
 	try: 
 		log.info('Check Data Contract Module: Started')
-		file, data_contract_path, psql_db, psql_user, psql_password, psql_host, psql_port = readInputArgs()
+		file, data_contract_path, psql_db, psql_user, psql_password, psql_host, psql_port, jobs, contract_jobs, offline, ttl, sampleOptions = readInputArgs()
 		log.info('Data Contract Path: %s .Data Contract File %s', data_contract_path,file)
 		files = file.split(',')
-		global _entityName
-		global data_contract
-		
-		for file in files:
-			_entityName = entityName(file, psql_db, psql_user, psql_password, psql_host, psql_port)
-			path = data_contract_path + _entityName + '/'
-			data_contract = path
-			log.info('Data Contract Path inside loop: %s .Entity Name %s', data_contract,_entityName)
-			execute(file,path)
-		exitSys()
+		credentials = (psql_db, psql_user, psql_password, psql_host, psql_port)
+		#Every Entity of the batch is resolved with one query, the workers of --contract-jobs inherit the lookups
+		#The Resolver keeps the snapshot options of this first call
+		try:
+			entityResolver(*credentials, offline=offline, ttl=ttl).resolve([entityOf(file) for file in files if '_' in file])
+		except Exception as e:
+			#Every Data Contract reports the Database error in its own Entity check
+			log.error("Error in resolving the Entities of the batch", exc_info=True)
+		if contract_jobs < 1:
+			contract_jobs = os.cpu_count() or 1
+		contract_jobs = min(contract_jobs, len(files))
+		if contract_jobs > 1:
+			#Every Data Contract writes its own issues, the Datasets of a Data Contract are checked on the worker itself
+			log.info('Checking %s Data Contracts on %s processes', len(files), contract_jobs)
+			with ProcessPoolExecutor(max_workers=contract_jobs, initializer=initContractWorker, initargs=(credentials, offline, ttl)) as executor:
+				results = list(executor.map(checkContract, [(file, data_contract_path, credentials, offline, ttl, 1, True, sampleOptions) for file in files]))
+		else:
+			results = [checkContract((file, data_contract_path, credentials, offline, ttl, jobs, False, sampleOptions)) for file in files]
+		#The refresh of the Entity snapshot is finished before the run exits
+		closeResolvers()
+		exitSys(results)
 	except Exception as e: 
 		log.error("Check Data Contract Module: Error occurred")
 		raise
@@ -0,0 +1,212 @@
+'''
+	Parsed Contract Cache
+	Desc : The Data Frame read from a Data Contract is kept in PARSED_DATA_CONTRACT_DEFAULT_PATH as an Arrow IPC file,
+		   named after the content of the workbook and the version of the template. A run on a workbook which did
+		   not change loads the frame from the cache instead of parsing the xlsx again. Files are written to a
+		   temporary name and renamed, so runs at the same time never read a partial file. The cache is trimmed by
+		   age and size after every write. Without pyarrow the workbook is always parsed.
+'''
+from datetime import date, datetime, time as dayTime
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from configuration import log, PARSED_DATA_CONTRACT_DEFAULT_PATH
+from contract_reader import readContract, SHEET_COLUMNS, MERGED_CELLS
+
+#Arrow IPC, optional
+try:
+	import pyarrow as pa
+	import pyarrow.feather as feather
+except ImportError:
+	pa = None
+
+#Changed when the reader or the cache format changes, older files are not used anymore
+CACHE_FORMAT = '1'
+CACHE_SUFFIX = '.arrow'
+CACHE_MAX_BYTES = 512 * 1024 * 1024
+CACHE_MAX_AGE = 30 * 24 * 60 * 60
+CACHE_STALE_TEMPORARY = 60 * 60
+#Schema metadata key with the attrs of the frame and the columns stored as typed text
+CACHE_METADATA = b'contract'
+HASH_CHUNK = 1 << 20
+
+#Columns holding values of different types (numbers and text in Attribute Size) are stored as text with the type
+#of every value, the values are rebuilt with these functions
+DECODERS = {
+	'str': str,
+	'int': int,
+	'float': float,
+	'bool': lambda value: value == 'True',
+	'datetime': datetime.fromisoformat,
+	'date': date.fromisoformat,
+	'time': dayTime.fromisoformat,
+}
+
+
+'''
+	Use : Workbook Hash
+	@Params : path - Data Contract Path
+	returns : sha256 of the content of the workbook
+'''
+def workbookHash(path):
+	digest = hashlib.sha256()
+	with open(path, 'rb') as workbook:
+		for chunk in iter(lambda: workbook.read(HASH_CHUNK), b''):
+			digest.update(chunk)
+	return digest.hexdigest()
+
+def cacheKey(path, template):
+	return '%s-%s-%s' % (workbookHash(path), template.version[:16], CACHE_FORMAT)
+
+def _isNull(value):
+	return value is None or (isinstance(value, float) and np.isnan(value))
+
+def _typeOf(value):
+	return type(value).__name__
+
+
+'''
+	Use : Encode Frame
+	Desc : Arrow keeps one type per column, a column with values of more than one type is stored as the text of
+		   every value and a column with the type of every value.
+	@Params : dfs - Data Frame of the Data Contract
+	returns : Arrow Table or None if the frame can't be stored
+'''
+def encodeFrame(dfs):
+	if not all(isinstance(column, str) for column in dfs.columns):
+		return None
+	columns = {}
+	typed = []
+	for column in dfs.columns:
+		values = dfs[column]
+		if values.dtype == object:
+			kinds = set(_typeOf(value) for value in values if not _isNull(value))
+			if kinds - {'str'}:
+				if kinds - set(DECODERS):
+					return None
+				typed.append(column)
+				columns[column] = pd.Series([None if _isNull(value) else (value.isoformat() if isinstance(value, (date, dayTime)) else str(value)) for value in values], index=dfs.index, dtype=object)
+				columns[column + '\x00type'] = pd.Series([None if _isNull(value) else _typeOf(value) for value in values], index=dfs.index, dtype=object)
+				continue
+		columns[column] = values
+	metadata = {
+		'typed': typed,
+		'columns': list(dfs.columns),
+		'attrs': {
+			SHEET_COLUMNS: dfs.attrs.get(SHEET_COLUMNS),
+			MERGED_CELLS: dict((column, [[int(top), int(bottom)] for top, bottom in ranges]) for column, ranges in dfs.attrs[MERGED_CELLS].items()) if MERGED_CELLS in dfs.attrs else None,
+		}
+	}
+	table = pa.Table.from_pandas(pd.DataFrame(columns, index=dfs.index), preserve_index=True)
+	schema = dict(table.schema.metadata or {})
+	schema[CACHE_METADATA] = json.dumps(metadata).encode('utf-8')
+	return table.replace_schema_metadata(schema)
+
+'''
+	Use : Decode Frame
+	@Params : table - Arrow Table written by encodeFrame
+	returns : dfs - Data Frame as it was read from the Data Contract
+'''
+def decodeFrame(table):
+	metadata = json.loads(table.schema.metadata[CACHE_METADATA])
+	dfs = table.to_pandas()
+	for column in metadata['typed']:
+		kinds = dfs.pop(column + '\x00type')
+		dfs[column] = pd.Series([np.nan if kind is None else DECODERS[kind](value) for value, kind in zip(dfs[column], kinds)], index=dfs.index, dtype=object)
+	dfs = dfs[metadata['columns']]
+	#Arrow returns the empty cells of text columns as None, the reader leaves them as NaN
+	for column in dfs.columns:
+		if dfs[column].dtype == object:
+			dfs[column] = pd.Series([np.nan if value is None else value for value in dfs[column]], index=dfs.index, dtype=object)
+	attrs = metadata['attrs']
+	if attrs[SHEET_COLUMNS] is not None:
+		dfs.attrs[SHEET_COLUMNS] = attrs[SHEET_COLUMNS]
+	if attrs[MERGED_CELLS] is not None:
+		dfs.attrs[MERGED_CELLS] = dict((column, [tuple(merged) for merged in ranges]) for column, ranges in attrs[MERGED_CELLS].items())
+	return dfs
+
+
+'''
+	Use : Evict
+	Desc : Remove the files older than maxAge, then the least recently used files until the cache fits in maxBytes.
+		   A file removed or in use by another run is skipped.
+	@Params : directory - Cache Directory
+			  maxBytes - Size of the cache
+			  maxAge - Seconds a file is kept after its last use
+'''
+def evict(directory=PARSED_DATA_CONTRACT_DEFAULT_PATH, maxBytes=CACHE_MAX_BYTES, maxAge=CACHE_MAX_AGE):
+	entries = []
+	now = time.time()
+	for entry in os.scandir(directory):
+		#Temporary file left by a run which stopped while writing
+		if entry.name.endswith('.tmp'):
+			try:
+				if now - entry.stat().st_mtime > CACHE_STALE_TEMPORARY:
+					os.remove(entry.path)
+			except OSError:
+				pass
+			continue
+		if not entry.name.endswith(CACHE_SUFFIX):
+			continue
+		try:
+			stat = entry.stat()
+		except OSError:
+			continue
+		entries.append((stat.st_mtime, stat.st_size, entry.path))
+	entries.sort()
+	total = sum(size for _, size, _ in entries)
+	for modified, size, path in entries:
+		if now - modified <= maxAge and total <= maxBytes:
+			break
+		try:
+			os.remove(path)
+			total -= size
+		except OSError:
+			pass
+
+
+'''
+	Use : Load Data Contract
+	Desc : Data Frame of the Data Contract from the cache, read with readContract and stored when it is not cached.
+	@Params : path - Data Contract Path
+			  template - Compiled Template
+			  directory - Cache Directory
+	returns : dfs - Data Frame
+'''
+def loadContract(path, template, directory=PARSED_DATA_CONTRACT_DEFAULT_PATH):
+	if pa is None:
+		return readContract(path, template.header)
+	key = cacheKey(path, template)
+	cached = os.path.join(directory, key + CACHE_SUFFIX)
+	try:
+		table = feather.read_table(cached, memory_map=True)
+		os.utime(cached) #Last use, for the eviction
+		log.info('Data Contract loaded from the cache: %s', cached)
+		return decodeFrame(table)
+	except (OSError, pa.ArrowException, KeyError, ValueError):
+		pass
+	dfs = readContract(path, template.header)
+	try:
+		table = encodeFrame(dfs)
+		if table is None:
+			log.info('The Data Contract can not be cached: %s', path)
+			return dfs
+		os.makedirs(directory, exist_ok=True)
+		handle, temporary = tempfile.mkstemp(dir=directory, prefix=key, suffix='.tmp')
+		os.close(handle)
+		try:
+			feather.write_feather(table, temporary, compression='uncompressed')
+			os.replace(temporary, cached)
+		finally:
+			if os.path.exists(temporary):
+				os.remove(temporary)
+		evict(directory)
+	except (OSError, pa.ArrowException, TypeError, ValueError):
+		log.error('Error in caching the Data Contract', exc_info=True)
+	return dfs
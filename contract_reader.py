@@ -0,0 +1,281 @@
+'''
+	Contract Reader
+	Desc : Reader of the "Metadata Template" sheet. The workbook is opened read only and the rows are read one at a
+		   time, keeping only the columns of the template header. The projected rows are collected and go through
+		   the same pandas parser as pd.read_excel in one piece, the dtypes are inferred over whole columns, so the
+		   Data Frame has the same columns and dtypes as before. Only the projected values are held, not the
+		   workbook. python-calamine is used when it is installed, openpyxl otherwise.
+		   The merged ranges of the sheet are read from the workbook, only the merged cells are filled with the value
+		   of their range, the other empty cells stay empty.
+'''
+from datetime import date, datetime
+import posixpath
+import re
+import zipfile
+from xml.etree import ElementTree
+
+from openpyxl import load_workbook
+from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+from openpyxl.utils.cell import range_boundaries
+from pandas.io.parsers import TextParser
+import numpy as np
+
+from configuration import log
+from cell_locator import HEADER_ROW, SHEET_COLUMNS
+
+#Faster Excel backend, optional
+try:
+	from python_calamine import CalamineWorkbook
+except ImportError:
+	CalamineWorkbook = None
+
+CONTRACT_SHEET = "Metadata Template"
+#dfs.attrs key with the merged ranges of every column, {column : [(first row, last row)]} in index labels
+MERGED_CELLS = 'mergedCells'
+
+MERGE_CELL_PATTERN = re.compile(rb'<(?:\w+:)?mergeCell\b[^>]*?\bref="([A-Z]+[0-9]+(?::[A-Z]+[0-9]+)?)"')
+WORKBOOK_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+RELATIONSHIP_ID = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id'
+RELATIONSHIPS_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+#Bytes of the sheet read at a time while looking for the merged ranges
+SCAN_CHUNK = 1 << 20
+
+
+#Cell value as pd.read_excel converts it with openpyxl
+def _openpyxlValue(cell):
+	if cell.value is None:
+		return ""
+	elif cell.data_type == TYPE_ERROR:
+		return np.nan
+	elif cell.data_type == TYPE_NUMERIC:
+		value = int(cell.value)
+		if value == cell.value:
+			return value
+		return float(cell.value)
+	return cell.value
+
+#Cell value as pd.read_excel converts it with calamine
+def _calamineValue(value):
+	if isinstance(value, float):
+		_value = int(value)
+		if _value == value:
+			return _value
+	elif isinstance(value, date) and not isinstance(value, datetime):
+		return datetime(value.year, value.month, value.day)
+	return value
+
+def _openpyxlRows(path, sheet):
+	workbook = load_workbook(path, read_only=True, data_only=True, keep_links=False)
+	try:
+		worksheet = workbook[sheet]
+		worksheet.reset_dimensions()
+		for row in worksheet.rows:
+			yield row
+	finally:
+		workbook.close()
+
+def _calamineRows(path, sheet):
+	for row in CalamineWorkbook.from_path(path).get_sheet_by_name(sheet).iter_rows():
+		yield row
+
+
+'''
+	Use : Excel Backend
+	returns : Rows generator and value converter of the backend
+'''
+def excelBackend():
+	if CalamineWorkbook is not None:
+		return _calamineRows, _calamineValue
+	return _openpyxlRows, _openpyxlValue
+
+
+'''
+	Use : Data Contract Rows
+	Desc : Yield the rows after the header projected on the given positions. Empty rows are held back until a row
+		   with a value follows, so the empty rows at the end of the sheet are dropped like pd.read_excel does.
+	@Params : rows - Rows generator of the backend, positioned after the header
+			  convert - Value converter of the backend
+			  positions - Positions of the columns to keep
+'''
+def projectRows(rows, convert, positions):
+	empty = []
+	for row in rows:
+		width = len(row)
+		values = [convert(row[position]) if position < width else "" for position in positions]
+		if all(value == "" for value in values):
+			empty.append(values)
+			continue
+		for _values in empty:
+			yield _values
+		empty = []
+		yield values
+
+
+'''
+	Use : Fill the Rows
+	Desc : Same shape as pd.read_excel for a sheet that is read whole: empty cells and rows at the end are trimmed
+		   and the rows are padded to the widest row.
+'''
+def _wholeSheet(rows, convert):
+	data = []
+	last = -1
+	for number, row in enumerate(rows):
+		values = [convert(cell) for cell in row]
+		while values and values[-1] == "":
+			values.pop()
+		if values:
+			last = number
+		data.append(values)
+	data = data[:last + 1]
+	if data:
+		width = max(len(values) for values in data)
+		data = [values + [""] * (width - len(values)) for values in data]
+	return data
+
+
+'''
+	Use : Sheet Part
+	Desc : Path of the sheet inside the xlsx archive, from the workbook and its relationships.
+'''
+def _sheetPart(archive, sheet):
+	workbook = ElementTree.fromstring(archive.read('xl/workbook.xml'))
+	relation = None
+	for element in workbook.iter(WORKBOOK_NS + 'sheet'):
+		if element.get('name') == sheet:
+			relation = element.get(RELATIONSHIP_ID)
+	relations = ElementTree.fromstring(archive.read('xl/_rels/workbook.xml.rels'))
+	for element in relations.iter(RELATIONSHIPS_NS + 'Relationship'):
+		if element.get('Id') == relation:
+			target = element.get('Target')
+			if target.startswith('/'):
+				return target.lstrip('/')
+			return posixpath.normpath(posixpath.join('xl', target))
+	raise KeyError(sheet)
+
+
+'''
+	Use : Merged Ranges
+	Desc : The merged ranges are written after the cells of the sheet, the sheet is scanned in chunks for them
+		   without parsing the cells again.
+	@Params : path - Data Contract Path
+			  sheet - Sheet Name
+	returns : List of (first column, first row, last column, last row), 1 based as in Excel, or None if the
+			  workbook is not an xlsx archive
+'''
+def mergedRanges(path, sheet=CONTRACT_SHEET):
+	try:
+		with zipfile.ZipFile(path) as archive:
+			ranges = []
+			tail = b''
+			with archive.open(_sheetPart(archive, sheet)) as part:
+				while True:
+					chunk = part.read(SCAN_CHUNK)
+					if not chunk:
+						break
+					buffer = tail + chunk
+					#A tag cut at the end of the chunk is kept for the next one
+					end = buffer.rfind(b'<')
+					if end == -1 or buffer.find(b'>', end) != -1:
+						end = len(buffer)
+					for ref in MERGE_CELL_PATTERN.findall(buffer, 0, end):
+						ranges.append(range_boundaries(ref.decode('ascii')))
+					tail = buffer[end:]
+			return ranges
+	except (zipfile.BadZipFile, KeyError, ElementTree.ParseError, ValueError):
+		log.info('Merged ranges are not available for %s, merged cells are forward filled', path)
+		return None
+
+
+'''
+	Use : Expand Merged Cells
+	Desc : Fill every cell of a merged range with the value of the first row of the range, column by column, as
+		   Excel shows it. Ranges starting on the header or above are left out.
+	@Params : dfs - Data Frame as read from the sheet
+			  ranges - Merged Ranges of the sheet
+			  positions - Position of every column in the sheet
+			  first - Excel row of the first row of the Data Frame
+	returns : Merged ranges of every column, in index labels
+'''
+def expandMerged(dfs, ranges, positions, first):
+	columns = dict((position, column) for column, position in positions.items())
+	sources = {}
+	merged = {}
+	for firstColumn, firstRow, lastColumn, lastRow in ranges:
+		top = firstRow - first
+		bottom = min(lastRow - first, len(dfs) - 1)
+		if top < 0 or top >= bottom:
+			continue
+		for position in range(firstColumn - 1, lastColumn):
+			column = columns.get(position)
+			if column is None:
+				continue
+			source = sources.setdefault(column, np.arange(len(dfs)))
+			source[top + 1:bottom + 1] = top
+			merged.setdefault(column, []).append((dfs.index[top], dfs.index[bottom]))
+	for column, source in sources.items():
+		dfs[column] = dfs[column].take(source).set_axis(dfs.index)
+	return merged
+
+
+'''
+	Use : Fill Data Contract
+	Desc : Drop the empty rows and fill the Dataset Name down to the rows of its Dataset. Merged cells are expanded by
+		   readContract, a Data Contract without merged range details is forward filled as a whole.
+	@Params : dfs - Data Frame of the Data Contract
+	returns : dfs - Data Frame
+'''
+def fillContract(dfs):
+	dfs = dfs.dropna(how='all')
+	dfs['Dataset Name'] = dfs['Dataset Name'].ffill()
+	if MERGED_CELLS not in dfs.attrs:
+		dfs = dfs.ffill()
+	return dfs
+
+
+'''
+	Use : Read Data Contract
+	Desc : Read the sheet with the header on row header + 1. When every template column is in the header only those
+		   columns are read, otherwise the whole sheet is read so the Header Check can report the columns.
+		   With the merged ranges of the sheet, the empty rows are dropped and the merged cells are filled, the
+		   ranges are kept in dfs.attrs for the merged column checks.
+	@Params : path - Data Contract Path
+			  columns - Template header
+			  sheet - Sheet Name
+			  header - Header row, as for pd.read_excel
+	returns : dfs - Data Frame
+'''
+def readContract(path, columns, sheet=CONTRACT_SHEET, header=HEADER_ROW):
+	rowsOf, convert = excelBackend()
+	rows = rowsOf(path, sheet)
+	try:
+		top = []
+		for row in rows:
+			top.append(row)
+			if len(top) > header:
+				break
+		names = [convert(cell) for cell in top[header]] if len(top) > header else []
+		positions = {}
+		for position, name in enumerate(names):
+			positions.setdefault(name, position)
+		if columns and all(column in positions for column in columns):
+			projection = [positions[column] for column in columns]
+			#TextParser infers the dtypes per chunk, the rows are parsed at once to keep the dtypes of pd.read_excel
+			data = list(projectRows(rows, convert, projection))
+			dfs = TextParser(data, names=list(columns), header=None, skip_blank_lines=False).read()
+			dfs.attrs[SHEET_COLUMNS] = dict(zip(columns, projection))
+		else:
+			log.info('The Data Contract header does not match the template, every column is read')
+			data = _wholeSheet(top + list(rows), convert)
+			dfs = TextParser(data, header=header, skip_blank_lines=False).read()
+		#The rows are not kept while the merged cells are expanded
+		del data
+	finally:
+		rows.close()
+	ranges = mergedRanges(path, sheet)
+	if ranges is not None:
+		#Rows left empty in the sheet are found before the merged cells are filled
+		empty = dfs.isna().all(axis=1)
+		positions = dfs.attrs.get(SHEET_COLUMNS) or dict((column, position) for position, column in enumerate(dfs.columns))
+		dfs.attrs[MERGED_CELLS] = expandMerged(dfs, ranges, positions, header + 2)
+		dfs = dfs[~empty]
+	return dfs
@@ -0,0 +1,123 @@
+'''
+	Dataset Cache
+	Desc : Issues of every Dataset of a Data Contract are kept with a fingerprint of the rows of the Dataset, their
+		   location in the sheet and the Sample Files of the Dataset. The cache of a Data Contract is shared by all
+		   its sprints (ENTITY_CONTRACT_SPRINT4.xlsx, ENTITY_CONTRACT_SPRINT5.xlsx), so a revised Data Contract only
+		   validates the Datasets which changed and takes the issues of the other Datasets from the previous run.
+'''
+import hashlib
+import json
+import os
+import tempfile
+
+from configuration import log, CODES_DIR
+from template_index import SPRINT_PATTERN
+from sample_index import sampleIndex
+
+DATASET_CACHE_DEFAULT_PATH = os.path.join(CODES_DIR, 'cache', 'datasets')
+
+
+'''
+	Use : Data Contract Key
+	Desc : File Name without the sprint, ENTITY_CONTRACT_SPRINT5.xlsx is ENTITY_CONTRACT.
+	@Params : file - Data Contract File Name
+	returns : Key of the Data Contract
+'''
+def contractKey(file):
+	parts = os.path.basename(file).split('.')[0].split('_')
+	match = SPRINT_PATTERN.fullmatch(parts[-1])
+	if len(parts) > 1 and match and match.group(1).lower() == 'sprint':
+		parts = parts[:-1]
+	return '_'.join(parts).upper()
+
+
+'''
+	Use : Sample Files of a Dataset
+	@Params : directory - sampleFiles directory of the Data Contract
+			  name - Sample File Name of the Dataset without the extension
+	returns : SampleEntry of the Sample File of the Dataset in a list, empty without a Sample File
+'''
+def sampleFilesOf(directory, name):
+	files = sampleIndex(directory)
+	if files is None or name not in files:
+		return []
+	return [files[name]]
+
+
+'''
+	Use : Dataset Cache of a Data Contract
+	@Params : key - Data Contract Key
+			  version - Version of the template and of the checker, a cache of another version is not used
+			  directory - Cache Directory
+'''
+class DatasetCache(object):
+
+	def __init__(self, key, version, directory=DATASET_CACHE_DEFAULT_PATH):
+		self.path = os.path.join(directory, key + '.json')
+		self.version = version
+		self.previous = {}
+		self.current = {}
+		try:
+			with open(self.path, 'r', encoding='utf-8') as f:
+				cached = json.load(f)
+			if cached.get('version') == version:
+				self.previous = cached['datasets']
+		except (OSError, ValueError, KeyError):
+			pass
+
+	'''
+		Use : Dataset Fingerprint
+		@Params : _dfs - Data Frame of the Dataset
+				  locate - Cell Locator of the Data Contract
+				  samples - Sample Entries of the Dataset
+		returns : Fingerprint
+	'''
+	def fingerprint(self, _dfs, locate, samples):
+		digest = hashlib.sha256()
+		#The rows with their index labels and the value types, 12 and '12' are different values
+		digest.update(_dfs.to_json(orient='split', date_format='iso', default_handler=repr).encode('utf-8'))
+		digest.update(json.dumps([sorted(locate.columns.items()), locate.rowOffset]).encode('utf-8'))
+		#The Sample Files by their stat from the Sample Index, a Sample File of some GB is not read for the fingerprint
+		digest.update(json.dumps([[sample.name, sample.size, sample.mtime] for sample in samples]).encode('utf-8'))
+		return digest.hexdigest()
+
+	'''
+		Use : Cached Issues
+		@Params : dataset - Dataset Name
+				  fingerprint - Fingerprint of the Dataset
+		returns : (True, Dataset Issue or None) when the Dataset didn't change, (False, None) otherwise
+	'''
+	def lookup(self, dataset, fingerprint):
+		cached = self.previous.get(dataset)
+		if cached is not None and cached['fingerprint'] == fingerprint:
+			self.current[dataset] = cached
+			return True, cached['result']
+		return False, None
+
+	def store(self, dataset, fingerprint, result):
+		self.current[dataset] = {"fingerprint" : fingerprint, "result" : result}
+
+	'''
+		Use : Save
+		Desc : Write the Datasets of this run, the Datasets removed from the Data Contract are dropped. The file is
+			   written to a temporary name and renamed.
+	'''
+	def save(self):
+		try:
+			content = json.dumps({"version" : self.version, "datasets" : self.current})
+		except (TypeError, ValueError):
+			log.info('The issues of the Data Contract can not be cached: %s', self.path)
+			return
+		try:
+			directory = os.path.dirname(self.path)
+			os.makedirs(directory, exist_ok=True)
+			handle, temporary = tempfile.mkstemp(dir=directory, suffix='.tmp')
+			try:
+				with os.fdopen(handle, 'w', encoding='utf-8') as f:
+					f.write(content)
+				os.replace(temporary, self.path)
+			finally:
+				if os.path.exists(temporary):
+					os.remove(temporary)
+		except OSError:
+			log.error('Error in saving the Dataset cache', exc_info=True)
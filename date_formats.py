@@ -0,0 +1,70 @@
+'''
+	Date Formats
+	Desc : The UDF_TO_DATETIME formats of template.json (YYYY-MM-DD, DD/MM/YYYY, YYYY-MM-DD HH:MI:SS) compiled to
+		   regular expressions. Every format is compiled once and kept in FORMATS, which is shared by all the Datasets.
+		   The Sample File values of a date or time column are matched against the format of the column all at once
+		   with the pandas string methods, the dates which match are then checked for the day of the month.
+'''
+import re
+
+import pandas as pd
+
+#Tokens of the formats and the values they match, the longer tokens first
+FORMAT_TOKENS = [
+	('YYYY', r'(?P<year>[0-9]{4})'),
+	('MM', r'(?P<month>0[1-9]|1[0-2])'),
+	('DD', r'(?P<day>0[1-9]|[12][0-9]|3[01])'),
+	('HH24', r'(?:[01][0-9]|2[0-3])'),
+	('HH', r'(?:[01][0-9]|2[0-3])'),
+	('MI', r'(?:[0-5][0-9])'),
+	('SS', r'(?:[0-5][0-9])'),
+]
+TOKEN_PATTERN = re.compile('|'.join(token for token, pattern in FORMAT_TOKENS) + '|.', re.S)
+TOKENS = dict(FORMAT_TOKENS)
+
+#Compiled formats, {format : DateFormat}
+FORMATS = {}
+
+
+'''
+	Use : Date Format
+	Desc : format - Format in upper case, pattern - Regular expression of the whole value,
+		   dated - The format has a year, a month and a day, so the day of the month is checked
+'''
+class DateFormat(object):
+
+	__slots__ = ('format', 'pattern', 'dated')
+
+	def __init__(self, format):
+		self.format = format
+		self.pattern = re.compile(''.join(TOKENS.get(token, re.escape(token)) for token in TOKEN_PATTERN.findall(format)))
+		self.dated = all(part in self.pattern.groupindex for part in ('year', 'month', 'day'))
+
+	'''
+		Use : Date Format Reasons
+		@Params : values - Series of the values, without the empty values
+		returns : Series with the reason of every value which doesn't match, None for the values which match
+	'''
+	def reasons(self, values):
+		reasons = pd.Series(None, index=values.index, dtype=object)
+		matched = values.str.fullmatch(self.pattern).fillna(False).astype(bool)
+		reasons[~matched] = 'not in the format ' + self.format
+		if self.dated and matched.any():
+			parts = values[matched].str.extract(self.pattern)[['year', 'month', 'day']].astype(int)
+			invalid = pd.to_datetime(parts, errors='coerce').isna().to_numpy()
+			#By position, two records of a line split by a \r have the same label
+			reasons.iloc[matched.to_numpy().nonzero()[0][invalid]] = 'not a valid date'
+		return reasons
+
+
+'''
+	Use : Compile Date Format
+	@Params : format - UDF_TO_DATETIME format of the Attribute Range of Values
+	returns : DateFormat, compiled the first time the format is used
+'''
+def dateFormat(format):
+	format = str(format).strip().upper()
+	compiled = FORMATS.get(format)
+	if compiled is None:
+		compiled = FORMATS[format] = DateFormat(format)
+	return compiled
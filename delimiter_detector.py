@@ -0,0 +1,105 @@
+'''
+	Delimiter Detector
+	Desc : Finds the delimiter of a Sample File from the first lines of the file instead of running csv.Sniffer over
+		   the whole file. Every candidate delimiter splits the lines with the csv module, the delimiter giving the
+		   same number of fields (more than one) on the most lines is kept. The confidence is the share of the lines
+		   which have that number of fields. The delimiter of the Data Contract is a candidate too and wins a tie, the
+		   other punctuation of the header line is tried when no candidate splits the lines.
+'''
+import codecs
+import csv
+import io
+
+#Bytes and lines of the Sample File used to find the delimiter
+DETECT_BYTES = 64 * 1024
+DETECT_LINES = 200
+#Tried in this order, the first one wins a tie after the delimiter of the Data Contract
+CANDIDATES = [',', '\t', ';', '|', ':', ' ']
+
+
+'''
+	Use : Contract Delimiter
+	@Params : value - Attribute Delimiter of the Data Contract, the Other value when the Delimiter is Other
+	returns : Delimiter character
+'''
+def delimiterOf(value):
+	if value is None:
+		return None
+	if str(value).strip().lower() == 'tab':
+		return '\t'
+	return str(value)
+
+
+'''
+	Use : Prefix Text
+	Desc : Text of the first bytes of the file. A line cut by the budget is dropped, a character cut by the budget
+		   doesn't raise a decode error. A UTF-8 BOM is dropped.
+	@Params : data - Content of the Sample File, bytes or a memory map
+			  budget - Bytes to use
+	returns : Text of the prefix
+'''
+def prefixText(data, budget=DETECT_BYTES):
+	truncated = len(data) > budget
+	if truncated:
+		#A single line longer than the budget is kept whole up to the budget
+		end = data.rfind(b'\n', 0, budget)
+		data = data[:end + 1] if end != -1 else data[:budget]
+	else:
+		data = data[:]
+	return codecs.getincrementaldecoder('utf-8-sig')().decode(data, final=not truncated)
+
+
+def _fieldCounts(text, delimiter, lines):
+	counts = []
+	try:
+		for record in csv.reader(io.StringIO(text, newline=''), delimiter=delimiter):
+			if not record or (len(record) == 1 and not record[0].strip()):
+				continue
+			counts.append(len(record))
+			if len(counts) >= lines:
+				break
+	except csv.Error:
+		return []
+	return counts
+
+
+def _best(text, candidates, lines):
+	best = None
+	for delimiter in candidates:
+		counts = _fieldCounts(text, delimiter, lines)
+		if not counts:
+			continue
+		fields = max(set(counts), key=lambda count: (counts.count(count), count))
+		if fields < 2:
+			continue
+		confidence = counts.count(fields) / float(len(counts))
+		if best is None or confidence > best[1]:
+			best = (delimiter, confidence, fields)
+	return best
+
+#Other delimiters are the punctuation of the first line, as csv.Sniffer finds them
+def _others(text, tried):
+	line = next((line for line in text.splitlines() if line.strip()), '')
+	return sorted(set(char for char in line if not char.isalnum() and char not in tried and char not in '"\'\r\n'), key=line.index)
+
+
+'''
+	Use : Score Delimiters
+	Desc : The common delimiters and the delimiter of the Data Contract are tried first, the other punctuation of the
+		   header line only when none of them splits the lines.
+	@Params : text - Text of the first lines of the file
+			  declared - Delimiter of the Data Contract
+			  lines - Lines used to score the candidates
+	returns : (delimiter, confidence, fields) - fields is the number of fields of the lines
+	raise : csv.Error when no candidate splits the lines in more than one field
+'''
+def scoreDelimiters(text, declared=None, lines=DETECT_LINES):
+	candidates = list(CANDIDATES)
+	if declared is not None and len(declared) == 1:
+		if declared in candidates:
+			candidates.remove(declared)
+		candidates.insert(0, declared)
+	best = _best(text, candidates, lines) or _best(text, _others(text, candidates), lines)
+	if best is None:
+		raise csv.Error('Could not determine delimiter')
+	return best
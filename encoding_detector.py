@@ -0,0 +1,77 @@
+'''
+	Encoding Detector
+	Desc : Encoding of a Sample File from a bounded window of its first bytes. A byte order mark gives the encoding
+		   directly, a window which decodes as UTF-8 is ascii or utf-8, chardet is only run when the strict decode
+		   fails. The whole file can be validated as UTF-8 in chunks, to find a byte which is not UTF-8 after the
+		   window. The names are the names chardet gives, so the issues of the Sample File don't change.
+'''
+import codecs
+
+import chardet
+
+from configuration import log
+
+#Bytes of the Sample File used to find the encoding
+ENCODING_BYTES = 64 * 1024
+#Bytes validated at a time with the full validation
+VALIDATE_CHUNK = 1 << 20
+#Bytes around the first byte which is not UTF-8 given to chardet
+ERROR_WINDOW = 4096
+
+#Byte order marks, the longer marks first since the UTF-32 LE mark starts with the UTF-16 LE mark
+BOMS = [
+	(codecs.BOM_UTF32_LE, 'UTF-32'),
+	(codecs.BOM_UTF32_BE, 'UTF-32'),
+	(codecs.BOM_UTF8, 'UTF-8-SIG'),
+	(codecs.BOM_UTF16_LE, 'UTF-16'),
+	(codecs.BOM_UTF16_BE, 'UTF-16'),
+]
+
+
+def _chardet(data):
+	return chardet.detect(data)['encoding']
+
+
+'''
+	Use : Validate UTF-8
+	@Params : buffer - Content of the Sample File, bytes or a memory map
+	returns : Offset of the first byte which is not UTF-8 or None
+'''
+def invalidUtf8(buffer):
+	decoder = codecs.getincrementaldecoder('utf-8')()
+	position = 0
+	while True:
+		chunk = buffer[position:position + VALIDATE_CHUNK]
+		try:
+			decoder.decode(chunk, final=not chunk)
+		except UnicodeDecodeError as e:
+			return position + e.start - len(decoder.getstate()[0])
+		if not chunk:
+			return None
+		position += len(chunk)
+
+
+'''
+	Use : Detect Encoding
+	@Params : buffer - Content of the Sample File, bytes or a memory map
+			  budget - Bytes of the window
+			  validate - Validate the rest of the file as UTF-8 when the window is UTF-8
+	returns : Encoding name as chardet gives it, ascii for an empty file
+'''
+def detectEncoding(buffer, budget=ENCODING_BYTES, validate=False):
+	window = buffer[:budget]
+	for bom, encoding in BOMS:
+		if window.startswith(bom):
+			return encoding
+	truncated = len(buffer) > budget
+	try:
+		#A character cut at the end of the window is not an error
+		codecs.getincrementaldecoder('utf-8')().decode(window, final=not truncated)
+	except UnicodeDecodeError:
+		return _chardet(window)
+	if validate and truncated:
+		offset = invalidUtf8(buffer)
+		if offset is not None:
+			log.info('Byte %s of the Sample File is not UTF-8', offset)
+			return _chardet(buffer[max(offset - ERROR_WINDOW // 2, 0):offset + ERROR_WINDOW // 2])
+	return 'ascii' if window.isascii() else 'utf-8'
@@ -0,0 +1,185 @@
+'''
+	Entity Resolver
+	Desc : Entities of the Data Contracts are looked up in abc_db.ENTITY_MAPPING through a pool of connections that is
+		   opened once per run. The entities of a --file batch are resolved with a single query and every lookup is
+		   kept, so main, execute and entity_name don't connect or query again for an entity already checked.
+		   The local Entity Snapshot is consulted before Postgres.
+'''
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from psycopg2 import pool
+
+from configuration import log
+from entity_snapshot import EntitySnapshot, SNAPSHOT_DEFAULT_PATH, SNAPSHOT_DEFAULT_TTL
+
+ENTITY_QUERY = "SELECT ENTITY_NAME FROM abc_db.ENTITY_MAPPING WHERE ENTITY_NAME = ANY(%s);"
+ALL_ENTITIES_QUERY = "SELECT ENTITY_NAME FROM abc_db.ENTITY_MAPPING;"
+
+#Shared Resolvers of the run, one for every set of Postgres credentials
+RESOLVERS = {}
+RESOLVERS_LOCK = threading.Lock()
+
+
+'''
+	Use : Entity of a Data Contract
+	@Params : file - Data Contract File Name, ENTITY_NAME_CONTRACTNAME_SPRINT5.xlsx
+	returns : Entity Name in upper case
+'''
+def entityOf(file):
+	return file.split('_')[0].upper()
+
+
+'''
+	Use : Entity Lookups
+	Desc : Resolve Entity Names against ENTITY_MAPPING. A resolved Entity maps to the ENTITY_NAME stored in the
+		   Database, an Entity that doesn't exist maps to None.
+	@Params : psql_db, psql_user, psql_password, psql_host, psql_port - Postgres credentials
+			  maxconn - Connections kept by the pool
+			  snapshot - EntitySnapshot consulted before Postgres or None
+			  offline - Resolve from the snapshot only
+'''
+class EntityResolver(object):
+
+	def __init__(self, psql_db, psql_user, psql_password, psql_host, psql_port, maxconn=4, snapshot=None, offline=False):
+		self.params = {
+			'dbname': psql_db,
+			'user': psql_user,
+			'password': psql_password,
+			'host': psql_host,
+			'port': psql_port
+		}
+		self.maxconn = maxconn
+		self.snapshot = snapshot
+		self.offline = offline
+		self.entities = {}
+		self._pool = None
+		self._pid = None
+		self._lock = threading.Lock()
+
+	#Pool of the current process, a process forked by --contract-jobs opens its own connections
+	def pool(self):
+		with self._lock:
+			if self._pool is None or self._pid != os.getpid():
+				self._pool = pool.ThreadedConnectionPool(1, self.maxconn, **self.params)
+				self._pid = os.getpid()
+				log.info("Successfully connected to the database")
+			return self._pool
+
+	@contextmanager
+	def connection(self):
+		_pool = self.pool()
+		connection = _pool.getconn()
+		try:
+			yield connection
+		finally:
+			_pool.putconn(connection)
+
+	#Every ENTITY_NAME of ENTITY_MAPPING, used to refresh the snapshot
+	def fetchAll(self):
+		with self.connection() as connection:
+			with connection.cursor() as cursor:
+				cursor.execute(ALL_ENTITIES_QUERY)
+				entities = [row[0] for row in cursor.fetchall()]
+			connection.rollback()
+		return entities
+
+	'''
+		Use : Snapshot Lookup
+		Desc : Resolve the Entities from the snapshot. An empty snapshot is filled first, an expired one is refreshed
+			   in the background while the current one is used. Offline the snapshot is used as it is.
+		@Params : entities - Entity Names which are not resolved yet
+		returns : Entities which are still not resolved
+	'''
+	def fromSnapshot(self, entities):
+		try:
+			if not self.offline and self.snapshot.expired():
+				if self.snapshot.refreshedAt() is None:
+					self.snapshot.refresh(self.fetchAll)
+				else:
+					self.snapshot.refreshInBackground(self.fetchAll)
+			found = self.snapshot.lookup(entities)
+		except sqlite3.Error:
+			if self.offline:
+				raise
+			log.error("Error in reading the Entity snapshot, Entities are resolved from the Database", exc_info=True)
+			return entities
+		for entity in found:
+			self.entities[entity] = entity
+		return [entity for entity in entities if entity not in found]
+
+	'''
+		Use : Bulk Lookup
+		Desc : Resolve the Entities which are not resolved yet from the snapshot, then with one query.
+		@Params : entities - Entity Names
+		returns : Dictionary of Entity Name and ENTITY_NAME from the Database or None
+	'''
+	def resolve(self, entities):
+		entities = list(dict.fromkeys(entities))
+		missing = [entity for entity in entities if entity not in self.entities]
+		if missing and self.snapshot is not None:
+			missing = self.fromSnapshot(missing)
+		if missing and self.offline:
+			log.warning("Entities not in the Entity snapshot: %s", ', '.join(missing))
+			for entity in missing:
+				self.entities[entity] = None
+			missing = []
+		if missing:
+			with self.connection() as connection:
+				with connection.cursor() as cursor:
+					cursor.execute(ENTITY_QUERY, (missing,))
+					found = dict((row[0], row[0]) for row in cursor.fetchall())
+				connection.rollback() #Close the read only transaction before the connection goes back to the pool
+			for entity in missing:
+				self.entities[entity] = found.get(entity)
+		return dict((entity, self.entities[entity]) for entity in entities)
+
+	#Version of the lookups, the time of the last refresh of the snapshot
+	def version(self):
+		if self.snapshot is None:
+			return ''
+		try:
+			return self.snapshot.refreshedAt()
+		except sqlite3.Error:
+			return None
+
+	def lookup(self, entity):
+		return self.resolve([entity])[entity]
+
+	#Wait for the refresh of the snapshot, then close the connections of this process
+	def close(self):
+		if self.snapshot is not None:
+			self.snapshot.wait()
+		with self._lock:
+			if self._pool is not None and self._pid == os.getpid():
+				self._pool.closeall()
+			self._pool = None
+
+
+'''
+	Use : Shared Resolver
+	Desc : Resolver of the run for the Postgres credentials, created on the first call. The snapshot options are
+		   taken from the first call, later calls with the same credentials get the same Resolver.
+	@Params : psql_db, psql_user, psql_password, psql_host, psql_port - Postgres credentials
+			  offline - Resolve from the snapshot only
+			  ttl - Seconds the snapshot is valid, None disables the snapshot
+			  path - SQLite file of the snapshot
+	returns : EntityResolver
+'''
+def entityResolver(psql_db, psql_user, psql_password, psql_host, psql_port, offline=False, ttl=SNAPSHOT_DEFAULT_TTL, path=SNAPSHOT_DEFAULT_PATH):
+	key = (psql_db, psql_user, psql_password, psql_host, psql_port)
+	with RESOLVERS_LOCK:
+		if key not in RESOLVERS:
+			snapshot = EntitySnapshot(path, ttl) if ttl is not None or offline else None
+			RESOLVERS[key] = EntityResolver(*key, snapshot=snapshot, offline=offline)
+		return RESOLVERS[key]
+
+
+#Close every Resolver of the run, called before the process exits
+def closeResolvers():
+	with RESOLVERS_LOCK:
+		resolvers = list(RESOLVERS.values())
+	for resolver in resolvers:
+		resolver.close()
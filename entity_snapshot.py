@@ -0,0 +1,111 @@
+'''
+	Entity Snapshot
+	Desc : Local copy of abc_db.ENTITY_MAPPING kept in SQLite. The Entities are resolved from the snapshot first, so a
+		   run only reaches Postgres to refresh an expired snapshot or for an Entity the snapshot doesn't know yet.
+		   With --offline only the snapshot is used and no Postgres credentials are required.
+'''
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+from configuration import log, CODES_DIR
+
+SNAPSHOT_DEFAULT_PATH = os.path.join(CODES_DIR, 'cache', 'entity_mapping.sqlite')
+#Seconds after which the snapshot is refreshed from Postgres
+SNAPSHOT_DEFAULT_TTL = 24 * 60 * 60
+#SQLite limits the number of parameters of a query
+LOOKUP_CHUNK = 500
+
+
+'''
+	Use : Entity Snapshot
+	@Params : path - SQLite file of the snapshot
+			  ttl - Seconds the snapshot is valid after a refresh
+'''
+class EntitySnapshot(object):
+
+	def __init__(self, path=SNAPSHOT_DEFAULT_PATH, ttl=SNAPSHOT_DEFAULT_TTL):
+		self.path = path
+		self.ttl = ttl
+		self._lock = threading.Lock()
+		self._refresh = None
+
+	def connect(self):
+		os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+		connection = sqlite3.connect(self.path, timeout=30)
+		connection.execute("CREATE TABLE IF NOT EXISTS entity_mapping (entity_name TEXT PRIMARY KEY)")
+		connection.execute("CREATE TABLE IF NOT EXISTS snapshot (key TEXT PRIMARY KEY, value TEXT)")
+		return connection
+
+	#Time of the last refresh or None if the snapshot was never filled
+	def refreshedAt(self):
+		with closing(self.connect()) as connection:
+			row = connection.execute("SELECT value FROM snapshot WHERE key = 'refreshed_at'").fetchone()
+		return float(row[0]) if row else None
+
+	def expired(self):
+		refreshedAt = self.refreshedAt()
+		return refreshedAt is None or time.time() - refreshedAt > self.ttl
+
+	'''
+		Use : Lookup
+		@Params : entities - Entity Names
+		returns : Set of the Entities present in the snapshot
+	'''
+	def lookup(self, entities):
+		found = set()
+		with closing(self.connect()) as connection:
+			for start in range(0, len(entities), LOOKUP_CHUNK):
+				chunk = entities[start:start + LOOKUP_CHUNK]
+				query = "SELECT entity_name FROM entity_mapping WHERE entity_name IN (%s)" % ','.join('?' * len(chunk))
+				found.update(row[0] for row in connection.execute(query, chunk))
+		return found
+
+	'''
+		Use : Store
+		Desc : Replace the snapshot with the Entities in one transaction, a reader sees either the old or the new snapshot.
+		@Params : entities - Every ENTITY_NAME of ENTITY_MAPPING
+	'''
+	def store(self, entities):
+		with closing(self.connect()) as connection:
+			with connection:
+				connection.execute("DELETE FROM entity_mapping")
+				connection.executemany("INSERT OR IGNORE INTO entity_mapping (entity_name) VALUES (?)", ((entity,) for entity in entities))
+				connection.execute("INSERT OR REPLACE INTO snapshot (key, value) VALUES ('refreshed_at', ?)", (repr(time.time()),))
+
+	'''
+		Use : Refresh
+		@Params : fetch - Function returning every ENTITY_NAME of ENTITY_MAPPING
+	'''
+	def refresh(self, fetch):
+		entities = fetch()
+		self.store(entities)
+		log.info("Entity snapshot refreshed with %s Entities: %s", len(entities), self.path)
+
+	'''
+		Use : Background Refresh
+		Desc : Refresh an expired snapshot while the run goes on with the current one. Only one refresh runs at a time.
+			   The thread is not a daemon, the run waits for the refresh before it exits, see wait.
+		@Params : fetch - Function returning every ENTITY_NAME of ENTITY_MAPPING
+	'''
+	def refreshInBackground(self, fetch):
+		with self._lock:
+			if self._refresh is not None and self._refresh.is_alive():
+				return
+			self._refresh = threading.Thread(target=self._refreshQuietly, args=(fetch,), name='entity-snapshot-refresh')
+			self._refresh.start()
+
+	#Wait for the background refresh of this process
+	def wait(self):
+		with self._lock:
+			refresh = self._refresh
+		if refresh is not None and refresh.ident is not None and refresh is not threading.current_thread():
+			refresh.join()
+
+	def _refreshQuietly(self, fetch):
+		try:
+			self.refresh(fetch)
+		except Exception:
+			log.error("Error in refreshing the Entity snapshot", exc_info=True)
@@ -0,0 +1,293 @@
+'''
+	Key Verifier
+	Desc : Checks that the Primary Key and the Unique Attributes of the Data Contract have no duplicate values in the
+		   Sample File. The key of every row is hashed to 64 bits batch by batch and only the hashes and the rows are
+		   kept, 16 bytes a row. Above the memory cap the hashes are spilled to PARTITIONS files on disk by their low
+		   bits, every file is then sorted and checked on its own, and a file still above the cap is spilled again by
+		   the next bits. A file which the next bits don't make smaller, a key repeated in most of the rows, is not
+		   split again, its equal hashes are counted while the file is streamed. The rows of the examples are read
+		   again at the end for their values, an example whose key values differ from the first row is a collision
+		   of the hashes and is not reported. Rows with an empty key value are left to the nullability check.
+'''
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from sample_profiler import columnPositions, sampleBatches, LINE, PROFILE_BATCH, PROFILE_EXAMPLES
+
+#Memory in bytes used for the hashes of a Sample File before they are spilled to disk
+KEY_MEMORY = 256 << 20
+#Hash bits used to split the hashes in partition files
+PARTITION_BITS = 6
+PARTITIONS = 1 << PARTITION_BITS
+#Hash and number of the record in the Sample File, the line of the record is only read for the examples
+RECORD = np.dtype([('hash', '<u8'), ('row', '<i8')])
+#Rows of every hash of a partition streamed from disk and the first row with the hash
+COUNT = np.dtype([('hash', '<u8'), ('rows', '<i8'), ('first', '<i8')])
+
+
+'''
+	Use : Key Check
+	Desc : columns - Attributes of the key, primary - Primary Key or Unique Attribute
+		   checked - Rows with a value in every column of the key
+		   duplicates - Rows with the key of an earlier row, keys - Key values found in more than one row
+		   examples - [(line, first, value)] of the first rows with the key of an earlier row, first is the line of
+					  the earlier row
+'''
+class KeyCheck(object):
+
+	__slots__ = ('columns', 'primary', 'checked', 'duplicates', 'keys', 'examples')
+
+	def __init__(self, columns, primary):
+		self.columns = columns
+		self.primary = primary
+		self.checked = 0
+		self.duplicates = 0
+		self.keys = 0
+		self.examples = []
+
+
+'''
+	Use : Key Partitions
+	Desc : Hashes of a key kept in memory up to the memory cap and spilled to partition files above it.
+	@Params : memory - Memory cap in bytes
+			  directory - Directory of the partition files
+			  level - Partition files spilled before, the hash bits used by this level are above theirs
+			  parent - Size in bytes of the partition file split by this level, None for the first level
+'''
+class _KeyPartitions(object):
+
+	__slots__ = ('memory', 'directory', 'level', 'parent', 'buffered', 'size', 'files')
+
+	def __init__(self, memory, directory, level=0, parent=None):
+		self.memory = memory
+		self.directory = directory
+		self.level = level
+		self.parent = parent
+		self.buffered = []
+		self.size = 0
+		self.files = None
+
+	def add(self, records):
+		self.buffered.append(records)
+		self.size += records.nbytes
+		if self.size > self.memory:
+			self._spill()
+
+	def _spill(self):
+		if self.files is None:
+			directory = tempfile.mkdtemp(prefix='keys_', dir=self.directory)
+			self.files = [os.path.join(directory, '%02d.bin' % partition) for partition in range(PARTITIONS)]
+		records = np.concatenate(self.buffered)
+		self.buffered = []
+		self.size = 0
+		partitions = (records['hash'] >> np.uint64(self.level * PARTITION_BITS)) & np.uint64(PARTITIONS - 1)
+		order = np.argsort(partitions, kind='stable')
+		records = records[order]
+		bounds = np.searchsorted(partitions[order], np.arange(PARTITIONS + 1, dtype=np.uint64))
+		for partition in range(PARTITIONS):
+			if bounds[partition] < bounds[partition + 1]:
+				with open(self.files[partition], 'ab') as handle:
+					records[bounds[partition]:bounds[partition + 1]].tofile(handle)
+
+	'''
+		Use : Duplicate Keys
+		@Params : examples - Examples kept
+		returns : (duplicates, keys, examples) - Rows with the hash of an earlier row, hashes of more than one row
+				  and [(row, first)] of the first of those rows
+	'''
+	def duplicates(self, examples):
+		if self.files is None:
+			return _sortedDuplicates(np.concatenate(self.buffered) if self.buffered else np.empty(0, RECORD), examples)
+		if self.buffered:
+			self._spill()
+		duplicates = keys = 0
+		found = []
+		for path in self.files:
+			if not os.path.exists(path):
+				continue
+			size = os.path.getsize(path)
+			if size <= self.memory:
+				result = _sortedDuplicates(np.fromfile(path, dtype=RECORD), examples)
+			elif (self.parent is None or size < self.parent) and (self.level + 1) * PARTITION_BITS < 64:
+				#A partition above the cap is split again by the next bits of the hash
+				partitions = _KeyPartitions(self.memory, self.directory, self.level + 1, size)
+				step = max(self.memory // RECORD.itemsize, 1)
+				records = np.memmap(path, dtype=RECORD, mode='r')
+				for start in range(0, len(records), step):
+					partitions.add(np.array(records[start:start + step]))
+				del records
+				result = partitions.duplicates(examples)
+			else:
+				#The split didn't make the partition smaller, splitting it again doesn't either
+				result = _streamedDuplicates(path, self.memory, examples)
+			os.remove(path)
+			duplicates += result[0]
+			keys += result[1]
+			found = sorted(found + result[2])[:examples]
+		return duplicates, keys, found
+
+
+#Duplicates of records which fit in memory
+def _sortedDuplicates(records, examples):
+	records.sort(order=('hash', 'row'))
+	hashes = records['hash']
+	repeated = np.flatnonzero(hashes[1:] == hashes[:-1]) + 1
+	if not len(repeated):
+		return 0, 0, []
+	#First record of the hash of every record
+	starts = np.flatnonzero(np.concatenate(([True], hashes[1:] != hashes[:-1])))
+	groups = np.searchsorted(starts, repeated, side='right') - 1
+	rows = records['row']
+	keys = len(np.unique(groups))
+	first = np.argsort(rows[repeated], kind='stable')[:examples]
+	return len(repeated), keys, [(int(rows[repeated[index]]), int(rows[starts[groups[index]]])) for index in first]
+
+
+#Rows and first row of every hash of the records, hashes in order
+def _hashCounts(hashes, rows, firsts):
+	unique, inverse = np.unique(hashes, return_inverse=True)
+	counts = np.zeros(len(unique), COUNT)
+	counts['hash'] = unique
+	np.add.at(counts['rows'], inverse, rows)
+	counts['first'] = np.iinfo(np.int64).max
+	np.minimum.at(counts['first'], inverse, firsts)
+	return counts
+
+'''
+	Use : Streamed Duplicates
+	Desc : Duplicates of a partition file above the memory cap which can't be split, read in steps of the cap. The
+		   first read counts the rows and finds the first row of every hash, the second read takes the examples.
+		   Only the counts of the distinct hashes are kept, few when one key is in most of the rows.
+	@Params : path - Partition File
+			  memory - Memory cap in bytes
+			  examples - Examples kept
+	returns : (duplicates, keys, examples) as _KeyPartitions.duplicates
+'''
+def _streamedDuplicates(path, memory, examples):
+	records = np.memmap(path, dtype=RECORD, mode='r')
+	step = max(memory // (2 * RECORD.itemsize), 1)
+	counts = np.empty(0, COUNT)
+	for start in range(0, len(records), step):
+		chunk = np.array(records[start:start + step])
+		chunk = _hashCounts(chunk['hash'], np.ones(len(chunk), np.int64), chunk['row'])
+		merged = np.concatenate((counts, chunk))
+		counts = _hashCounts(merged['hash'], merged['rows'], merged['first'])
+	repeated = counts[counts['rows'] > 1]
+	found = np.empty(0, RECORD)
+	if len(repeated):
+		for start in range(0, len(records), step):
+			chunk = np.array(records[start:start + step])
+			index = np.minimum(np.searchsorted(repeated['hash'], chunk['hash']), len(repeated) - 1)
+			later = (repeated['hash'][index] == chunk['hash']) & (repeated['first'][index] != chunk['row'])
+			found = np.concatenate((found, chunk[later]))
+			found = found[np.argsort(found['row'], kind='stable')[:examples]]
+	del records
+	first = dict((int(value), int(row)) for value, row in zip(repeated['hash'], repeated['first']))
+	return int((repeated['rows'] - 1).sum()), len(repeated), [(int(row), first[int(value)]) for value, row in zip(found['hash'], found['row'])]
+
+
+#Key sets of the schema, the Primary Key with all its columns and every Unique Attribute on its own
+def _keySets(schema):
+	keySets = []
+	primaryKey = tuple(column.name for column in schema if column.primaryKey)
+	if primaryKey:
+		keySets.append((primaryKey, True))
+	for column in schema:
+		if column.unique and (column.name,) not in [columns for columns, primary in keySets]:
+			keySets.append(((column.name,), False))
+	return keySets
+
+
+'''
+	Use : Key Verifier
+	Desc : Hashes of the Primary Key and of every Unique Attribute in the header of the Sample File, added from the
+		   batches of the Sample File one at a time. The partition files are kept in a temporary directory until close.
+	@Params : header - Header of the Sample File
+			  schema - SampleColumn of every Attribute of the Dataset
+			  memory - Memory cap in bytes of the hashes
+			  examples - Examples kept for every key
+'''
+class KeyVerifier(object):
+
+	def __init__(self, header, schema, memory=KEY_MEMORY, examples=PROFILE_EXAMPLES):
+		keySets = _keySets(schema)
+		self.positions = columnPositions(header, set(name for columns, primary in keySets for name in columns))
+		#A key with a column which is not in the header is left to the header check
+		keySets = [(columns, primary) for columns, primary in keySets if all(name in self.positions for name in columns)]
+		self.checks = [KeyCheck(list(columns), primary) for columns, primary in keySets]
+		self.examples = examples
+		#Positions of the header read for the keys
+		self.used = set(self.positions[name] for check in self.checks for name in check.columns)
+		self.directory = None
+		self.partitions = []
+		if self.checks:
+			self.directory = tempfile.TemporaryDirectory(prefix='sample_keys_')
+			self.partitions = [_KeyPartitions(max(memory // len(self.checks), RECORD.itemsize), self.directory.name) for check in self.checks]
+
+	def add(self, chunk):
+		for check, keyPartitions in zip(self.checks, self.partitions):
+			keys = chunk[[self.positions[name] for name in check.columns]]
+			keys = keys[(keys != '').all(axis=1)]
+			check.checked += len(keys)
+			records = np.empty(len(keys), RECORD)
+			records['hash'] = pd.util.hash_pandas_object(keys, index=False).to_numpy()
+			records['row'] = keys.index.to_numpy()
+			keyPartitions.add(records)
+
+	'''
+		Use : Key Checks
+		Desc : Duplicates of every key, the values of the examples are read again from the Sample File.
+		@Params : buffer - Content of the Sample File
+				  delimiter - Delimiter of the Sample File
+				  width - Fields of the header
+				  batch - Rows read at a time
+		returns : KeyCheck of the Primary Key and of every Unique Attribute in the header of the Sample File
+	'''
+	def result(self, buffer, delimiter, width, batch=PROFILE_BATCH):
+		for check, keyPartitions in zip(self.checks, self.partitions):
+			check.duplicates, check.keys, check.examples = keyPartitions.duplicates(self.examples)
+		self.close()
+		_exampleValues(buffer, delimiter, width, self.used, self.positions, self.checks, batch)
+		return self.checks
+
+	def close(self):
+		if self.directory is not None:
+			self.directory.cleanup()
+			self.directory = None
+
+
+'''
+	Use : Example Values
+	Desc : Values of the key of the examples and of their first rows, read again from the Sample File. The hashes only
+		   find the candidates, an example is kept when its key values are the values of its first row. An example
+		   with other values is a collision of the hashes and is taken out of the duplicates, and its key out of the
+		   repeated keys when no other example of the key is kept. The examples are given the lines of their rows.
+'''
+def _exampleValues(buffer, delimiter, width, used, positions, checks, batch):
+	rows = set(row for check in checks for example in check.examples for row in example)
+	if not rows:
+		return
+	values = {}
+	for chunk in sampleBatches(buffer, delimiter, used, width, batch):
+		for number, value in chunk[chunk.index.isin(list(rows))].iterrows():
+			values[int(number)] = value
+		if len(values) == len(rows):
+			break
+	for check in checks:
+		keyOf = lambda row: tuple(values[row][positions[name]] for name in check.columns) if row in values else None
+		confirmed = []
+		#First row of every key of the examples and whether an example of it is kept
+		kept = {}
+		for row, first in check.examples:
+			key = keyOf(row)
+			if key is not None and key == keyOf(first):
+				confirmed.append((int(values[row][LINE]), int(values[first][LINE]), ', '.join(key)))
+				kept[first] = True
+			else:
+				check.duplicates -= 1
+				kept.setdefault(first, False)
+		check.keys -= sum(1 for found in kept.values() if not found)
+		check.examples = confirmed
@@ -1,61 +1,63 @@
 import os
 import json
 import argparse
-import pandas as pd
-import re
 import sys
-import csv
-import chardet
-import psycopg2
 from configuration import log, DATA_CONTRACT_DEFAULT_PATH, PARSED_DATA_CONTRACT_DEFAULT_PATH, TEMPLATE, CODES_DIR
-from lib.utils import findLoc, listToComma
+from template_index import compileTemplate, NAME_PATTERN, DATE_TIME_PATTERN, SIZE_PATTERN
+from cell_locator import CellLocator
+from contract_reader import fillContract
+from contract_cache import loadContract
+from entity_resolver import entityResolver, entityOf
+from entity_snapshot import SNAPSHOT_DEFAULT_TTL
+from delimiter_detector import delimiterOf
+from sample_inspector import inspectSample, SampleOptions, SAMPLE_DEFAULTS, DELIMITED_EXTENSIONS
+from encoding_detector import ENCODING_BYTES
+from key_verifier import KEY_MEMORY
+from sample_profiler import sampleSchema
+from sample_index import sampleIndex
 
 def read_input_args():
     try:
         log.info('Data Contract File Path Function: Started')
-        parser = argparse.ArgumentParser(description='The Arguments --file, --dir and postgres creds are required')
+        parser = argparse.ArgumentParser(description='The Arguments --file, --dir and postgres creds are required, postgres creds are not required with --offline')
         parser.add_argument('--file', '-f', help="Data Contract File Name", type=str, required=True)
         parser.add_argument('--dir', '-d', help="Data Contract Directory Path", type=str, default=DATA_CONTRACT_DEFAULT_PATH)
-        parser.add_argument('--psql_db', '-psql_db', help="Postgres Database ", type=str, required=True)
-        parser.add_argument('--psql_user', '-psql_user', help="Postgres Username", type=str, required=True)
-        parser.add_argument('--psql_password', '-psql_pwd', help="Postgres Password", type=str, required=True)
-        parser.add_argument('--psql_host', '-psql_host', help="Postgres Hostname", type=str, required=True)
-        parser.add_argument('--psql_port', '-psql_port', help="Postgres Port", type=str, required=True)
+        parser.add_argument('--psql_db', '-psql_db', help="Postgres Database ", type=str)
+        parser.add_argument('--psql_user', '-psql_user', help="Postgres Username", type=str)
+        parser.add_argument('--psql_password', '-psql_pwd', help="Postgres Password", type=str)
+        parser.add_argument('--psql_host', '-psql_host', help="Postgres Hostname", type=str)
+        parser.add_argument('--psql_port', '-psql_port', help="Postgres Port", type=str)
+        parser.add_argument('--offline', help="Resolve the Entities from the local Entity snapshot only", action='store_true')
+        parser.add_argument('--entity-ttl', help="Seconds the local Entity snapshot is used before it is refreshed", type=int, default=SNAPSHOT_DEFAULT_TTL)
+        parser.add_argument('--sample-rows', help="Scan the whole Sample Files for the row count, the fields of every row, the quotes and the line endings, only the header is read otherwise", action='store_true')
+        parser.add_argument('--sample-utf8', help="Validate the whole Sample Files as UTF-8, only the first --encoding-bytes are checked otherwise", action='store_true')
+        parser.add_argument('--encoding-bytes', help="Bytes of the Sample Files used to find their encoding", type=int, default=ENCODING_BYTES)
+        parser.add_argument('--sample-profile', help="Check the values of the Sample Files against the Attribute DataType, the Attribute Size and the Date/Time Format", action='store_true')
+        parser.add_argument('--sample-keys', help="Check the Primary Key and the Unique Attributes of the Sample Files for duplicate values", action='store_true')
+        parser.add_argument('--key-memory', help="Memory in MB used for the keys of a Sample File before they are spilled to disk", type=int, default=KEY_MEMORY >> 20)
+        parser.add_argument('--sample-nulls', help="Count the empty and null values of the Sample Files and check them against the Attribute Nullability", action='store_true')
 
         args = parser.parse_args()
+        if not args.offline and None in (args.psql_db, args.psql_user, args.psql_password, args.psql_host, args.psql_port):
+            parser.error('the postgres creds are required unless --offline is given')
         return args
     except Exception as e:
         log.error("Error reading input arguments", exc_info=True)
         sys.exit(1)
 
 
-def connect_to_postgres(psql_db, psql_user, psql_password, psql_host, psql_port):
-    try:
-        connection = psycopg2.connect(
-            dbname=psql_db,
-            user=psql_user,
-            password=psql_password,
-            host=psql_host,
-            port=psql_port
-        )
-        cursor = connection.cursor()
-        log.info("Successfully connected to the database")
-        return connection, cursor
-    except Exception as error:
-        log.error(f"Error connecting to PostgreSQL: {error}")
-        return None, None
-
 def initialize_context():
     return {
         "issues": [],
         "other_issues": [],
         "all_issues": [],
-        "template": json.load(TEMPLATE),
+        "template": compileTemplate(TEMPLATE),
         "template_file": TEMPLATE,
         "files": [],
         "dataset_issues": {},
-        "cursor": None,
-        "connection": None,
+        "locate": None,
+        "resolver": None,
+        "sample_options": SAMPLE_DEFAULTS,
         # validation-specific data
         "attribute_issues": [],
         "attribute_classification_issues": [],
@@ -109,13 +111,10 @@ def entity_name(file, context):
             generate_report(file, context)
             sys.exit(1)
 
-        entity = file.split('_')[0].upper()
+        entity = entityOf(file)
         log.info("Entity Name from Data Contract: %s", entity)
 
-        connection, cursor = context['connection'], context['cursor']
-        query = f"SELECT ENTITY_NAME FROM abc_db.ENTITY_MAPPING WHERE ENTITY_NAME = '{entity}';"
-        cursor.execute(query)
-        result = cursor.fetchone()
+        result = context['resolver'].lookup(entity)
         if result is None:
             issue = {
                 "type": "ERROR",
@@ -130,9 +129,9 @@ def entity_name(file, context):
             generate_report(file, context)
             sys.exit(1)
 
-        log.info("Entity from DB is valid: %s", result[0])
-        context['entity_name'] = result[0]
-        return result[0]
+        log.info("Entity from DB is valid: %s", result)
+        context['entity_name'] = result
+        return result
 
     except Exception as e:
         generate_report(file, context)
@@ -144,6 +143,7 @@ def process_file(file, data_contract_path, context):
         log.info(f"Processing file: {file}")
         entity_name(file, context)
         file_path = os.path.join(data_contract_path,context['entity_name'], file)
+        sampleIndex(os.path.join(data_contract_path, 'sampleFiles'), refresh=True)  # files rewritten since the last contract of the run
         dfs = parse_data_contract(file_path, context)
         validate_headers(dfs, file, context)
         validate_datasets(dfs, file, context, data_contract_path)
@@ -154,10 +154,10 @@ def process_file(file, data_contract_path, context):
 
 def parse_data_contract(path, context):
     log.info(f"Reading data contract from {path}")
-    return pd.read_excel(path, sheet_name="Metadata Template", header=2)
+    return loadContract(path, context['template'])
 
 def validate_headers(dfs, file, context):
-    expected_columns = context['template'].get('headers', [])
+    expected_columns = list(context['template'].header)
     actual_columns = list(dfs.columns)
     missing_columns = [col for col in expected_columns if col not in actual_columns]
 
@@ -176,23 +176,21 @@ def validate_headers(dfs, file, context):
 
 def validate_datasets(dfs, file, context, data_contract_path):
 
-    dfs = dfs.dropna(how='all').ffill()
+    dfs = fillContract(dfs)  # merged cells are expanded by the reader, forward filled otherwise
+    context['locate'] = CellLocator(dfs)  # issue locations, resolved only when an issue is reported
     dataset = dfs['Dataset Name'].dropna().unique()[0]
     attribute_col_index = dfs.columns.get_loc('Attribute')
     classification_col_index = dfs.columns.get_loc('Attribute Classification')
     processed_datasets = []
 
-    index_range = list(dfs.index)
-    start_index = index_range[0]
-    end_index = index_range[-1] + 1
+    # fillContract drops the empty rows, so the index labels are not positions: slice by position,
+    # the labels are only used to locate the issues
+    attribute_list = dfs.iloc[:, attribute_col_index].to_numpy(dtype=object)
+    attribute_classification_list = dfs.iloc[:, classification_col_index].to_numpy(dtype=object)
 
-               
-    attribute_list = dfs.values[start_index:end_index, attribute_col_index]
-    attribute_classification_list = dfs.values[start_index:end_index, classification_col_index]
-    
-    for idx, row in dfs.iterrows():
-    
-        count = {"index": idx + 1, "count": len(dfs)}
+    for position, (idx, row) in enumerate(dfs.iterrows()):
+
+        count = {"index": position + 1, "count": len(dfs)}
         validate_frequency(row.get('Frequency'), count, dfs, 'Frequency of Update on Source', idx, context)
         validate_frequency(row.get('Frequency'), count, dfs, 'Frequency of Update to SDP', idx, context)
         validate_format(row.get('Format (MIME)'), count, dfs, idx, context)
@@ -217,23 +215,21 @@ def validate_datasets(dfs, file, context, data_contract_path):
         validate_attribute_primary_key(row.get('Attribute Primary Key'), count, dfs, idx, context)
         validate_dataset_classification(row.get('Data Classification Type'), count, dfs, idx, attribute_classification_list, context)
 
-    parse_sample_file(dataset, entity_name, attribute_list, context, data_contract_path)
+    schema = sampleSchema(dfs, context['template'].upper('dateformat')) if context['sample_options'].schema() else None
+    parse_sample_file(dataset, entity_name, attribute_list, context, data_contract_path, schema)
 
 
 
-def parse_sample_file(dataset_name, entity_name, attributes, context, data_contract_path):
+def parse_sample_file(dataset_name, entity_name, attributes, context, data_contract_path, schema=None):
     dataset_file_prefix = context['entity_name'] + '_' + dataset_name
     sample_dir = os.path.join(data_contract_path, 'sampleFiles')
     sample_file_issues = []
+    sample_file_stats = []
 
-    if not os.path.isdir(sample_dir):
+    sample_files = sampleIndex(sample_dir)  # scanned once for all the datasets of the contract
+    if sample_files is None:
         return
 
-    sample_files = {}
-    for file_name in os.listdir(sample_dir):
-        name_parts = tuple(file_name.split('.'))
-        sample_files[name_parts[0]] = name_parts[1]
-
     if dataset_file_prefix not in sample_files:
         issue = {
             "type": "ERROR",
@@ -245,11 +241,14 @@ def parse_sample_file(dataset_name, entity_name, attributes, context, data_contr
         }
         sample_file_issues.append(issue)
     else:
-        ext = sample_files[dataset_file_prefix]
-        file_path = os.path.join(sample_dir, f"{dataset_file_prefix}.{ext}")
+        ext = sample_files[dataset_file_prefix].extension
+        file_path = sample_files[dataset_file_prefix].path
 
         try:
-            encoding = predict_encoding(file_path, 5)
+            declared = context['delimiter_values'][0] if context.get('delimiter_values') else None
+            # the sample file is opened once, the issues below are built from the inspection
+            inspection = inspectSample(file_path, declared, ext in DELIMITED_EXTENSIONS, context['sample_options'], schema)
+            encoding = inspection.encoding
             if encoding.lower() not in ['utf-8', 'ascii']:
                 issue = {
                     "type": "ERROR",
@@ -261,17 +260,16 @@ def parse_sample_file(dataset_name, entity_name, attributes, context, data_contr
                 }
                 sample_file_issues.append(issue)
 
-            if ext in ['csv', 'txt']:
-                with open(file_path, 'r', encoding="utf8") as f:
-                    dialect = csv.Sniffer().sniff(f.read())
-                    delimiter = str(dialect.delimiter)
-
-                df_reader = pd.read_csv(file_path, sep=delimiter, header=[0, 0], dtype='unicode')
-                sample_count = len(df_reader.index)
-                declared_delimiter = context.get('delimiter_values', [''])[0]
+            if ext in DELIMITED_EXTENSIONS:
+                if inspection.error is not None:
+                    raise inspection.error
+                delimiter = inspection.delimiter
+                log.info("Sample File %s delimiter %r, confidence %.2f", dataset_file_prefix, delimiter, inspection.confidence)
 
-                if declared_delimiter.strip().lower() == 'tab':
-                    declared_delimiter = '\t'
+                sample_header = inspection.header
+                if context['sample_options'].rows:
+                    log.info("Sample File %s has %s rows, %s with another number of fields than the header", dataset_file_prefix, inspection.rows, inspection.ragged)
+                declared_delimiter = delimiterOf(context.get('delimiter_values', [''])[0])
 
                 if delimiter != declared_delimiter:
                     issue = {
@@ -284,7 +282,6 @@ def parse_sample_file(dataset_name, entity_name, attributes, context, data_contr
                     }
                     sample_file_issues.append(issue)
 
-                sample_header = df_reader.columns.get_level_values(0).tolist()
                 normalized_attributes = [attr.strip().upper() for attr in attributes]
                 sample_header = [col.strip().upper() for col in sample_header]
 
@@ -299,6 +296,91 @@ def parse_sample_file(dataset_name, entity_name, attributes, context, data_contr
                     }
                     sample_file_issues.append(issue)
 
+                for profile in inspection.profile or []:
+                    column = profile.column
+                    for line, value, reason in profile.examples:
+                        issue = {
+                            "type": "ERROR",
+                            "issueValue": f"Sample File value of {column.name} does not match {column.declared()}",
+                            "expectedValue": f"Values of {column.name} should be {column.declared()}, {profile.failed} of {profile.checked} values ({profile.rate()}) do not match",
+                            "actualValue": f"{value} ({reason})",
+                            "location": f"Sample File {dataset_file_prefix} line {line}",
+                            "issueDesc": "Sample File values should match the Attribute DataType and Attribute Size"
+                        }
+                        sample_file_issues.append(issue)
+
+                for check in inspection.keys or []:
+                    columns = ', '.join(check.columns)
+                    key_name = f"Primary Key {columns}" if check.primary else f"Unique Attribute {columns}"
+                    for line, first, value in check.examples:
+                        issue = {
+                            "type": "ERROR",
+                            "issueValue": f"Sample File has duplicate values of the {key_name}",
+                            "expectedValue": f"Values of {columns} should be unique, {check.duplicates} of {check.checked} rows repeat {check.keys} values",
+                            "actualValue": f"{value} (first in line {first})",
+                            "location": f"Sample File {dataset_file_prefix} line {line}",
+                            "issueDesc": f"Sample File values of the {key_name} should be unique"
+                        }
+                        sample_file_issues.append(issue)
+
+                nullable = {column.name: column.nullable for column in schema or []}
+                checked = set()
+                for stats in inspection.stats or []:
+                    log.info("Sample File %s column %s has %s empty and %s null values of %s rows", dataset_file_prefix, stats.name, stats.empty, stats.nulls, stats.rows)
+                    if stats.name in checked:
+                        continue
+                    checked.add(stats.name)
+                    if nullable.get(stats.name, True) or not stats.missing():
+                        continue
+                    issue = {
+                        "type": "ERROR",
+                        "issueValue": f"Sample File has empty values of {stats.name} which is not nullable",
+                        "expectedValue": f"Values of {stats.name} should not be empty as the Attribute Nullability is No, {stats.missing()} of {stats.rows} rows ({stats.ratio()}) are empty or null",
+                        "actualValue": f"{stats.empty} empty and {stats.nulls} null values",
+                        "location": f"Sample File {dataset_file_prefix} line {stats.first}",
+                        "issueDesc": "Sample File values of an Attribute which is not nullable should not be empty"
+                    }
+                    sample_file_issues.append(issue)
+
+                scan = inspection.scan
+                if scan is not None:
+                    rows, lines = scan.offending(len(normalized_attributes))
+                    for line, fields in lines:
+                        sample_file_issues.append({
+                            "type": "ERROR",
+                            "issueValue": "Sample File row does not have a field for every Data Contract Attribute",
+                            "expectedValue": f"Every row should have {len(normalized_attributes)} fields, {rows} of {scan.rows} rows have another number of fields",
+                            "actualValue": f"{fields} fields",
+                            "location": f"Sample File {dataset_file_prefix} line {line}",
+                            "issueDesc": "A delimiter in a value which is not quoted or a missing value changes the number of fields of the row"
+                        })
+                    for line in scan.quoteLines:
+                        sample_file_issues.append({
+                            "type": "ERROR",
+                            "issueValue": "Sample File has a quote which is not escaped",
+                            "expectedValue": f"A value with a quote should be quoted and its quotes doubled, {scan.quotes} rows have a quote out of place",
+                            "actualValue": "Quote out of place",
+                            "location": f"Sample File {dataset_file_prefix} line {line}",
+                            "issueDesc": "A quote inside a value which is not quoted, text after a closing quote or a quote which is never closed"
+                        })
+                    if scan.mixedEndings():
+                        sample_file_issues.append({
+                            "type": "ERROR",
+                            "issueValue": "Sample File has mixed line endings",
+                            "expectedValue": "Every line of the Sample File should end the same way",
+                            "actualValue": scan.endings(),
+                            "location": f"Sample File {dataset_file_prefix}",
+                            "issueDesc": "Sample File has mixed line endings"
+                        })
+                    sample_file_stats.append({
+                        "type": "INFO",
+                        "issueValue": "Sample File Statistics",
+                        "expectedValue": f"{len(normalized_attributes)} fields in every row",
+                        "actualValue": f"{scan.rows} rows, {scan.describe() or 'no rows'}, {scan.endings()}",
+                        "location": f"Sample File {dataset_file_prefix}",
+                        "issueDesc": "Statistics of the Sample File"
+                    })
+
         except Exception as e:
             log.error("Error reading sample file", exc_info=True)
             issue = {
@@ -316,21 +398,18 @@ def parse_sample_file(dataset_name, entity_name, attributes, context, data_contr
             "Location": "Sample Files",
             "issues": sample_file_issues
         })
-
-
-def predict_encoding(file_path, n_lines=10):
-    with open(file_path, 'rb') as f:
-        rawdata = b''.join([f.readline() for _ in range(n_lines)])
-    return chardet.detect(rawdata)['encoding']
-
+    if sample_file_stats:
+        context['all_issues'].append({
+            "Location": "Sample File Statistics",
+            "issues": sample_file_stats
+        })
 
 
 
 
 def validate_attribute_primary_key(value, count, dfs, row_index, context):
-    location = findLoc(dfs, 'Attribute Primary Key', row_index)
     context.setdefault('primary_keys', []).append(value)
-    if str(value).lower() not in context['template']['attributeBool']:
+    if str(value).lower() not in context['template'].exact('attributeBool'):
         if str(value).lower() == 'nan':
             value = '*This field is mandatory'
         issue = {
@@ -338,7 +417,7 @@ def validate_attribute_primary_key(value, count, dfs, row_index, context):
             "issueValue": 'The issue in the Attribute Primary Key',
             "expectedValue": "Attribute Primary Key should be either Yes or No",
             "actualValue": value,
-            "location": location,
+            "location": context['locate']('Attribute Primary Key', row_index),
             "issueDesc": "NA is considered no value. Field is mandatory."
         }
         context.setdefault('attribute_primary_issues', []).append(issue)
@@ -351,7 +430,7 @@ def validate_attribute_primary_key(value, count, dfs, row_index, context):
                 "issueValue": 'Missing Primary Key for INSUPD',
                 "expectedValue": "Attribute Primary Key is mandatory for INSUPD",
                 "actualValue": value,
-                "location": location,
+                "location": context['locate']('Attribute Primary Key', row_index),
                 "issueDesc": "Attribute Primary Key must be set to YES for INSUPD ingestion."
             }
             context.setdefault('attribute_primary_logic_issues', []).append(issue)
@@ -370,7 +449,6 @@ def validate_attribute_primary_key(value, count, dfs, row_index, context):
             })
 
 def validate_dataset_classification(classification, count, dfs, row_index, attribute_classifications, context):
-    location = findLoc(dfs, 'Data Classification Type', row_index)
     context.setdefault('dataset_classification_values', []).append(classification)
 
     def classification_issue(msg):
@@ -379,11 +457,11 @@ def validate_dataset_classification(classification, count, dfs, row_index, attri
             "issueValue": 'The issue in the Classification.',
             "expectedValue": msg,
             "actualValue": classification,
-            "location": location,
+            "location": context['locate']('Data Classification Type', row_index),
             "issueDesc": "Classification should match expected values."
         }
 
-    if str(classification).lower() not in map(str.lower, context['template']['classification']):
+    if str(classification).lower() not in context['template'].lowered('classification'):
         context.setdefault('dataset_classification_issues', []).append(
             classification_issue("Classification should match template options")
         )
@@ -411,7 +489,6 @@ def validate_dataset_classification(classification, count, dfs, row_index, attri
 
         
 def validate_data_contract_type(contract_type, count, dfs, row_index, context):
-    location = findLoc(dfs, 'DataContract Type', row_index)
     if str(contract_type).lower() not in ['new', 'revised']:
         if str(contract_type).lower() == 'nan':
             contract_type = '*This field is mandatory'
@@ -420,7 +497,7 @@ def validate_data_contract_type(contract_type, count, dfs, row_index, context):
             "issueValue": 'The issue in the Split Logic',
             "expectedValue": "Data Contract Type should be New or Revised",
             "actualValue": contract_type,
-            "location": location,
+            "location": context['locate']('DataContract Type', row_index),
             "issueDesc": "Data Contract Type is mandatory and should be New or Revised"
         }
         context.setdefault('data_contract_type_issues', []).append(issue)
@@ -433,17 +510,16 @@ def validate_data_contract_type(contract_type, count, dfs, row_index, context):
         })
 
 def validate_frequency(frequency, count, dfs, column_name, row_index, context):
-    location = findLoc(dfs, column_name, row_index)
-    if str(frequency).lower() not in map(lambda x: x.lower(), context['template']['frequency']):
+    if str(frequency).lower() not in context['template'].lowered('frequency'):
         if str(frequency).lower() == 'nan':
             frequency = '*This field is mandatory'
             issue = {
                 "type": "ERROR",
                 "issueValue": f'The issue in the {column_name}',
-                "expectedValue": f"{column_name} should be {context['template']['frequency']}",
+                "expectedValue": f"{column_name} should be {context['template'].text('frequency')}",
                 "actualValue": frequency,
-                "location": location,
-                "issueDesc": f"{column_name} is mandatory and should be {context['template']['frequency']}"
+                "location": context['locate'](column_name, row_index),
+                "issueDesc": f"{column_name} is mandatory and should be {context['template'].text('frequency')}"
             }
             context['frequency_issues'].append(issue)
             log.error(issue['issueValue'], extra=issue)
@@ -456,15 +532,14 @@ def validate_frequency(frequency, count, dfs, column_name, row_index, context):
             })
 
 def validate_connectivity_option(connectivity, count, dfs, row_index, context):
-    location = findLoc(dfs, 'Connectivity Option', row_index)
-    if str(connectivity).lower() not in map(str.lower, context['template']['connectivity']):
+    if str(connectivity).lower() not in context['template'].lowered('connectivity'):
         if str(connectivity).lower() != 'nan':
             issue = {
                 "type": "ERROR",
                 "issueValue": 'The issue in the Connectivity Option.',
-                "expectedValue": f"Connectivity should match with {listToComma(context['template']['connectivity'])}",
+                "expectedValue": f"Connectivity should match with {context['template'].comma('connectivity')}",
                 "actualValue": connectivity,
-                "location": location,
+                "location": context['locate']('Connectivity Option', row_index),
                 "issueDesc": "Connectivity should match expected values."
             }
             context.setdefault('connectivity_option_issues', []).append(issue)
@@ -477,18 +552,17 @@ def validate_connectivity_option(connectivity, count, dfs, row_index, context):
         })
 
 def validate_connectivity_description(description, count, dfs, row_index, context):
-    location = findLoc(dfs, 'Description for Connectivity', row_index)
     context.setdefault('connectivity_descriptions', []).append(description)
-    if str(description).lower() not in map(str.lower, context['template']['connectivityDesc']):
+    if str(description).lower() not in context['template'].lowered('connectivityDesc'):
         if str(description).lower() == 'nan':
             if any(str(x).lower() != 'nan' for x in context['connectivity_descriptions']):
                 return
         issue = {
             "type": "ERROR",
             "issueValue": 'The issue in the Connectivity Description.',
-            "expectedValue": f"Connectivity Description should match with {listToComma(context['template']['connectivityDesc'])}",
+            "expectedValue": f"Connectivity Description should match with {context['template'].comma('connectivityDesc')}",
             "actualValue": description,
-            "location": location,
+            "location": context['locate']('Description for Connectivity', row_index),
             "issueDesc": "Connectivity Description should match expected values."
         }
         context.setdefault('connectivity_desc_issues', []).append(issue)
@@ -501,7 +575,6 @@ def validate_connectivity_description(description, count, dfs, row_index, contex
         })
 
 def validate_delimiter(delimiter, other_value, count, dfs, row_index, context):
-    location = findLoc(dfs, 'Attribute Delimiter', row_index)
     context.setdefault('delimiters', []).append(delimiter)
     if any(str(d).lower() != 'nan' for d in context['delimiters']):
         if str(delimiter) != 'nan':
@@ -516,7 +589,7 @@ def validate_delimiter(delimiter, other_value, count, dfs, row_index, context):
                 "issueValue": 'The issue in the Delimiter.',
                 "expectedValue": "Delimiter is mandatory. Merge if needed.",
                 "actualValue": delimiter,
-                "location": location,
+                "location": context['locate']('Attribute Delimiter', row_index),
                 "issueDesc": "Delimiter column must be merged for the dataset."
             }
             context.setdefault('delimiter_issues_merge', []).append(issue)
@@ -529,8 +602,7 @@ def validate_delimiter(delimiter, other_value, count, dfs, row_index, context):
         })
 
 def validate_attribute_classification(classification, count, dfs, row_index, context):
-    location = findLoc(dfs, 'Attribute Classification', row_index)
-    if str(classification).lower() not in context['template']['classification']:
+    if str(classification).lower() not in context['template'].exact('classification'):
         if str(classification).lower() == 'nan':
             classification = '*This field is mandatory'
         issue = {
@@ -538,7 +610,7 @@ def validate_attribute_classification(classification, count, dfs, row_index, con
             "issueValue": 'The issue in the Attribute Classification',
             "expectedValue": "Attribute Classification should be either Open, Confidential, Sensitive",
             "actualValue": classification,
-            "location": location,
+            "location": context['locate']('Attribute Classification', row_index),
             "issueDesc": "Mandatory field. NA is considered empty."
         }
         context.setdefault('attribute_classification_issues', []).append(issue)
@@ -551,7 +623,6 @@ def validate_attribute_classification(classification, count, dfs, row_index, con
         })
 
 def validate_service(service, count, dfs, row_index, context):
-    location = findLoc(dfs, 'Service', row_index)
     context.setdefault('services', []).append(service)
     if not any(str(s).lower() != 'nan' for s in context['services']):
         if str(service).lower() == 'nan':
@@ -560,7 +631,7 @@ def validate_service(service, count, dfs, row_index, context):
                 "issueValue": 'The issue in the Service.',
                 "expectedValue": "Service is mandatory. Merge service columns if needed.",
                 "actualValue": service,
-                "location": location,
+                "location": context['locate']('Service', row_index),
                 "issueDesc": "Service column should be merged and contain a valid value."
             }
             context.setdefault('service_issues_merge', []).append(issue)
@@ -573,7 +644,6 @@ def validate_service(service, count, dfs, row_index, context):
         })
 
 def validate_category(category, count, dfs, row_index, context):
-    location = findLoc(dfs, 'Category', row_index)
     context.setdefault('categories', []).append(category)
     if not any(str(c).lower() != 'nan' for c in context['categories']):
         if str(category).lower() == 'nan':
@@ -582,7 +652,7 @@ def validate_category(category, count, dfs, row_index, context):
                 "issueValue": 'The issue in the Category.',
                 "expectedValue": "Category is mandatory. Merge category columns if needed.",
                 "actualValue": category,
-                "location": location,
+                "location": context['locate']('Category', row_index),
                 "issueDesc": "Category column should be merged and contain a valid value."
             }
             context.setdefault('category_issues_merge', []).append(issue)
@@ -595,7 +665,6 @@ def validate_category(category, count, dfs, row_index, context):
         })
 
 def validate_entity(entity, count, dfs, row_index, context):
-    location = findLoc(dfs, 'Entity', row_index)
     context.setdefault('entities', []).append(entity)
     if not any(str(e).lower() != 'nan' for e in context['entities']):
         if str(entity).lower() == 'nan':
@@ -604,7 +673,7 @@ def validate_entity(entity, count, dfs, row_index, context):
                 "issueValue": 'The issue in the Entity.',
                 "expectedValue": "Entity is mandatory. Merge entity columns if needed.",
                 "actualValue": entity,
-                "location": location,
+                "location": context['locate']('Entity', row_index),
                 "issueDesc": "Entity column should be merged and contain a valid value."
             }
             context.setdefault('entity_issues_merge', []).append(issue)
@@ -617,16 +686,15 @@ def validate_entity(entity, count, dfs, row_index, context):
         })
 
 def validate_data_type(data_type, count, dfs, row_index, context):
-    location = findLoc(dfs, 'Attribute DataType', row_index)
-    if str(data_type).lower() not in context['template']['dataTypes']:
+    if str(data_type).lower() not in context['template'].exact('dataTypes'):
         if str(data_type).lower() == 'nan':
             data_type = '*This field is mandatory'
         issue = {
             "type": "ERROR",
             "issueValue": 'The issue in the Data Type',
-            "expectedValue": "Data Type should match with " + listToComma(context['template']['dataTypes']),
+            "expectedValue": "Data Type should match with " + context['template'].comma('dataTypes'),
             "actualValue": data_type,
-            "location": location,
+            "location": context['locate']('Attribute DataType', row_index),
             "issueDesc": "Data Type should match expected values. Don't include (size); use the size column."
         }
         context.setdefault('data_type_issues', []).append(issue)
@@ -639,29 +707,28 @@ def validate_data_type(data_type, count, dfs, row_index, context):
         })
 
 def validate_data_type_size(data_type_size, data_type, count, dfs, row_index, context):
-    location = findLoc(dfs, 'Attribute Size', row_index)
     if str(data_type_size).lower() == 'nan':
-        if re.match("date|time", str(data_type).lower()) or str(data_type).lower() in context['template']['numberDataTypeSize']:
+        if DATE_TIME_PATTERN.match(str(data_type).lower()) or str(data_type).lower() in context['template'].exact('numberDataTypeSize'):
             return
         issue = {
             "type": "ERROR",
             "issueValue": 'The issue in the Data Type Size',
             "expectedValue": f"Size should be available for {data_type} (except date/time)",
             "actualValue": '*This field is mandatory',
-            "location": location,
+            "location": context['locate']('Attribute Size', row_index),
             "issueDesc": "Size is mandatory for non-date/time types."
         }
         context.setdefault('data_type_size_issues', []).append(issue)
         log.error(issue['issueValue'], extra=issue)
     else:
         size = str(data_type_size).split('.')[0]
-        if not re.match("^[0-9,]*$", size):
+        if not SIZE_PATTERN.match(size):
             issue = {
                 "type": "ERROR",
                 "issueValue": 'The issue in the Data Type Size',
                 "expectedValue": f"Only numbers and comma allowed for {data_type}",
                 "actualValue": data_type_size,
-                "location": location,
+                "location": context['locate']('Attribute Size', row_index),
                 "issueDesc": "Size must be numeric or comma-separated (for floats)."
             }
             context.setdefault('data_type_size_issues', []).append(issue)
@@ -672,7 +739,7 @@ def validate_data_type_size(data_type_size, data_type, count, dfs, row_index, co
                 "issueValue": 'The issue in the Data Type Size',
                 "expectedValue": "Precision cannot be zero(0)",
                 "actualValue": size,
-                "location": location,
+                "location": context['locate']('Attribute Size', row_index),
                 "issueDesc": "Precision should be greater than zero."
             }
             context.setdefault('data_type_size_issues', []).append(issue)
@@ -685,15 +752,14 @@ def validate_data_type_size(data_type_size, data_type, count, dfs, row_index, co
         })
 
 def validate_date_format(attribute_range, data_type, count, dfs, row_index, context):
-    location = findLoc(dfs, 'Attribute Range of Values', row_index)
-    if re.match("date|time", str(data_type).lower()):
-        if str(attribute_range).lower() == 'nan' or str(attribute_range).upper() not in context['template']['dateformat']:
+    if DATE_TIME_PATTERN.match(str(data_type).lower()):
+        if str(attribute_range).lower() == 'nan' or str(attribute_range).upper() not in context['template'].exact('dateformat'):
             issue = {
                 "type": "ERROR",
                 "issueValue": 'The issue in the Date/Time Format',
                 "expectedValue": "Date/Time Format should be one of UDF_TO_DATETIME valid formats.",
                 "actualValue": attribute_range,
-                "location": location,
+                "location": context['locate']('Attribute Range of Values', row_index),
                 "issueDesc": "Date/Time Format not matching valid formats."
             }
             context.setdefault('date_format_issues', []).append(issue)
@@ -706,14 +772,13 @@ def validate_date_format(attribute_range, data_type, count, dfs, row_index, cont
         })
 
 def validate_attribute(attribute, count, dfs, row_index, context):
-    location = findLoc(dfs, 'Attribute', row_index)
-    if not re.match("^[a-zA-Z0-9_ ]*$", str(attribute)):
+    if not NAME_PATTERN.match(str(attribute)):
         issue = {
             "type": "ERROR",
             "issueValue": 'The issue exists in the Attribute Name',
             "expectedValue": "Special Characters are not allowed like ( ) % $ ^. Allowed characters are 0-9, a-z, A-Z and underscore.",
             "actualValue": attribute,
-            "location": location,
+            "location": context['locate']('Attribute', row_index),
             "issueDesc": "Attribute names must only include alphanumeric characters, spaces, or underscores."
         }
         context['attribute_issues'].append(issue)
@@ -729,7 +794,6 @@ def validate_attribute(attribute, count, dfs, row_index, context):
 def validate_encoding(encoding, count, dfs, row_index, context):
     context['encoding_values'] = context.get('encoding_values', [])
     context['encoding_values'].append(encoding)
-    location = findLoc(dfs, 'Code Page', row_index)
     if all(str(x).lower() == 'nan' for x in context['encoding_values']):
         if str(encoding).lower() != 'utf-8':
             if str(encoding).lower() == 'nan':
@@ -738,7 +802,7 @@ def validate_encoding(encoding, count, dfs, row_index, context):
                     "issueValue": 'The issue in the Encoding.',
                     "expectedValue": "Encoding is mandatory. If encoding exists in separate column, merge the encoding columns",
                     "actualValue": encoding,
-                    "location": location,
+                    "location": context['locate']('Code Page', row_index),
                     "issueDesc": "Encoding Column should be merged for the Dataset, it should be a single value."
                 }
             else:
@@ -747,7 +811,7 @@ def validate_encoding(encoding, count, dfs, row_index, context):
                     "issueValue": 'The issue in the Encoding.',
                     "expectedValue": "Encoding should be UTF-8",
                     "actualValue": encoding,
-                    "location": location,
+                    "location": context['locate']('Code Page', row_index),
                     "issueDesc": "Code Page Column should be UTF-8 without Spaces."
                 }
             context['encoding_issues'].append(issue)
@@ -761,16 +825,15 @@ def validate_encoding(encoding, count, dfs, row_index, context):
             })
 
 def validate_format(format_value, count, dfs, row_index, context):
-    location = findLoc(dfs, 'Format (MIME)', row_index)
-    if str(format_value).lower() not in map(lambda x: x.lower(), context['template']['format']):
+    if str(format_value).lower() not in context['template'].lowered('format'):
         if str(format_value).lower() == 'nan':
             format_value = '*This field is mandatory'
         issue = {
             "type": "ERROR",
             "issueValue": 'The issue in the Format',
-            "expectedValue": "Format should have one of values:" + listToComma(context['template']['format']),
+            "expectedValue": "Format should have one of values:" + context['template'].comma('format'),
             "actualValue": format_value,
-            "location": location,
+            "location": context['locate']('Format (MIME)', row_index),
             "issueDesc": "NA will be considered as no value for mandatory field, and it is mandatory to fill the Format."
         }
         context['format_issues'].append(issue)
@@ -784,17 +847,16 @@ def validate_format(format_value, count, dfs, row_index, context):
             })
 
 def validate_split_logic(split_logic, count, dfs, row_index, context):
-    location = findLoc(dfs, 'Split Logic', row_index)
-    if str(split_logic).lower() not in map(str.lower, context['template']['splitLogic']):
+    if str(split_logic).lower() not in context['template'].lowered('splitLogic'):
         if str(split_logic).lower() == 'nan':
             split_logic = '*This field is mandatory'
         issue = {
             "type": "ERROR",
             "issueValue": 'The issue in the Split Logic',
-            "expectedValue": f"Split Logic should be {context['template']['splitLogic']}",
+            "expectedValue": f"Split Logic should be {context['template'].text('splitLogic')}",
             "actualValue": split_logic,
-            "location": location,
-            "issueDesc": f"Split Logic is mandatory and should be {context['template']['splitLogic']}"
+            "location": context['locate']('Split Logic', row_index),
+            "issueDesc": f"Split Logic is mandatory and should be {context['template'].text('splitLogic')}"
         }
         context.setdefault('split_logic_issues', []).append(issue)
         log.error(issue['issueValue'], extra=issue)
@@ -806,18 +868,17 @@ def validate_split_logic(split_logic, count, dfs, row_index, context):
         })
 
 def validate_ingestion_type(ingestion_type, count, dfs, row_index, context):
-    location = findLoc(dfs, 'Ingestion Logic', row_index)
     context.setdefault('ingestion_type_values', []).append(ingestion_type)
-    if str(ingestion_type).lower() not in map(str.lower, context['template']['ingestionType']):
+    if str(ingestion_type).lower() not in context['template'].lowered('ingestionType'):
         if str(ingestion_type).lower() == 'nan':
             if any(str(x).lower() != 'nan' for x in context['ingestion_type_values']):
                 return
         issue = {
             "type": "ERROR",
             "issueValue": 'The issue in the Ingestion Type',
-            "expectedValue": f"Ingestion Type should match with {listToComma(context['template']['ingestionType'])}",
+            "expectedValue": f"Ingestion Type should match with {context['template'].comma('ingestionType')}",
             "actualValue": ingestion_type,
-            "location": location,
+            "location": context['locate']('Ingestion Logic', row_index),
             "issueDesc": "Ingestion Type should match one of the allowed values."
         }
         context.setdefault('ingestion_issues', []).append(issue)
@@ -830,8 +891,7 @@ def validate_ingestion_type(ingestion_type, count, dfs, row_index, context):
         })
 
 def validate_attribute_nullability(value, count, dfs, row_index, context):
-    location = findLoc(dfs, 'Attribute Nullability', row_index)
-    if str(value).lower() not in context['template']['attributeBool']:
+    if str(value).lower() not in context['template'].exact('attributeBool'):
         if str(value).lower() == 'nan':
             value = '*This field is mandatory'
         issue = {
@@ -839,7 +899,7 @@ def validate_attribute_nullability(value, count, dfs, row_index, context):
             "issueValue": 'The issue in the Attribute Nullability',
             "expectedValue": "Attribute Nullability should be either Yes or No",
             "actualValue": value,
-            "location": location,
+            "location": context['locate']('Attribute Nullability', row_index),
             "issueDesc": "NA is considered no value. Field is mandatory."
         }
         context.setdefault('attribute_nullability_issues', []).append(issue)
@@ -852,8 +912,7 @@ def validate_attribute_nullability(value, count, dfs, row_index, context):
         })
 
 def validate_attribute_uniqueness(value, count, dfs, row_index, context):
-    location = findLoc(dfs, 'Attribute Uniqueness', row_index)
-    if str(value).lower() not in context['template']['attributeBool']:
+    if str(value).lower() not in context['template'].exact('attributeBool'):
         if str(value).lower() == 'nan':
             value = '*This field is mandatory'
         issue = {
@@ -861,7 +920,7 @@ def validate_attribute_uniqueness(value, count, dfs, row_index, context):
             "issueValue": 'The issue in the Attribute Uniqueness',
             "expectedValue": "Attribute Uniqueness should be either Yes or No",
             "actualValue": value,
-            "location": location,
+            "location": context['locate']('Attribute Uniqueness', row_index),
             "issueDesc": "NA is considered no value. Field is mandatory."
         }
         context.setdefault('attribute_uniqueness_issues', []).append(issue)
@@ -874,14 +933,13 @@ def validate_attribute_uniqueness(value, count, dfs, row_index, context):
         })
 
 def validate_language(language, count, dfs, row_index, context):
-    location = findLoc(dfs, 'Language', row_index)
-    if str(language).lower() not in context['template']['language'] and str(language).lower() != 'nan':
+    if str(language).lower() not in context['template'].exact('language') and str(language).lower() != 'nan':
         issue = {
             "type": "ERROR",
             "issueValue": 'The issue in the Language',
             "expectedValue": "Language should be either English, Arabic, Mix or Other",
             "actualValue": language,
-            "location": location,
+            "location": context['locate']('Language', row_index),
             "issueDesc": "Language should be either English, Arabic, Mix or Other. NA is considered no value."
         }
         context.setdefault('language_issues', []).append(issue)
@@ -934,11 +992,11 @@ def generate_report(file, context):
 def main():
     args = read_input_args()
     context = initialize_context()
-    context['connection'], context['cursor'] = connect_to_postgres(
-        args.psql_db, args.psql_user, args.psql_password, args.psql_host, args.psql_port
+    context['sample_options'] = SampleOptions(args.sample_rows, args.sample_utf8, args.encoding_bytes, args.sample_profile, args.sample_keys, args.key_memory << 20, args.sample_nulls)
+    context['resolver'] = entityResolver(
+        args.psql_db, args.psql_user, args.psql_password, args.psql_host, args.psql_port,
+        offline=args.offline, ttl=args.entity_ttl
     )
-    if not context['connection']:
-        sys.exit(1)
 
     
     process_file(args.file, args.dir, context)
@@ -0,0 +1,168 @@
+'''
+	Result Cache
+	Desc : The issues and the report of a Data Contract are kept under a fingerprint of everything the result depends
+		   on: the workbook, the Sample Files by their size and modification time, the template, the Entity snapshot,
+		   the source of the checker and the Sample File options. A rerun on the same inputs restores the files instead
+		   of validating again. The results are trimmed by age and size after every write.
+'''
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+
+from configuration import log, CODES_DIR
+from sample_index import sampleIndex
+
+RESULT_CACHE_DEFAULT_PATH = os.path.join(CODES_DIR, 'cache', 'results')
+#Changed when the files kept for a result change
+RESULT_FORMAT = '1'
+HASH_CHUNK = 1 << 20
+RESULT_MAX_BYTES = 256 * 1024 * 1024
+RESULT_MAX_AGE = 30 * 24 * 60 * 60
+RESULT_STALE_TEMPORARY = 60 * 60
+
+
+def _digestFile(digest, path):
+	with open(path, 'rb') as handle:
+		for chunk in iter(lambda: handle.read(HASH_CHUNK), b''):
+			digest.update(chunk)
+
+def _digestText(digest, text):
+	digest.update(text.encode('utf-8'))
+	digest.update(b'\x00')
+
+
+'''
+	Use : Checker Version
+	@Params : sources - Directory with the source of the checker
+	returns : sha256 of the Python files of the checker
+'''
+def sourceVersion(sources):
+	digest = hashlib.sha256()
+	for name in sorted(os.listdir(sources)):
+		if name.endswith('.py'):
+			_digestText(digest, name)
+			_digestFile(digest, os.path.join(sources, name))
+	return digest.hexdigest()
+
+
+'''
+	Use : Result Fingerprint
+	@Params : file - Data Contract File Name, it is part of the issues and of the report name
+			  data_contract - Data Contract Directory
+			  template - Compiled Template
+			  entity - Entity of the Data Contract and the version of the Entity snapshot
+			  sources - Directory with the source of the checker
+			  options - Key of the options which change the issues
+	returns : Fingerprint
+'''
+def resultKey(file, data_contract, template, entity, sources, options=''):
+	digest = hashlib.sha256()
+	_digestText(digest, RESULT_FORMAT)
+	_digestText(digest, file)
+	_digestFile(digest, os.path.join(data_contract, file))
+	_digestText(digest, template.version)
+	for value in entity:
+		_digestText(digest, str(value))
+	#The Sample Files by their stat from the Sample Index, a Sample File of some GB is not read for the fingerprint
+	samples = sampleIndex(os.path.join(data_contract, 'sampleFiles'))
+	for stem in sorted(samples or ()):
+		sample = samples[stem]
+		_digestText(digest, '%s %s %s' % (sample.name, sample.size, sample.mtime))
+	_digestText(digest, sourceVersion(sources))
+	_digestText(digest, options)
+	return digest.hexdigest()
+
+
+'''
+	Use : Restore Result
+	Desc : Copy the files kept for the fingerprint to their place. A file that the run did not write, like
+		   checkIssue.txt of a Data Contract without issues, is not restored either.
+	@Params : key - Fingerprint
+			  outputs - Dictionary of the name of the file and the path it is written to
+	returns : True if the result was restored
+'''
+def restoreResult(key, outputs, directory=RESULT_CACHE_DEFAULT_PATH):
+	cached = os.path.join(directory, key)
+	if not os.path.isdir(cached):
+		return False
+	try:
+		for name, path in outputs.items():
+			source = os.path.join(cached, name)
+			if os.path.exists(source):
+				shutil.copyfile(source, path)
+		os.utime(cached) #Last use, for the eviction
+		log.info('Result restored from the cache: %s', cached)
+		return True
+	except OSError:
+		log.error('Error in restoring the result from the cache', exc_info=True)
+		return False
+
+
+'''
+	Use : Store Result
+	Desc : Keep the files written by the run. The files are copied to a temporary directory which is renamed, a run
+		   at the same time sees the whole result or no result.
+	@Params : key - Fingerprint
+			  outputs - Dictionary of the name of the file and the path it was written to
+'''
+def storeResult(key, outputs, directory=RESULT_CACHE_DEFAULT_PATH):
+	try:
+		os.makedirs(directory, exist_ok=True)
+		temporary = tempfile.mkdtemp(dir=directory, prefix=key, suffix='.tmp')
+		try:
+			for name, path in outputs.items():
+				shutil.copyfile(path, os.path.join(temporary, name))
+			os.replace(temporary, os.path.join(directory, key))
+		except OSError:
+			#Stored by another run in the meantime
+			if not os.path.isdir(os.path.join(directory, key)):
+				raise
+		finally:
+			shutil.rmtree(temporary, ignore_errors=True)
+		evictResults(directory)
+	except OSError:
+		log.error('Error in storing the result in the cache', exc_info=True)
+
+
+def _resultSize(path):
+	size = 0
+	for entry in os.scandir(path):
+		try:
+			size += entry.stat().st_size
+		except OSError:
+			pass
+	return size
+
+'''
+	Use : Evict Results
+	Desc : Remove the results older than maxAge, then the least recently used results until the cache fits in
+		   maxBytes. A result removed or in use by another run is skipped.
+	@Params : directory - Cache Directory
+			  maxBytes - Size of the cache
+			  maxAge - Seconds a result is kept after its last use
+'''
+def evictResults(directory=RESULT_CACHE_DEFAULT_PATH, maxBytes=RESULT_MAX_BYTES, maxAge=RESULT_MAX_AGE):
+	entries = []
+	now = time.time()
+	for entry in os.scandir(directory):
+		try:
+			if not entry.is_dir():
+				continue
+			modified = entry.stat().st_mtime
+			#Temporary directory left by a run which stopped while writing
+			if entry.name.endswith('.tmp'):
+				if now - modified > RESULT_STALE_TEMPORARY:
+					shutil.rmtree(entry.path, ignore_errors=True)
+				continue
+			entries.append((modified, _resultSize(entry.path), entry.path))
+		except OSError:
+			continue
+	entries.sort()
+	total = sum(size for _, size, _ in entries)
+	for modified, size, path in entries:
+		if now - modified <= maxAge and total <= maxBytes:
+			break
+		shutil.rmtree(path, ignore_errors=True)
+		total -= size
@@ -0,0 +1,82 @@
+'''
+	Sample Index
+	Desc : Index of the sampleFiles directory of a Data Contract, built once with os.scandir and shared by all the
+		   Datasets. The Sample Files are keyed by their name without the extension, so a name with dots like
+		   ENT_Dataset.v2.csv is kept as ENT_Dataset.v2. The index is built again when the modification time of the
+		   directory changes, which is when a file is added, removed or renamed. A file rewritten in place doesn't
+		   change the directory, the files of the index are stat again once per Data Contract run with refresh.
+'''
+import os
+import stat
+
+#Index of every directory, {directory : (modification time, entries)}
+INDEXES = {}
+
+
+'''
+	Use : Sample File Entry
+	Desc : name - File Name, stem - Name without the extension, extension - Extension without the dot,
+		   path - Path of the file, size and mtime - Size and modification time in nanoseconds from the scan
+'''
+class SampleEntry(object):
+
+	__slots__ = ('name', 'stem', 'extension', 'path', 'size', 'mtime')
+
+	def __init__(self, entry):
+		stem, extension = os.path.splitext(entry.name)
+		info = entry.stat()
+		self.name = entry.name
+		self.stem = stem
+		self.extension = extension[1:]
+		self.path = entry.path
+		self.size = info.st_size
+		self.mtime = info.st_mtime_ns
+
+	#Size and modification time of the file now, False if the file can't be stat
+	def restat(self):
+		try:
+			info = os.stat(self.path)
+		except OSError:
+			return False
+		self.size = info.st_size
+		self.mtime = info.st_mtime_ns
+		return True
+
+
+def _scan(directory):
+	entries = {}
+	with os.scandir(directory) as scan:
+		#A Dataset with more than one Sample File uses the first one in name order
+		for entry in sorted(scan, key=lambda entry: entry.name):
+			try:
+				if entry.is_file():
+					sample = SampleEntry(entry)
+					entries.setdefault(sample.stem, sample)
+			except OSError:
+				#Removed while scanning
+				continue
+	return entries
+
+
+'''
+	Use : Sample Index
+	@Params : directory - sampleFiles directory of the Data Contract
+			  refresh - Stat the indexed files again, once at the start of the run of a Data Contract
+	returns : Dictionary of the stem and the SampleEntry of every Sample File, None if the directory doesn't exist
+'''
+def sampleIndex(directory, refresh=False):
+	directory = os.path.normpath(directory)
+	try:
+		info = os.stat(directory)
+	except OSError:
+		info = None
+	if info is None or not stat.S_ISDIR(info.st_mode):
+		INDEXES.pop(directory, None)
+		return None
+	mtime = info.st_mtime_ns
+	cached = INDEXES.get(directory)
+	if cached is not None and cached[0] == mtime and (not refresh or all(sample.restat() for sample in cached[1].values())):
+		return cached[1]
+	entries = _scan(directory)
+	INDEXES[directory] = (mtime, entries)
+	return entries
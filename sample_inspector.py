@@ -0,0 +1,181 @@
+'''
+	Sample Inspector
+	Desc : Opens a Sample File once and memory maps it. The encoding, the delimiter, the header and, with --sample-rows,
+		   the row count and the field count consistency are all found from the same buffer, only the pages which are
+		   read are loaded. The result is one SampleInspection record, the issues of the Sample File are built from it.
+		   With --sample-profile the values are checked against the Data Contract by the Sample Profiler, with
+		   --sample-keys the Primary Key and the Unique Attributes by the Key Verifier, with --sample-nulls the empty
+		   and null values of every column are counted, or read from the cache of the Sample Statistics. All of them
+		   take the batches of one read of the values.
+'''
+import json
+import mmap
+
+from configuration import log
+from delimiter_detector import prefixText, scoreDelimiters, delimiterOf, DETECT_BYTES, DETECT_LINES
+from encoding_detector import detectEncoding, ENCODING_BYTES
+from sample_reader import bufferLines, readHeader, scanRows
+from sample_profiler import SampleProfiler, sampleBatches
+from key_verifier import KeyVerifier, KEY_MEMORY
+from sample_stats import SampleStats
+
+#Extensions of the Sample Files with a delimiter and a header
+DELIMITED_EXTENSIONS = ('csv', 'txt')
+
+
+'''
+	Use : Sample File Inspection
+	Desc : encoding - Encoding found from the first bytes
+		   delimiter, confidence, fields - Delimiter of the file, share of the lines it splits in fields fields
+		   header - Column names of the first record
+		   rows, ragged - Records after the header and records with another number of fields than the header, only
+						  with a full read
+		   scan - SampleScan of the rows, only with a full read
+		   profile - ColumnProfile of the declared columns, only with --sample-profile
+		   keys - KeyCheck of the Primary Key and the Unique Attributes, only with --sample-keys
+		   stats - ColumnStats of every column of the header, only with --sample-nulls
+		   error - Exception raised while reading the delimiter or the header, the encoding is still known
+'''
+class SampleInspection(object):
+
+	__slots__ = ('path', 'encoding', 'delimiter', 'confidence', 'fields', 'header', 'rows', 'ragged', 'scan', 'profile', 'keys', 'stats', 'error')
+
+	def __init__(self, path):
+		self.path = path
+		self.encoding = None
+		self.delimiter = None
+		self.confidence = None
+		self.fields = None
+		self.header = None
+		self.rows = None
+		self.ragged = None
+		self.scan = None
+		self.profile = None
+		self.keys = None
+		self.stats = None
+		self.error = None
+
+
+'''
+	Use : Sample File Options
+	Desc : rows - Scan every record for the row count, the field counts, the quotes and the line endings, --sample-rows
+		   validate - Validate the whole file as UTF-8, --sample-utf8
+		   encodingBytes - Bytes used to find the encoding, --encoding-bytes
+		   profile - Check the values against the Data Contract, --sample-profile
+		   keys - Check the Primary Key and the Unique Attributes for duplicates, --sample-keys
+		   keyMemory - Memory in bytes of the key hashes before they are spilled to disk, --key-memory
+		   nulls - Count the empty and null values of every column, --sample-nulls
+'''
+class SampleOptions(object):
+
+	__slots__ = ('rows', 'validate', 'encodingBytes', 'profile', 'keys', 'keyMemory', 'nulls')
+
+	def __init__(self, rows=False, validate=False, encodingBytes=ENCODING_BYTES, profile=False, keys=False, keyMemory=KEY_MEMORY, nulls=False):
+		self.rows = rows
+		self.validate = validate
+		self.encodingBytes = encodingBytes
+		self.profile = profile
+		self.keys = keys
+		self.keyMemory = keyMemory
+		self.nulls = nulls
+
+	#Schema of the Dataset is only needed by the checks of the values
+	def schema(self):
+		return self.profile or self.keys or self.nulls
+
+	#Part of the fingerprint of the cached issues, the options change the issues. The memory of the keys doesn't.
+	def key(self):
+		return json.dumps([self.rows, self.validate, self.encodingBytes, self.profile, self.keys, self.nulls])
+
+SAMPLE_DEFAULTS = SampleOptions()
+
+
+'''
+	Use : Read Sample Values
+	Desc : One read of the values of the Sample File for all the readers, every batch goes to every reader. A reader
+		   which fails is logged and dropped, the other readers go on.
+	@Params : path - Sample File Path, for the log
+			  buffer - Memory map of the Sample File
+			  delimiter - Delimiter of the Sample File
+			  header - Header of the Sample File
+			  readers - {name : reader}, a reader has the positions it reads in used and takes a batch in add
+	returns : Names of the readers which read every batch
+'''
+def _readValues(path, buffer, delimiter, header, readers):
+	readers = dict(readers)
+	used = set().union(*(reader.used for reader in readers.values()))
+	if not used:
+		#Nothing of the Sample File is declared for the readers
+		return set(readers)
+	for chunk in sampleBatches(buffer, delimiter, used, len(header)):
+		for name, reader in list(readers.items()):
+			try:
+				reader.add(chunk)
+			except Exception:
+				log.error('Error in the %s of the Sample File %s', name, path, exc_info=True)
+				del readers[name]
+	return set(readers)
+
+
+'''
+	Use : Inspect Sample File
+	@Params : path - Sample File Path
+			  declared - Attribute Delimiter of the Data Contract
+			  delimited - Find the delimiter and the header, False for the Sample Files without a header like kml
+			  options - Sample File Options
+			  schema - SampleColumn of every Attribute of the Dataset, for --sample-profile and --sample-keys
+	returns : SampleInspection
+'''
+def inspectSample(path, declared=None, delimited=True, options=SAMPLE_DEFAULTS, schema=None):
+	inspection = SampleInspection(path)
+	with open(path, 'rb') as handle:
+		try:
+			buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+		except ValueError:
+			#An empty file can't be memory mapped
+			buffer = b''
+		try:
+			inspection.encoding = detectEncoding(buffer, options.encodingBytes, options.validate)
+			if not delimited:
+				return inspection
+			try:
+				inspection.delimiter, inspection.confidence, inspection.fields = scoreDelimiters(prefixText(buffer, DETECT_BYTES), delimiterOf(declared), DETECT_LINES)
+				inspection.header = readHeader(bufferLines(buffer), inspection.delimiter)
+				if options.rows:
+					#The encoding is reported on its own, a byte which is not UTF-8 doesn't stop the scan
+					inspection.scan = scanRows(buffer, inspection.delimiter)
+					inspection.rows = inspection.scan.rows
+					inspection.ragged = inspection.scan.offending(inspection.scan.header)[0]
+			except Exception as e:
+				inspection.error = e
+				return inspection
+			readers = {}
+			try:
+				try:
+					if options.profile and schema:
+						readers['profile'] = SampleProfiler(inspection.header, schema)
+					if options.keys and schema:
+						readers['key check'] = KeyVerifier(inspection.header, schema, options.keyMemory)
+					if options.nulls:
+						readers['null count'] = SampleStats(path, inspection.delimiter, inspection.header)
+					#The other checks of the Sample File are still reported
+					read = _readValues(path, buffer, inspection.delimiter, inspection.header, readers)
+				except Exception:
+					log.error('Error in reading the values of the Sample File %s', path, exc_info=True)
+					read = set()
+				if 'profile' in read:
+					inspection.profile = readers['profile'].result()
+				if 'null count' in read:
+					inspection.stats = readers['null count'].result()
+				if 'key check' in read:
+					try:
+						inspection.keys = readers['key check'].result(buffer, inspection.delimiter, len(inspection.header))
+					except Exception:
+						log.error('Error in verifying the keys of the Sample File %s', path, exc_info=True)
+			finally:
+				if 'key check' in readers:
+					readers['key check'].close()
+			return inspection
+		finally:
+			if isinstance(buffer, mmap.mmap):
+				buffer.close()
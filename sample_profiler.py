@@ -0,0 +1,227 @@
+'''
+	Sample Profiler
+	Desc : Checks the values of a Sample File against the Attribute DataType and Attribute Size of the Data Contract.
+		   The file is read in batches of PROFILE_BATCH rows, only one batch is in memory whatever the size of the
+		   file, and every column of a batch is checked at once with the pandas string methods. The batches are read
+		   once by the Sample Inspector and shared with the Key Verifier and the Sample Statistics. The first
+		   PROFILE_EXAMPLES values of a column which don't fit are kept with their line. Date and time columns are
+		   checked against the UDF_TO_DATETIME format of their Attribute Range of Values. Empty values are left to
+		   the nullability check.
+'''
+import pandas as pd
+
+from template_index import SIZE_PATTERN, DATE_TIME_PATTERN
+from date_formats import dateFormat
+from sample_reader import numberedRecords
+
+#Rows of the Sample File read at a time
+PROFILE_BATCH = 50000
+#Values which don't fit kept for every column
+PROFILE_EXAMPLES = 5
+#Column of the batches with the line of the Sample File every record starts on, no position of the header
+LINE = -1
+
+INT_PATTERN = r'[+-]?[0-9]+'
+DECIMAL_PATTERN = r'[+-]?([0-9]*)(?:\.([0-9]*))?'
+NUMBER_TYPES = ('int', 'decimal')
+
+
+'''
+	Use : Sample Column
+	Desc : Declaration of an Attribute in the Data Contract, the Sample File column with the same name is checked
+		   against it.
+		   name - Attribute, dataType - Attribute DataType in lower case
+		   precision, scale - Attribute Size, p or p,s. None when the size is empty or not a number
+		   primaryKey, unique, nullable - Attribute Primary Key, Attribute Uniqueness and Attribute Nullability are Yes
+		   dateFormat - DateFormat of a date or time column, None when the format is not one of the given formats
+'''
+class SampleColumn(object):
+
+	__slots__ = ('name', 'dataType', 'precision', 'scale', 'primaryKey', 'unique', 'nullable', 'dateFormat')
+
+	def __init__(self, name, dataType, size, primaryKey=False, unique=False, rangeOfValues=None, dateFormats=(), nullable=True):
+		self.name = name
+		self.dataType = str(dataType).strip().lower()
+		self.precision = None
+		self.scale = None
+		self.primaryKey = primaryKey
+		self.unique = unique
+		self.nullable = nullable
+		self.dateFormat = None
+		if DATE_TIME_PATTERN.match(self.dataType):
+			#A format which is not valid is reported by the Date/Time Format check
+			if str(rangeOfValues).strip().upper() in dateFormats:
+				self.dateFormat = dateFormat(rangeOfValues)
+			return
+		#Same reading of the size as the DataType Size check, 10.0 from Excel is 10
+		size = str(size).split('.')[0].strip()
+		if size.lower() != 'nan' and size and SIZE_PATTERN.match(size):
+			parts = size.split(',')
+			if parts[0].isdigit() and int(parts[0]) > 0:
+				self.precision = int(parts[0])
+				if len(parts) > 1 and parts[1].isdigit():
+					self.scale = int(parts[1])
+
+	#Declared type as it is shown in the issues, decimal(10,2) or date YYYY-MM-DD
+	def declared(self):
+		if self.dateFormat is not None:
+			return '%s %s' % (self.dataType, self.dateFormat.format)
+		if self.precision is None:
+			return self.dataType
+		if self.scale is None:
+			return '%s(%s)' % (self.dataType, self.precision)
+		return '%s(%s,%s)' % (self.dataType, self.precision, self.scale)
+
+
+'''
+	Use : Sample Schema
+	@Params : _dfs - Data Frame of the Dataset
+			  dateFormats - UDF_TO_DATETIME formats of the template in upper case
+	returns : SampleColumn of every Attribute of the Dataset
+'''
+def sampleSchema(_dfs, dateFormats=()):
+	primaryKeys = _dfs['Attribute Primary Key'].astype(str).str.strip().str.upper().eq('YES').to_numpy()
+	uniques = _dfs['Attribute Uniqueness'].astype(str).str.strip().str.upper().eq('YES').to_numpy()
+	#NA is No for the Attribute Nullability
+	nullables = _dfs['Attribute Nullability'].astype(str).str.strip().str.upper().eq('YES').to_numpy()
+	return [SampleColumn(str(name).strip().upper(), dataType, size, bool(primaryKey), bool(unique), rangeOfValues, dateFormats, bool(nullable)) for name, dataType, size, primaryKey, unique, rangeOfValues, nullable in zip(_dfs['Attribute'].to_numpy(dtype=object), _dfs['Attribute DataType'].to_numpy(dtype=object), _dfs['Attribute Size'].to_numpy(dtype=object), primaryKeys, uniques, _dfs['Attribute Range of Values'].to_numpy(dtype=object), nullables)]
+
+
+'''
+	Use : Column Profile
+	Desc : column - SampleColumn, checked - Values checked, failed - Values which don't fit,
+		   examples - [(line, value, reason)] of the first values which don't fit, the line of the Sample File the
+					  record starts on
+'''
+class ColumnProfile(object):
+
+	__slots__ = ('column', 'checked', 'failed', 'examples')
+
+	def __init__(self, column):
+		self.column = column
+		self.checked = 0
+		self.failed = 0
+		self.examples = []
+
+	#Share of the checked values which don't fit, as shown in the issues
+	def rate(self):
+		return '%.2f%%' % (100.0 * self.failed / self.checked if self.checked else 0.0)
+
+
+#Reason of every value of the batch which doesn't fit, None for the values which fit
+def _reasons(values, column):
+	if column.dateFormat is not None:
+		return column.dateFormat.reasons(values)
+	reasons = pd.Series(None, index=values.index, dtype=object)
+	if column.dataType == 'int':
+		reasons[~values.str.fullmatch(INT_PATTERN)] = 'not an integer'
+		if column.precision is not None:
+			digits = values.str.lstrip('+-').str.lstrip('0').str.len()
+			reasons[reasons.isna() & (digits > column.precision)] = 'more than %s digits' % column.precision
+	elif column.dataType == 'decimal':
+		parts = values.str.fullmatch(DECIMAL_PATTERN) & values.str.contains('[0-9]', regex=True)
+		reasons[~parts] = 'not a decimal number'
+		if column.precision is not None:
+			numbers = values.str.extract('^' + DECIMAL_PATTERN + '$').fillna('')
+			integer = numbers[0].str.lstrip('0').str.len()
+			fraction = numbers[1].str.len()
+			if column.scale is None:
+				reasons[reasons.isna() & (integer + fraction > column.precision)] = 'more than %s digits' % column.precision
+			else:
+				reasons[reasons.isna() & (integer > column.precision - column.scale)] = 'more than %s digits before the decimal point' % (column.precision - column.scale)
+				reasons[reasons.isna() & (fraction > column.scale)] = 'more than %s digits after the decimal point' % column.scale
+	elif column.precision is not None:
+		reasons[values.str.len() > column.precision] = 'longer than %s characters' % column.precision
+	return reasons
+
+
+'''
+	Use : Sample Profiler
+	Desc : Profile of the columns of the Sample File declared in the Data Contract, built from the batches of the
+		   Sample File one at a time.
+	@Params : header - Header of the Sample File
+			  schema - SampleColumn of every Attribute of the Dataset
+			  examples - Values kept for every column
+'''
+class SampleProfiler(object):
+
+	def __init__(self, header, schema, examples=PROFILE_EXAMPLES):
+		columns = dict((column.name, column) for column in schema if column.dataType in NUMBER_TYPES or column.dateFormat is not None or (column.precision is not None and not DATE_TIME_PATTERN.match(column.dataType)))
+		self.positions = columnPositions(header, columns)
+		self.profiles = dict((name, ColumnProfile(columns[name])) for name in self.positions)
+		self.examples = examples
+		#Positions of the header read for the profile
+		self.used = set(self.positions.values())
+
+	def add(self, chunk):
+		for name, position in self.positions.items():
+			values = chunk[position]
+			present = (values != '').to_numpy()
+			values = values[present]
+			lines = chunk[LINE].to_numpy()[present]
+			profile = self.profiles[name]
+			profile.checked += len(values)
+			reasons = _reasons(values, profile.column)
+			failed = reasons.notna().to_numpy()
+			profile.failed += int(failed.sum())
+			take = max(self.examples - len(profile.examples), 0)
+			for line, value, reason in zip(lines[failed][:take], values.to_numpy()[failed][:take], reasons.to_numpy()[failed][:take]):
+				profile.examples.append((int(line), value, reason))
+
+	#ColumnProfile of every column of the Sample File declared in the Data Contract
+	def result(self):
+		return [self.profiles[name] for name in sorted(self.profiles, key=self.positions.get)]
+
+
+'''
+	Use : Column Positions
+	Desc : A name in the header twice is read from its first position.
+	@Params : header - Header of the Sample File
+			  names - Attributes to find in the header, in upper case
+	returns : Dictionary of the Attribute and its position in the header, the Attributes not in the header are left out
+'''
+def columnPositions(header, names):
+	positions = {}
+	for position, name in enumerate(str(name).strip().upper() for name in header):
+		if name in names and name not in positions:
+			positions[name] = position
+	return positions
+
+
+def _batch(rows, numbers, used):
+	return pd.DataFrame(rows, index=pd.Index(numbers, dtype='int64'), columns=used + [LINE], dtype=object)
+
+'''
+	Use : Sample File Batches
+	Desc : Values of the given columns read PROFILE_BATCH rows at a time as stripped strings, a row with less fields
+		   than the header has empty values. A row with more fields than the header is skipped as pd.read_csv does
+		   with on_bad_lines='skip', it is reported by the scan of --sample-rows. The columns are the positions in
+		   the header and LINE, the line of the Sample File every record starts on, so a blank line, a skipped row
+		   or a quoted value over several lines doesn't shift the lines of the records after it. The index is the
+		   number of the record after the header, it tells two records apart where the line is only for the issues.
+	@Params : buffer - Content of the Sample File, bytes or a memory map
+			  delimiter - Delimiter of the Sample File
+			  used - Positions of the columns in the header
+			  width - Fields of the header
+			  batch - Rows read at a time
+	returns : Generator of the Data Frames of the batches
+'''
+def sampleBatches(buffer, delimiter, used, width, batch=PROFILE_BATCH):
+	used = sorted(used)
+	records = numberedRecords(buffer, delimiter)
+	#The first record is the header
+	next(records, None)
+	rows = []
+	numbers = []
+	for number, (line, record) in enumerate(records, 1):
+		fields = len(record)
+		if fields > width:
+			continue
+		rows.append([record[position].strip() if position < fields else '' for position in used] + [line])
+		numbers.append(number)
+		if len(rows) == batch:
+			yield _batch(rows, numbers, used)
+			rows = []
+			numbers = []
+	if rows:
+		yield _batch(rows, numbers, used)
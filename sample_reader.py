@@ -0,0 +1,289 @@
+'''
+	Sample Reader
+	Desc : Records of a Sample File read from its lines. The header is the same as the first level of the columns of
+		   pd.read_csv(path, sep=delimiter, header=[0,0]): blank lines before the header are skipped and an empty name
+		   is "Unnamed: <position>_level_0". Only the first record is read for the header, reading the rest of the file
+		   is optional, see --sample-rows. The rows are scanned from the bytes in blocks: the lines of a block without
+		   a quote are only counted for the delimiter, a record with a quote goes through a quote aware tokenizer.
+'''
+import codecs
+import collections
+import csv
+import itertools
+import re
+
+#Bytes of the Sample File scanned at a time, a block ends at a line break
+SCAN_BLOCK = 1 << 20
+#Lines kept for every number of fields and for the quotes
+SCAN_EXAMPLES = 5
+QUOTE = '"'
+#Lines a quoted value can go over, a quote which is never closed doesn't take the rest of the file
+QUOTED_LINES = 1000
+#Line breaks of a Sample File opened in text mode, a \r alone ends a line too
+LINE_BREAK = re.compile(rb'\r\n?|\n')
+LINE_SPLIT = re.compile(rb'(\r\n?|\n)')
+
+
+def _blank(record):
+	return not record or (len(record) == 1 and not record[0].strip())
+
+'''
+	Use : Sample File Records
+	@Params : lines - Lines of the Sample File with their line breaks, so line breaks inside quoted values are kept
+			  delimiter - Delimiter of the Sample File
+	returns : Generator of the records, blank lines are skipped
+'''
+def records(lines, delimiter):
+	for record in csv.reader(lines, delimiter=delimiter):
+		if not _blank(record):
+			yield record
+
+
+'''
+	Use : Buffer Lines
+	Desc : Decoded lines of the buffer with their line breaks. A line ends at \r\n, \r or \n, as a Sample File opened
+		   in text mode. The lines are decoded one at a time, a BOM is dropped.
+	@Params : buffer - Content of the Sample File, bytes or a memory map
+			  errors - Decode error handling, strict raises on the first byte which is not UTF-8
+'''
+def bufferLines(buffer, errors='strict'):
+	decoder = codecs.getincrementaldecoder('utf-8-sig')(errors)
+	position = 0
+	size = len(buffer)
+	while position < size:
+		found = LINE_BREAK.search(buffer, position)
+		end = size if found is None else found.end()
+		line = decoder.decode(buffer[position:end])
+		if line:
+			yield line
+		position = end
+	tail = decoder.decode(b'', final=True)
+	if tail:
+		yield tail
+
+
+'''
+	Use : Numbered Records
+	Desc : Records of the Sample File with the line they start on. The lines end at \r\n, \r or \n as in scanRows,
+		   the first line is 1, so the lines of a quoted value and the blank lines are counted too. Blank lines are
+		   skipped.
+	@Params : buffer - Content of the Sample File, bytes or a memory map
+			  delimiter - Delimiter of the Sample File
+			  errors - Decode error handling
+	returns : Generator of (line, record)
+'''
+def numberedRecords(buffer, delimiter, errors='replace'):
+	reader = csv.reader(bufferLines(buffer, errors), delimiter=delimiter)
+	while True:
+		#The csv reader counts the lines it has read
+		start = reader.line_num + 1
+		record = next(reader, None)
+		if record is None:
+			return
+		if not _blank(record):
+			yield start, record
+
+
+'''
+	Use : Sample File Header
+	@Params : lines - Lines of the Sample File
+			  delimiter - Delimiter of the Sample File
+	returns : Column names of the first record
+'''
+def readHeader(lines, delimiter):
+	for record in records(lines, delimiter):
+		return [name if name != '' else 'Unnamed: %s_level_0' % position for position, name in enumerate(record)]
+	raise ValueError('No columns to parse from file')
+
+
+'''
+	Use : Sample File Scan
+	Desc : rows - Records after the header, header - Fields of the header
+		   widths - {fields : [records, lines]} of the records after the header, lines are the first lines of the records
+					with the lines ending at \r\n, \r or \n
+		   quotes, quoteLines - Records with a quote inside a value which is not quoted, or text after a closing
+								quote, or a quote which is never closed, and their first lines
+		   crlf, lf, cr - Records ending with \r\n, \n and \r alone, a line break inside a quoted value is not counted
+'''
+class SampleScan(object):
+
+	__slots__ = ('rows', 'header', 'widths', 'quotes', 'quoteLines', 'crlf', 'lf', 'cr')
+
+	def __init__(self):
+		self.rows = 0
+		self.header = None
+		self.widths = {}
+		self.quotes = 0
+		self.quoteLines = []
+		self.crlf = 0
+		self.lf = 0
+		self.cr = 0
+
+	def _record(self, fields, line, examples):
+		if self.header is None:
+			self.header = fields
+			return
+		self.rows += 1
+		width = self.widths.get(fields)
+		if width is None:
+			width = self.widths[fields] = [0, []]
+		width[0] += 1
+		if len(width[1]) < examples:
+			width[1].append(line)
+
+	#Records of a block of lines without a quote or a blank line, counts are the delimiters of every line
+	def _block(self, counts, line, examples):
+		self.rows += len(counts)
+		for delimiters, count in collections.Counter(counts).items():
+			width = self.widths.get(delimiters + 1)
+			if width is None:
+				width = self.widths[delimiters + 1] = [0, []]
+			width[0] += count
+			if len(width[1]) < examples:
+				width[1].extend(itertools.islice((number for number, found in enumerate(counts, line) if found == delimiters), examples - len(width[1])))
+
+	#Records with another number of fields than width and [(line, fields)] of the first of them
+	def offending(self, width, examples=SCAN_EXAMPLES):
+		rows = sum(count for fields, (count, lines) in self.widths.items() if fields != width)
+		lines = sorted((line, fields) for fields, (count, lines) in self.widths.items() if fields != width for line in lines)
+		return rows, lines[:examples]
+
+	#Number of fields and records, the most frequent first, as shown in the issues
+	def describe(self):
+		return ', '.join('%s fields in %s rows' % (fields, count) for fields, (count, lines) in sorted(self.widths.items(), key=lambda width: (-width[1][0], width[0])))
+
+	#Line breaks of text, all of them end a record
+	def _endings(self, text):
+		crlf = text.count(b'\r\n')
+		self.crlf += crlf
+		self.lf += text.count(b'\n') - crlf
+		self.cr += text.count(b'\r') - crlf
+
+	def endings(self):
+		return '%s CRLF, %s LF and %s CR line endings' % (self.crlf, self.lf, self.cr)
+
+	def mixedEndings(self):
+		return sum(1 for count in (self.crlf, self.lf, self.cr) if count) > 1
+
+
+#Tokenizer state of a record : fields, a quote which is not where it should be, in a quoted value, at the start of a field
+START = (1, False, False, True)
+
+def _tokenize(text, delimiter, state):
+	fields, stray, quoted, start = state
+	position = 0
+	size = len(text)
+	while position < size:
+		char = text[position]
+		if quoted:
+			if char == QUOTE:
+				if position + 1 < size and text[position + 1] == QUOTE:
+					position += 1
+				else:
+					quoted = False
+					#Text after the closing quote
+					if position + 1 < size and text[position + 1] != delimiter:
+						stray = True
+		elif char == delimiter:
+			fields += 1
+			start = True
+			position += 1
+			continue
+		elif char == QUOTE:
+			#A quote only opens a quoted value at the start of a field
+			if start:
+				quoted = True
+			else:
+				stray = True
+		start = False
+		position += 1
+	return (fields, stray, quoted, start)
+
+
+def _blankLine(line, separator):
+	return separator not in line and not line.strip()
+
+#Lines of a block without their line breaks and the line break of every line, the last line of the file has none
+def _blockLines(chunk):
+	if b'\r' not in chunk:
+		lines = chunk.split(b'\n')
+		endings = [b'\n'] * (len(lines) - 1) + [b'']
+	else:
+		parts = LINE_SPLIT.split(chunk)
+		lines = parts[0::2]
+		endings = parts[1::2] + [b'']
+	#The block ends with a line break
+	if not lines[-1]:
+		lines.pop()
+		endings.pop()
+	return lines, endings
+
+
+'''
+	Use : Scan Sample File Rows
+	Desc : Every line of the Sample File is read once, a line ends at \r\n, \r or \n. A record with a quote goes on
+		   to the next lines while a quoted value is open, up to QUOTED_LINES lines.
+	@Params : buffer - Content of the Sample File, bytes or a memory map
+			  delimiter - Delimiter of the Sample File
+			  block - Bytes scanned at a time
+			  examples - Lines kept for every number of fields
+	returns : SampleScan
+'''
+def scanRows(buffer, delimiter, block=SCAN_BLOCK, examples=SCAN_EXAMPLES):
+	scan = SampleScan()
+	separator = delimiter.encode('utf-8')
+	quote = QUOTE.encode('utf-8')
+	size = len(buffer)
+	position = len(codecs.BOM_UTF8) if buffer[:len(codecs.BOM_UTF8)] == codecs.BOM_UTF8 else 0
+	line = 1
+	#Record with a quoted value which is not closed yet : tokenizer state, first line and lines
+	pending = None
+	while position < size:
+		found = LINE_BREAK.search(buffer, min(position + block, size) - 1)
+		end = size if found is None else found.end()
+		chunk = buffer[position:end]
+		position = end
+		lines, endings = _blockLines(chunk)
+		if pending is None and quote not in chunk:
+			#No quoted value in the block, every line break ends a record
+			scan._endings(chunk)
+			counts = [text.count(separator) for text in lines]
+			if scan.header is not None and 0 not in counts:
+				#Fast path, no line of the block has a quote or is blank
+				scan._block(counts, line, examples)
+			else:
+				for number, text in enumerate(lines, line):
+					if not _blankLine(text, separator):
+						scan._record(text.count(separator) + 1, number, examples)
+			line += len(lines)
+			continue
+		for number, text, ending in zip(itertools.count(line), lines, endings):
+			if pending is None:
+				if quote not in text:
+					if not _blankLine(text, separator):
+						scan._record(text.count(separator) + 1, number, examples)
+					scan._endings(ending)
+					continue
+				pending = [START, number, 0]
+			else:
+				pending[0] = _tokenize('\n', delimiter, pending[0])
+			pending[0] = _tokenize(text.decode('utf-8', 'replace'), delimiter, pending[0])
+			pending[2] += 1
+			if not pending[0][2] or pending[2] >= QUOTED_LINES:
+				_quotedRecord(scan, pending, examples)
+				pending = None
+				#Only the line break which closes the record, the ones in its quoted values are part of the values
+				scan._endings(ending)
+		line += len(lines)
+	if pending is not None:
+		_quotedRecord(scan, pending, examples)
+	return scan
+
+
+def _quotedRecord(scan, pending, examples):
+	(fields, stray, quoted, start), number, lines = pending
+	scan._record(fields, number, examples)
+	if stray or quoted:
+		scan.quotes += 1
+		if len(scan.quoteLines) < examples:
+			scan.quoteLines.append(number)
@@ -0,0 +1,121 @@
+'''
+	Sample Statistics
+	Desc : Empty and null values of every column of a Sample File, counted from the batches of the one read of the
+		   values by the Sample Inspector, which the Sample Profiler and the Key Verifier share. The statistics are kept in SAMPLE_STATS_DEFAULT_PATH with the size and the
+		   modification time of the Sample File, a rerun on a Sample File which didn't change reads them from the
+		   cache instead of the file. Files are written to a temporary name and renamed.
+'''
+import hashlib
+import json
+import os
+import tempfile
+
+from configuration import log, CODES_DIR
+from sample_profiler import LINE
+
+SAMPLE_STATS_DEFAULT_PATH = os.path.join(CODES_DIR, 'cache', 'samples')
+#Changed when the statistics change, older files are not used anymore
+STATS_FORMAT = '3'
+#Values written for a null by the extracts, in upper case
+NULL_TOKENS = ('NULL', '\\N')
+
+
+'''
+	Use : Column Statistics
+	Desc : name - Column of the header, rows - Rows of the Sample File, empty - Empty values and missing fields,
+		   nulls - Values written as a null, first - Line of the first empty or null value, None without one
+'''
+class ColumnStats(object):
+
+	__slots__ = ('name', 'rows', 'empty', 'nulls', 'first')
+
+	def __init__(self, name, rows=0, empty=0, nulls=0, first=None):
+		self.name = name
+		self.rows = rows
+		self.empty = empty
+		self.nulls = nulls
+		self.first = first
+
+	def missing(self):
+		return self.empty + self.nulls
+
+	#Share of the rows without a value, as shown in the issues
+	def ratio(self):
+		return '%.2f%%' % (100.0 * self.missing() / self.rows if self.rows else 0.0)
+
+	def toJson(self):
+		return [self.name, self.rows, self.empty, self.nulls, self.first]
+
+
+def _cachePath(path, directory):
+	return os.path.join(directory, hashlib.sha256(os.path.abspath(path).encode('utf-8')).hexdigest() + '.json')
+
+def _fingerprint(path, delimiter, header):
+	info = os.stat(path)
+	return [STATS_FORMAT, info.st_size, info.st_mtime_ns, delimiter, list(header)]
+
+
+def _save(cached, content):
+	directory = os.path.dirname(cached)
+	os.makedirs(directory, exist_ok=True)
+	handle, temporary = tempfile.mkstemp(dir=directory, suffix='.tmp')
+	try:
+		with os.fdopen(handle, 'w', encoding='utf-8') as f:
+			json.dump(content, f)
+		os.replace(temporary, cached)
+	finally:
+		if os.path.exists(temporary):
+			os.remove(temporary)
+
+
+'''
+	Use : Sample Statistics
+	Desc : Statistics of a Sample File from the cache. Without them every column of the header is counted from the
+		   batches of the Sample File one at a time, used is empty when the statistics are cached.
+	@Params : path - Sample File Path
+			  delimiter - Delimiter of the Sample File
+			  header - Header of the Sample File
+			  directory - Cache Directory
+'''
+class SampleStats(object):
+
+	def __init__(self, path, delimiter, header, directory=SAMPLE_STATS_DEFAULT_PATH):
+		self.cached = _cachePath(path, directory)
+		#Taken before the Sample File is read
+		self.fingerprint = _fingerprint(path, delimiter, header)
+		self.stats = self._load()
+		self.columns = [ColumnStats(str(name).strip().upper()) for name in header]
+		#Positions of the header read for the statistics
+		self.used = set() if self.stats is not None else set(range(len(header)))
+
+	def _load(self):
+		try:
+			with open(self.cached, 'r', encoding='utf-8') as f:
+				content = json.load(f)
+			if content['fingerprint'] == self.fingerprint:
+				log.info('Sample File statistics loaded from the cache: %s', self.cached)
+				return [ColumnStats(*column) for column in content['columns']]
+		except (OSError, ValueError, KeyError, TypeError):
+			pass
+		return None
+
+	def add(self, chunk):
+		for position, column in enumerate(self.columns):
+			values = chunk[position]
+			empty = values == ''
+			nulls = values.str.upper().isin(NULL_TOKENS)
+			column.rows += len(values)
+			column.empty += int(empty.sum())
+			column.nulls += int(nulls.sum())
+			if column.first is None and (empty | nulls).any():
+				column.first = int(chunk[LINE].to_numpy()[(empty | nulls).to_numpy().argmax()])
+
+	#ColumnStats of every column of the header, the counted statistics are stored in the cache
+	def result(self):
+		if self.stats is None:
+			self.stats = self.columns
+			try:
+				_save(self.cached, {"fingerprint" : self.fingerprint, "columns" : [column.toJson() for column in self.stats]})
+			except OSError:
+				log.error('Error in saving the Sample File statistics', exc_info=True)
+		return self.stats
@@ -0,0 +1,84 @@
+'''
+	Compiled Template
+	Desc : template.json is read once at startup and kept as a read only index. Every domain of the template is
+		   stored as a frozenset (as it is, lower-cased and upper-cased), the header is kept in order together with
+		   the position of every column and the values rendered in the issue messages are built once, so the
+		   validators don't lower-case or rescan the template for every row of the Data Contract.
+'''
+#Version of the template
+import hashlib
+#Python JSON Library
+import json
+#Regular Expression Library
+import re
+from types import MappingProxyType
+
+from lib.utils import listToComma
+
+#Patterns used by the validators, compiled once
+NAME_PATTERN = re.compile(r"^[a-zA-Z0-9_ ]*$")
+DATE_TIME_PATTERN = re.compile(r"date|time")
+SIZE_PATTERN = re.compile(r"^[0-9,]*$")
+SPRINT_PATTERN = re.compile(r"([a-z]+)([0-9]+)", re.I)
+
+
+'''
+	Use : Template Lookup
+	Desc : Immutable index of template.json. The domains are looked up by the key used in template.json.
+	@Params : mapping - Dictionary loaded from template.json
+'''
+class TemplateIndex(object):
+	__slots__ = ('header', 'headerIndex', 'version', '_exact', '_lowered', '_upper', '_comma', '_text')
+
+	def __init__(self, mapping):
+		domains = dict((key, value) for key, value in mapping.items() if isinstance(value, list))
+		header = tuple(mapping.get('header', []))
+		_set = super(TemplateIndex, self).__setattr__
+		_set('header', header)
+		_set('headerIndex', MappingProxyType(dict((column, index) for index, column in enumerate(header))))
+		#sha256 of the template content, changes whenever a domain or the header changes
+		_set('version', hashlib.sha256(json.dumps(mapping, sort_keys=True).encode('utf-8')).hexdigest())
+		_set('_exact', MappingProxyType(dict((key, frozenset(value)) for key, value in domains.items())))
+		_set('_lowered', MappingProxyType(dict((key, frozenset(str(x).lower() for x in value)) for key, value in domains.items())))
+		_set('_upper', MappingProxyType(dict((key, frozenset(str(x).upper() for x in value)) for key, value in domains.items())))
+		_set('_comma', MappingProxyType(dict((key, listToComma(value)) for key, value in domains.items())))
+		_set('_text', MappingProxyType(dict((key, str(value)) for key, value in domains.items())))
+
+	def __setattr__(self, name, value):
+		raise AttributeError("The compiled template is read only")
+
+	def __delattr__(self, name):
+		raise AttributeError("The compiled template is read only")
+
+	#Values of the domain as written in template.json
+	def exact(self, key):
+		return self._exact[key]
+
+	#Values of the domain in lower case, to compare with str(value).lower()
+	def lowered(self, key):
+		return self._lowered[key]
+
+	#Values of the domain in upper case, to compare with str(value).upper()
+	def upper(self, key):
+		return self._upper[key]
+
+	#Domain rendered with listToComma for the issue messages
+	def comma(self, key):
+		return self._comma[key]
+
+	#Domain rendered as the list of template.json for the issue messages
+	def text(self, key):
+		return self._text[key]
+
+
+'''
+	Use : Compile Template
+	Desc : Read the template file once and build the index. The cursor is moved back to the start of the file.
+	@Params : template - Template File opened by configuration
+	returns : TemplateIndex
+'''
+def compileTemplate(template):
+	template.seek(0)
+	mapping = json.load(template)
+	template.seek(0)
+	return TemplateIndex(mapping)
@@ -0,0 +1,34 @@
+from datetime import datetime
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pd = pytest.importorskip('pandas')
+pytest.importorskip('pyarrow')
+contract_cache = pytest.importorskip('contract_cache')
+
+from cell_locator import SHEET_COLUMNS
+from contract_reader import MERGED_CELLS
+
+
+def contractFrame():
+	dfs = pd.DataFrame({
+		'Dataset Name': ['Orders', 'Orders', np.nan, 'Customers'],
+		'Attribute Name': ['ID', 'Amount', 'Placed', np.nan],
+		'Attribute Size': [10, '18,2', np.nan, datetime(2024, 1, 31)],
+		'Nullable': [np.nan, np.nan, np.nan, np.nan],
+		'Position': [1.0, 2.0, np.nan, 1.0],
+	}, index=[0, 1, 2, 4])
+	for column in ('Dataset Name', 'Attribute Name', 'Attribute Size', 'Nullable'):
+		dfs[column] = dfs[column].astype(object)
+	dfs.attrs[SHEET_COLUMNS] = dict((column, position) for position, column in enumerate(dfs.columns))
+	dfs.attrs[MERGED_CELLS] = {'Dataset Name': [(0, 2)]}
+	return dfs
+
+def test_round_trip_keeps_empty_cells():
+	dfs = contractFrame()
+	decoded = contract_cache.decodeFrame(contract_cache.encodeFrame(dfs))
+	pd.testing.assert_frame_equal(decoded, dfs)
+	assert decoded.attrs == dfs.attrs
+	assert all(value is not None for value in decoded['Dataset Name'])
+	assert all(value is not None for value in decoded['Nullable'])
@@ -0,0 +1,53 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('pandas')
+key_verifier = pytest.importorskip('key_verifier')
+sample_profiler = pytest.importorskip('sample_profiler')
+
+from key_verifier import KeyCheck, KeyVerifier, RECORD, _KeyPartitions, _exampleValues, _sortedDuplicates, _streamedDuplicates
+
+
+def records(hashes, first=1):
+	values = np.empty(len(hashes), RECORD)
+	values['hash'] = hashes
+	values['row'] = np.arange(first, first + len(hashes))
+	return values
+
+def test_spilled_partitions_find_the_duplicates_of_memory(tmp_path):
+	hashes = np.random.default_rng(7).integers(0, 50, 400).astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+	expected = _sortedDuplicates(records(hashes), 5)
+	partitions = _KeyPartitions(RECORD.itemsize * 16, str(tmp_path))
+	for start in range(0, len(hashes), 30):
+		partitions.add(records(hashes[start:start + 30], start + 1))
+	assert partitions.files is not None
+	assert partitions.duplicates(5) == expected
+
+def test_a_repeated_key_is_counted_without_loading_the_partition(tmp_path):
+	partitions = _KeyPartitions(RECORD.itemsize * 8, str(tmp_path))
+	for start in range(0, 200, 20):
+		partitions.add(records(np.full(20, 42, np.uint64), start + 1))
+	assert partitions.duplicates(3) == (199, 1, [(2, 1), (3, 1), (4, 1)])
+
+def test_streamed_duplicates_of_a_partition_file(tmp_path):
+	path = str(tmp_path / 'partition.bin')
+	records(np.array([5, 9, 5, 7, 9, 5], np.uint64)).tofile(path)
+	assert _streamedDuplicates(path, RECORD.itemsize * 2, 5) == (3, 2, [(3, 1), (5, 2), (6, 1)])
+
+def test_a_collision_of_the_hashes_is_not_a_duplicate():
+	content = b'ID,NAME\n1,a\n2,b\n1,c\n3,d\n'
+	check = KeyCheck(['ID'], True)
+	#Record 4 has the hash of record 2 but another ID
+	check.duplicates, check.keys, check.examples = 2, 2, [(3, 1), (4, 2)]
+	_exampleValues(content, ',', 2, {0}, {'ID': 0}, [check], 10)
+	assert (check.duplicates, check.keys) == (1, 1)
+	assert check.examples == [(4, 2, '1')]
+
+def test_records_on_cr_lines_are_told_apart():
+	content = b'ID,V\r1,a\r2,b\r1,c\r'
+	verifier = KeyVerifier(['ID', 'V'], [sample_profiler.SampleColumn('ID', 'int', 10, primaryKey=True)])
+	for chunk in sample_profiler.sampleBatches(content, ',', verifier.used, 2):
+		verifier.add(chunk)
+	check, = verifier.result(content, ',', 2)
+	assert (check.checked, check.duplicates, check.keys) == (3, 1, 1)
+	assert check.examples == [(4, 2, '1')]
@@ -0,0 +1,44 @@
+from sample_reader import bufferLines, numberedRecords, readHeader, scanRows
+
+
+def test_line_break_in_quoted_value_is_not_a_record_ending():
+	content = b'id,comment\r\n1,"first line\nsecond line"\r\n2,plain\r\n3,"a\nb\nc"\r\n'
+	scan = scanRows(content, ',')
+	assert scan.rows == 3
+	assert (scan.crlf, scan.lf, scan.cr) == (4, 0, 0)
+	assert not scan.mixedEndings()
+
+def test_mixed_line_endings_are_reported():
+	scan = scanRows(b'id,comment\r\n1,"a\nb"\n2,c\r\n', ',')
+	assert (scan.crlf, scan.lf, scan.cr) == (2, 1, 0)
+	assert scan.mixedEndings()
+
+def test_small_blocks_keep_quoted_values_together():
+	content = b'id,comment\r\n' + b''.join(b'%d,"x\ny"\r\n' % number for number in range(50))
+	scan = scanRows(content, ',', block=16)
+	assert scan.rows == 50
+	assert (scan.crlf, scan.lf, scan.cr) == (51, 0, 0)
+
+def test_header_of_a_file_with_cr_line_endings():
+	content = b'V,K\r1,a\r2,b\r'
+	assert list(bufferLines(content)) == ['V,K\r', '1,a\r', '2,b\r']
+	assert readHeader(bufferLines(content), ',') == ['V', 'K']
+
+def test_cr_alone_ends_a_record():
+	scan = scanRows(b'V,K\r1,a\r2,b\r', ',')
+	assert scan.header == 2
+	assert scan.rows == 2
+	assert scan.offending(2) == (0, [])
+	assert (scan.crlf, scan.lf, scan.cr) == (0, 0, 3)
+
+def test_cr_alone_in_small_blocks_and_quoted_values():
+	content = b'V,K\r' + b''.join(b'%d,"x\ry"\r' % number for number in range(20))
+	scan = scanRows(content, ',', block=8)
+	assert scan.rows == 20
+	assert scan.quotes == 0
+	assert (scan.crlf, scan.lf, scan.cr) == (0, 0, 21)
+	assert scan.offending(2) == (0, [])
+
+def test_lines_of_records_count_cr_alone():
+	content = b'V,K\r1,a\r\r2,"b\nc"\r\n3,d'
+	assert list(numberedRecords(content, ',')) == [(1, ['V', 'K']), (2, ['1', 'a']), (4, ['2', 'b\nc']), (6, ['3', 'd'])]